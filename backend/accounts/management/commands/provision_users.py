@@ -0,0 +1,57 @@
+"""
+Bulk-create users from a CSV or JSON-lines file.
+
+    python manage.py provision_users partner_users.csv
+    python manage.py provision_users users.jsonl --batch-size 2000 --workers 8 --role stylist
+
+Columns/keys: email (required), username, password, first_name, last_name,
+phone, profile_picture, role, status. Missing usernames default to the email;
+missing passwords give an unusable password (set via the reset flow).
+Existing or duplicate emails/usernames/phones are skipped and listed.
+"""
+
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import DEFAULT_BATCH_SIZE, provision_users
+
+
+def _read_rows(path: Path, default_role):
+    with path.open(newline="", encoding="utf-8") as fh:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in fh if line.strip())
+        else:
+            rows = csv.DictReader(fh)
+        for row in rows:
+            if default_role and not row.get("role"):
+                row["role"] = default_role
+            yield row
+
+
+class Command(BaseCommand):
+    help = "Bulk-create users and their profiles from a CSV or JSON-lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=None, help="password hashing processes (default: CPU count)")
+        parser.add_argument("--role", choices=["client", "stylist", "admin"], help="role for rows without one")
+
+    def handle(self, *args, path: Path, batch_size, workers, role, **opts):
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        started = time.perf_counter()
+        result = provision_users(_read_rows(path, role), batch_size=batch_size, workers=workers)
+        elapsed = time.perf_counter() - started
+
+        for skip in result.skipped:
+            self.stderr.write(f"skipped {skip['email'] or '<no email>'}: {skip['reason']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result.created} users in {elapsed:.1f}s "
+            f"({result.created / max(elapsed, 1e-9):.0f}/s); skipped {len(result.skipped)}."
+        ))
@@ -0,0 +1,227 @@
+"""
+accounts/services.py
+
+User provisioning and cached profile snapshots.
+
+`profile_for(user)` is the single definition of which profile a role gets;
+the post_save signal (accounts/signals.py) uses it for users created one at a
+time, and `provision_users` uses it for bulk imports.
+
+`provision_users` is the bulk path (see `manage.py provision_users`):
+- passwords are hashed in a process pool, since hashing is CPU-bound and
+  dominates the cost of creating a user
+- users and their profiles are inserted with bulk_create, one transaction per
+  batch, so no per-row save() or signals run
+- rows without an email, or with a role/status that is not a User.Role /
+  User.Status value, are rejected and reported before anything is inserted
+- rows whose email/username/phone already exist (in the DB or earlier in the
+  input) are skipped and reported, never half-created
+- what the per-row signals would have done is done once per batch: stylist
+  profiles get rank_score/is_listed, and the directory cache is invalidated
+
+`get_profile_snapshot` serves /client/me/, /stylist/me/ and recommend(): the
+serialized profile + user, loaded with one select_related query and kept in
+the tiered cache (common/cache.py) under the user's profile generation.
+accounts/signals.py bumps it on any User/ClientProfile/StylistProfile
+save or delete; set-based UPDATEs that bypass signals (review aggregates,
+earnings rollup) call invalidate_profile_snapshots themselves.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.http import Http404
+
+from client.models import ClientProfile
+from client.serializers.auth import ClientProfileReadSerializer
+from client.services.directory import invalidate_directory
+from common.cache import bump_generation, get_or_build
+from stylist.models import StylistProfile
+from stylist.serializers import StylistProfileSerializer
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 1000
+
+USER_FIELDS = ("email", "username", "first_name", "last_name", "phone", "profile_picture", "role", "status")
+
+
+def profile_for(user: User):
+    """Unsaved profile a new user of this role gets, or None (admins)."""
+    if user.role == User.Role.CLIENT:
+        return ClientProfile(user=user)
+    if user.role == User.Role.STYLIST:
+        profile = StylistProfile(user=user)
+        profile.compute_derived_fields()
+        return profile
+    return None
+
+
+# --------------------------------------------------------------------------
+# Profile snapshots
+# --------------------------------------------------------------------------
+
+_SNAPSHOT_MODELS = {
+    User.Role.CLIENT: (ClientProfile, ClientProfileReadSerializer),
+    User.Role.STYLIST: (StylistProfile, StylistProfileSerializer),
+}
+
+
+def profile_generation(user_id) -> str:
+    return f"profile:{user_id}"
+
+
+def _build_snapshot(user_id, role) -> Optional[Dict]:
+    model, serializer = _SNAPSHOT_MODELS[role]
+    try:
+        profile = model.objects.select_related("user").get(user_id=user_id)
+    except model.DoesNotExist:
+        # Same fallback the /me views always had (get_or_create), for users
+        # created before their role had a profile.
+        if not User.objects.filter(pk=user_id, role=role).exists():
+            return None  # negative-cached; creating the user bumps the generation
+        model.objects.get_or_create(user_id=user_id)
+        profile = model.objects.select_related("user").get(user_id=user_id)
+    return dict(serializer(profile).data)
+
+
+def get_profile_snapshot(user_id, role) -> Dict:
+    """Serialized profile (with nested user) for a client or stylist; no DB query when warm."""
+    if role not in _SNAPSHOT_MODELS:
+        raise Http404("No profile for this role.")
+    snapshot = get_or_build(
+        f"profile:snapshot:{role}:{user_id}",
+        lambda: _build_snapshot(user_id, role),
+        settings.PROFILE_SNAPSHOT_CACHE_TIMEOUT,
+        versions=[profile_generation(user_id)],
+    )
+    if snapshot is None:
+        raise Http404("Profile not found.")
+    return snapshot
+
+
+def invalidate_profile_snapshots(user_ids: Iterable) -> None:
+    bump_generation(*[profile_generation(pk) for pk in user_ids])
+
+
+# --------------------------------------------------------------------------
+# Bulk provisioning
+# --------------------------------------------------------------------------
+
+@dataclass
+class ProvisionResult:
+    created: int = 0
+    skipped: List[Dict[str, str]] = field(default_factory=list)  # [{"email", "reason"}]
+
+
+def _init_hash_worker():
+    # Needed where workers are spawned rather than forked (macOS/Windows).
+    if not apps.ready:
+        django.setup()
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _invalid_reason(row: dict) -> Optional[str]:
+    if not str(row.get("email") or "").strip():
+        return "missing email"
+    if row.get("role") and row["role"] not in User.Role.values:
+        return f"unknown role {row['role']!r}"
+    if row.get("status") and row["status"] not in User.Status.values:
+        return f"unknown status {row['status']!r}"
+    return None
+
+
+def _build_user(row: dict) -> User:
+    data = {k: (row.get(k) or None) for k in USER_FIELDS}
+    data["email"] = data["email"].strip()
+    data["email"] = User.objects.normalize_email(data["email"])
+    data["username"] = data["username"] or data["email"].lower()
+    data["role"] = data["role"] or User.Role.CLIENT
+    data["status"] = data["status"] or User.Status.ACTIVE
+    # same defaults as UserManager.create_user
+    return User(is_staff=False, is_superuser=False, **data)
+
+
+def _existing(users: List[User]) -> Dict[str, set]:
+    return {
+        "email": set(User.objects.filter(email__in=[u.email for u in users]).values_list("email", flat=True)),
+        "username": set(User.objects.filter(username__in=[u.username for u in users]).values_list("username", flat=True)),
+        "phone": set(User.objects.filter(phone__in=[u.phone for u in users if u.phone]).values_list("phone", flat=True)),
+    }
+
+
+def _insert_batch(users: List[User]) -> None:
+    profiles = [p for p in (profile_for(u) for u in users) if p is not None]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        ClientProfile.objects.bulk_create([p for p in profiles if isinstance(p, ClientProfile)])
+        stylists = [p for p in profiles if isinstance(p, StylistProfile)]
+        if stylists:
+            StylistProfile.objects.bulk_create(stylists)
+            transaction.on_commit(invalidate_directory)
+
+
+def provision_users(
+    rows: Iterable[dict],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: Optional[int] = None,
+) -> ProvisionResult:
+    """
+    Create users (and their role profiles) from dicts with USER_FIELDS plus
+    `password`. A missing password gives an unusable one, like create_user.
+    """
+    result = ProvisionResult()
+    seen = {"email": set(), "username": set(), "phone": set()}
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+        for batch in _batches(rows, batch_size):
+            users, passwords = [], []
+            candidates = []
+            for row in batch:
+                reason = _invalid_reason(row)
+                if reason:
+                    result.skipped.append({"email": str(row.get("email") or "").strip(), "reason": reason})
+                    continue
+                candidates.append((_build_user(row), row.get("password") or None))
+
+            existing = _existing([u for u, _ in candidates])
+            for user, password in candidates:
+                clash = next(
+                    (f for f in ("email", "username", "phone")
+                     if getattr(user, f) and (getattr(user, f) in existing[f] or getattr(user, f) in seen[f])),
+                    None,
+                )
+                if clash:
+                    result.skipped.append({"email": user.email, "reason": f"{clash} already exists"})
+                    continue
+                for f in seen:
+                    if getattr(user, f):
+                        seen[f].add(getattr(user, f))
+                users.append(user)
+                passwords.append(password)
+
+            if not users:
+                continue
+            chunk = max(1, len(passwords) // (workers * 4))
+            for user, encoded in zip(users, pool.map(make_password, passwords, chunksize=chunk)):
+                user.password = encoded
+            _insert_batch(users)
+            result.created += len(users)
+
+    return result
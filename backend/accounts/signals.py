@@ -7,18 +7,31 @@ Design:
 - Users with role = CLIENT → ClientProfile
 - Users with role = STYLIST → StylistProfile
 - Admins have no auto-profile yet.
+(accounts.services.profile_for; bulk imports use the same mapping.)
+
+It also pushes bans, deactivations and role changes out to live sessions:
+access tokens carry the user's status and role as signed claims
+(common/authentication.py), so they have to be revoked explicitly. And it
+drops cached profile snapshots on writes.
 """
 
+import logging
+
 # --- Django core ---
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
 # --- Local apps ---
+from accounts.services import invalidate_profile_snapshots, profile_for
 from client.models import ClientProfile
+from common.authentication import revoke_user_access
+from common.utils import revoke_user_tokens
 from stylist.models import StylistProfile
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=User)
@@ -33,14 +46,54 @@ def create_profile_on_user_create(sender, instance: User, created: bool, **kwarg
     if not created:
         return
 
-    role = instance.role
+    profile = profile_for(instance)
+    if profile is not None:
+        type(profile).objects.get_or_create(user=instance)
+        logger.debug("%s profile created", instance.role, extra={"user_id": str(instance.pk)})
 
-    if role == User.Role.CLIENT:
-        ClientProfile.objects.get_or_create(user=instance)
-        print(f"[signals] Client profile created for user {instance.id}")
+    # Admin or others → no profile created
 
-    elif role == User.Role.STYLIST:
-        StylistProfile.objects.get_or_create(user=instance)
-        print(f"[signals] Stylist profile created for user {instance.id}")
 
-    # Admin or others → no profile created
+@receiver(pre_save, sender=User)
+def remember_previous_role(sender, instance: User, update_fields=None, **kwargs):
+    """Note a role change for revoke_sessions_on_lockout (post_save can't see the old value)."""
+    instance._role_changed = False
+    if instance._state.adding or (update_fields is not None and "role" not in update_fields):
+        return
+    previous = User.objects.filter(pk=instance.pk).values_list("role", flat=True).first()
+    instance._role_changed = previous is not None and previous != instance.role
+
+
+@receiver(post_save, sender=User)
+def revoke_sessions_on_lockout(sender, instance: User, created: bool, **kwargs):
+    """
+    Banned or deactivated users, and users whose role changed, lose their
+    sessions immediately: outstanding access tokens are revoked and refresh
+    tokens blacklisted (a refresh token would mint access tokens with the
+    old role claim).
+    """
+    if created:
+        return
+    role_changed = getattr(instance, "_role_changed", False)
+    if instance.is_active and instance.status == User.Status.ACTIVE and not role_changed:
+        return
+
+    user_id = instance.pk
+
+    def revoke():
+        revoke_user_access(user_id)
+        revoke_user_tokens(instance)
+
+    transaction.on_commit(revoke)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=ClientProfile)
+@receiver(post_delete, sender=ClientProfile)
+@receiver(post_save, sender=StylistProfile)
+@receiver(post_delete, sender=StylistProfile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    """/me and recommend() read a cached snapshot of user + profile."""
+    user_id = instance.pk if sender is User else instance.user_id
+    transaction.on_commit(lambda: invalidate_profile_snapshots([user_id]))
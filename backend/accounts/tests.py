@@ -1,3 +1,77 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.services import provision_users
+from client.models import ClientProfile
+from stylist.models import StylistProfile
+
+User = get_user_model()
+
+ROWS = [
+    {"email": "ada@Example.COM", "username": "ada", "password": "pw-12345!", "first_name": "Ada"},
+    {"email": "grace@example.com", "username": "grace", "password": "pw-12345!", "role": "stylist"},
+    {"email": "linus@example.com", "username": "linus", "role": "admin", "status": "inactive"},
+]
+
+
+def _describe(user):
+    """What creating a user decides, minus the identifiers that differ per row."""
+    return {
+        "role": user.role,
+        "status": user.status,
+        "is_active": user.is_active,
+        "is_staff": user.is_staff,
+        "is_superuser": user.is_superuser,
+        "first_name": user.first_name,
+        "email_domain": user.email.split("@")[1],
+        "usable_password": user.has_usable_password(),
+        "password_ok": user.check_password("pw-12345!"),
+        "client_profile": ClientProfile.objects.filter(user=user).exists(),
+        "stylist_profile": StylistProfile.objects.filter(user=user).exists(),
+    }
+
+
+class ProvisionUsersTests(TestCase):
+
+    def test_matches_create_user(self):
+        bulk_rows = [{**r, "email": f"bulk-{r['email']}", "username": f"bulk-{r['username']}"} for r in ROWS]
+        result = provision_users(bulk_rows, workers=1)
+        self.assertEqual((result.created, result.skipped), (3, []))
+
+        for row in ROWS:
+            fields = {k: v for k, v in row.items() if k not in ("email", "password")}
+            single = User.objects.create_user(f"single-{row['email']}", row.get("password"), **fields)
+            bulk = User.objects.get(username=f"bulk-{row['username']}")
+            self.assertEqual(_describe(bulk), _describe(single), row["email"])
+
+    def test_invalid_rows_are_reported_not_inserted(self):
+        rows = [
+            {"email": "", "username": "nobody"},
+            {"email": "   ", "username": "blank"},
+            {"email": "x@example.com", "username": "x", "role": "superhero"},
+            {"email": "y@example.com", "username": "y", "status": "suspended"},
+            {"email": "ok@example.com", "username": "ok"},
+        ]
+        result = provision_users(rows, workers=1)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([s["reason"] for s in result.skipped], [
+            "missing email", "missing email", "unknown role 'superhero'", "unknown status 'suspended'",
+        ])
+        self.assertEqual(list(User.objects.values_list("username", flat=True)), ["ok"])
+        self.assertTrue(ClientProfile.objects.filter(user__username="ok").exists())
+
+    def test_duplicates_are_skipped(self):
+        User.objects.create_user("taken@example.com", "pw-12345!", username="taken")
+        rows = [
+            {"email": "taken@example.com", "username": "other"},
+            {"email": "new@example.com", "username": "taken"},
+            {"email": "twice@example.com", "username": "twice"},
+            {"email": "twice@example.com", "username": "twice-again"},
+        ]
+        result = provision_users(rows, workers=1)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([s["reason"] for s in result.skipped], [
+            "email already exists", "username already exists", "email already exists",
+        ])
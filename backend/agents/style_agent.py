@@ -1,6 +1,7 @@
 import os
 import json
-from typing import Union
+import time
+from typing import Optional, Union
 
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -51,23 +52,65 @@ No extra keys, no comments, no markdown, no natural language outside this JSON.
 
 # --------- 2. Base LLM (Gemini) --------- #
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.7,
-    google_api_key=os.environ.get("GOOGLE_API_KEY"),
-)
+# STYLE_AGENT_FAKE=True answers with a deterministic stand-in instead of
+# calling Gemini (load tests, offline development). It is read per call; when
+# it is already set at import the Gemini client is not built, so no
+# GOOGLE_API_KEY is needed.
+def fake_enabled() -> bool:
+    return os.environ.get("STYLE_AGENT_FAKE", "False") == "True"
+
+
+if fake_enabled():
+    llm = None
+    stylist_agent = None
+else:
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        temperature=0.7,
+        google_api_key=os.environ.get("GOOGLE_API_KEY"),
+    )
+
 
+    # --------- 3. Agent with structured output --------- #
+
+    # Using ToolStrategy explicitly to force structured output:
+    stylist_agent = create_agent(
+        model=llm,
+        tools=[],  # no external tools for now; pure reasoning on given JSON
+        system_prompt=SYSTEM_PROMPT,
+        response_format=ToolStrategy(AIRecommendations),
+        # You could also pass response_format=AIRecommendations and let it choose strategy
+    )
 
-# --------- 3. Agent with structured output --------- #
 
-# Using ToolStrategy explicitly to force structured output:
-stylist_agent = create_agent(
-    model=llm,
-    tools=[],  # no external tools for now; pure reasoning on given JSON
-    system_prompt=SYSTEM_PROMPT,
-    response_format=ToolStrategy(AIRecommendations),
-    # You could also pass response_format=AIRecommendations and let it choose strategy
-)
+def _fake_recommendations(payload_obj: StylistRequestPayload, payload_json: str, usage: Optional[dict]) -> AIRecommendations:
+    """
+    Five outfits cycling through the drawer, after STYLE_AGENT_FAKE_LATENCY_MS
+    of simulated model time. Token usage is estimated from the prompt size
+    (~4 characters per token) so the budget throttle still has work to do.
+    """
+    latency_ms = float(os.environ.get("STYLE_AGENT_FAKE_LATENCY_MS", "0"))
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000)
+
+    ids = [p.id for p in payload_obj.drawer_products]
+    recommendations = []
+    for i in range(5):
+        product_ids = [ids[(i + k) % len(ids)] for k in range(min(3, len(ids)))] if ids else []
+        recommendations.append({
+            "name": f"Look {i + 1} for {payload_obj.occasion}",
+            "description": f"Offline recommendation for {payload_obj.occasion} in {payload_obj.location}.",
+            "product_ids": product_ids,
+        })
+    result = AIRecommendations.model_validate({"recommendations": recommendations})
+
+    if usage is not None:
+        input_tokens = (len(SYSTEM_PROMPT) + len(payload_json)) // 4
+        output_tokens = len(result.model_dump_json()) // 4
+        usage["input_tokens"] = usage.get("input_tokens", 0) + input_tokens
+        usage["output_tokens"] = usage.get("output_tokens", 0) + output_tokens
+        usage["total_tokens"] = usage.get("total_tokens", 0) + input_tokens + output_tokens
+    return result
 
 
 # --------- 4. High-level helper to call the agent --------- #
@@ -75,11 +118,13 @@ stylist_agent = create_agent(
 def get_outfit_recommendations(
     payload: Union[StylistRequestPayload, dict],
     thread_id: str = "style-session-1",
+    usage: Optional[dict] = None,
 ) -> AIRecommendations:
     """
     - Validates input against StylistRequestPayload
     - Sends it to the agent
     - Returns a validated AIRecommendations instance
+    - If `usage` is given, fills in {"input_tokens", "output_tokens", "total_tokens"}
     """
 
     # 1) Validate + normalize payload into Pydantic model
@@ -101,6 +146,11 @@ def get_outfit_recommendations(
         ),
     }
 
+    if fake_enabled():
+        return _fake_recommendations(payload_obj, payload_json, usage)
+    if stylist_agent is None:
+        raise RuntimeError("the Gemini agent was not built (STYLE_AGENT_FAKE was set at startup)")
+
     # 3) Optional config (thread_id gives you conversation separation later)
     config = {"configurable": {"thread_id": thread_id}}
 
@@ -115,4 +165,11 @@ def get_outfit_recommendations(
     # `create_agent` with ToolStrategy returns your structured result here:
     structured: AIRecommendations = result["structured_response"]
 
+    # 5) Token accounting (feeds the daily budget throttle)
+    if usage is not None:
+        for message in result.get("messages", []):
+            for k, v in (getattr(message, "usage_metadata", None) or {}).items():
+                if k in ("input_tokens", "output_tokens", "total_tokens"):
+                    usage[k] = usage.get(k, 0) + int(v or 0)
+
     return structured
@@ -1,3 +1,14 @@
 from django.contrib import admin
 
-# Register your models here.
+from appointments.models import Appointment, Availability
+
+
+@admin.register(Availability)
+class AvailabilityAdmin(admin.ModelAdmin):
+    list_display = ("id", "stylist", "start_at", "end_at")
+
+
+@admin.register(Appointment)
+class AppointmentAdmin(admin.ModelAdmin):
+    list_display = ("id", "stylist", "client", "start_at", "end_at", "status", "created_at")
+    list_filter = ("status",)
@@ -0,0 +1,56 @@
+"""
+PostgreSQL-only booking guarantees.
+
+- btree_gist lets one GiST index mix `stylist_id WITH =` and range overlap.
+- The exclusion constraint makes double booking impossible at the database
+  level, whatever the application code does.
+- GiST indexes on tstzrange(start_at, end_at) serve overlap (&&) lookups.
+
+SQLite (core/settings/test.py) skips these; appointments.services still checks
+overlaps under a per-stylist row lock.
+"""
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    ALTER TABLE appointments_appointment
+    ADD CONSTRAINT appointment_no_double_booking
+    EXCLUDE USING gist (
+        stylist_id WITH =,
+        tstzrange(start_at, end_at, '[)') WITH &&
+    ) WHERE (status = 'booked')
+    """,
+    """
+    CREATE INDEX availability_stylist_range_gist
+    ON appointments_availability USING gist (stylist_id, tstzrange(start_at, end_at, '[)'))
+    """,
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS availability_stylist_range_gist",
+    "ALTER TABLE appointments_appointment DROP CONSTRAINT IF EXISTS appointment_no_double_booking",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD}),
+            _run({"postgresql": POSTGRES_REVERSE}),
+        ),
+    ]
@@ -1,3 +1,64 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from stylist.models import StylistProfile
+
+
+class Availability(models.Model):
+    """
+    A window in which a stylist accepts bookings.
+
+    Appointments must fall inside the union of the stylist's windows.
+    """
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.CASCADE, related_name="availability")
+    start_at = models.DateTimeField()
+    end_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["start_at"]
+        indexes = [
+            models.Index(fields=["stylist", "start_at"], name="availability_stylist_start_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(end_at__gt=models.F("start_at")), name="availability_end_after_start"),
+        ]
+
+    def __str__(self):
+        return f"Availability<{self.stylist_id}: {self.start_at:%Y-%m-%d %H:%M}–{self.end_at:%H:%M}>"
+
+
+class Appointment(models.Model):
+    """
+    A client's booking with a stylist over [start_at, end_at).
+
+    On PostgreSQL an exclusion constraint over tstzrange(start_at, end_at)
+    rejects overlapping BOOKED appointments for the same stylist
+    (migration 0002_booking_constraints).
+    """
+    class Status(models.TextChoices):
+        BOOKED = "booked", "Booked"
+        CANCELLED = "cancelled", "Cancelled"
+        COMPLETED = "completed", "Completed"
+
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.CASCADE, related_name="appointments")
+    client = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="appointments")
+    start_at = models.DateTimeField()
+    end_at = models.DateTimeField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.BOOKED)
+    note = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["start_at"]
+        indexes = [
+            models.Index(fields=["stylist", "start_at"], name="appointment_stylist_start_idx"),
+            models.Index(fields=["client", "start_at"], name="appointment_client_start_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(end_at__gt=models.F("start_at")), name="appointment_end_after_start"),
+        ]
+
+    def __str__(self):
+        return f"Appointment<{self.stylist_id} ← {self.client_id} @ {self.start_at:%Y-%m-%d %H:%M}>"
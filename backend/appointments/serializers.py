@@ -0,0 +1,51 @@
+from rest_framework import serializers
+
+from appointments.models import Appointment, Availability
+from appointments.services import MAX_APPOINTMENT_DURATION, MAX_AVAILABILITY_DURATION
+from stylist.models import StylistProfile
+
+
+class AvailabilitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Availability
+        fields = ["id", "start_at", "end_at", "created_at"]
+        read_only_fields = ["id", "created_at"]
+
+    def validate(self, attrs):
+        start = attrs.get("start_at", getattr(self.instance, "start_at", None))
+        end = attrs.get("end_at", getattr(self.instance, "end_at", None))
+        if end <= start:
+            raise serializers.ValidationError({"end_at": "Must be after start_at."})
+        if end - start > MAX_AVAILABILITY_DURATION:
+            raise serializers.ValidationError({"end_at": "A window may span at most one day."})
+        return attrs
+
+
+class AppointmentSerializer(serializers.ModelSerializer):
+    stylist = serializers.PrimaryKeyRelatedField(queryset=StylistProfile.objects.filter(is_listed=True))
+    client = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:
+        model = Appointment
+        fields = ["id", "stylist", "client", "start_at", "end_at", "status", "note", "created_at", "updated_at"]
+        read_only_fields = ["id", "client", "status", "created_at", "updated_at"]
+
+
+class SlotSearchQuerySerializer(serializers.Serializer):
+    stylists = serializers.CharField(help_text="Comma-separated stylist ids (max 50)")
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    duration = serializers.IntegerField(
+        min_value=15, max_value=int(MAX_APPOINTMENT_DURATION.total_seconds() // 60), default=60,
+        help_text="Minutes",
+    )
+    per_stylist = serializers.IntegerField(min_value=1, max_value=20, default=5)
+
+    def validate_stylists(self, value):
+        ids = [v.strip() for v in value.split(",") if v.strip()]
+        if not ids:
+            raise serializers.ValidationError("At least one stylist id is required.")
+        if len(ids) > 50:
+            raise serializers.ValidationError("At most 50 stylists per search.")
+        field = serializers.UUIDField()
+        return list(dict.fromkeys(field.to_internal_value(v) for v in ids))
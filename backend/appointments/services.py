@@ -0,0 +1,237 @@
+"""
+appointments/services.py
+
+Booking and free-slot search.
+
+Slot search works on per-stylist interval lists:
+- open:  merged availability windows
+- busy:  BOOKED appointments
+both sorted by start. For the hot window (the next HOT_WINDOW_DAYS days) these
+lists are cached per stylist, so searching 50 stylists is one cache
+`get_many` plus, for cold stylists, two indexed queries covering all of them.
+Bookings and availability edits drop the affected stylist's entry
+(appointments/signals.py).
+
+Every DB lookup is a (stylist, start_at) index range scan: appointments are
+capped at MAX_APPOINTMENT_DURATION, so an overlap query can bound start_at on
+both sides instead of scanning a stylist's whole history.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from appointments.models import Appointment, Availability
+from stylist.models import StylistProfile
+
+Interval = Tuple[datetime, datetime]
+
+MAX_APPOINTMENT_DURATION = timedelta(hours=8)
+MAX_AVAILABILITY_DURATION = timedelta(days=1)
+HOT_WINDOW_DAYS = 14
+HOT_WINDOW_CACHE_TIMEOUT = 60 * 10
+SLOT_STEP = timedelta(minutes=15)
+MAX_SEARCH_WINDOW = timedelta(days=31)
+
+
+class BookingError(ValueError):
+    pass
+
+
+class SlotUnavailable(BookingError):
+    pass
+
+
+# --------------------------------------------------------------------------
+# Interval helpers
+# --------------------------------------------------------------------------
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    out: List[Interval] = []
+    for start, end in sorted(intervals):
+        if out and start <= out[-1][1]:
+            if end > out[-1][1]:
+                out[-1] = (out[-1][0], end)
+        else:
+            out.append((start, end))
+    return out
+
+
+def subtract_intervals(open_: Sequence[Interval], busy: Sequence[Interval]) -> List[Interval]:
+    """open_ − busy; both sorted, open_ non-overlapping."""
+    free: List[Interval] = []
+    busy_starts = [b[0] for b in busy]
+    for start, end in open_:
+        cursor = start
+        # first busy interval that could overlap [start, end)
+        i = max(bisect_left(busy_starts, start) - 1, 0)
+        while i < len(busy) and busy[i][0] < end:
+            b_start, b_end = busy[i]
+            if b_end > cursor:
+                if b_start > cursor:
+                    free.append((cursor, min(b_start, end)))
+                cursor = max(cursor, b_end)
+            i += 1
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def covers(open_: Sequence[Interval], start: datetime, end: datetime) -> bool:
+    """True if [start, end) lies inside a single merged open interval."""
+    starts = [o[0] for o in open_]
+    i = bisect_right(starts, start) - 1
+    return i >= 0 and open_[i][0] <= start and end <= open_[i][1]
+
+
+def _align(dt: datetime) -> datetime:
+    step = int(SLOT_STEP.total_seconds())
+    ts = dt.timestamp()
+    rem = ts % step
+    return dt if rem == 0 else dt + timedelta(seconds=step - rem)
+
+
+def slots_in(free: Sequence[Interval], duration: timedelta, start: datetime, end: datetime, limit: int) -> List[Interval]:
+    out: List[Interval] = []
+    for f_start, f_end in free:
+        s = _align(max(f_start, start))
+        while s + duration <= min(f_end, end) and len(out) < limit:
+            out.append((s, s + duration))
+            s += SLOT_STEP
+        if len(out) >= limit:
+            break
+    return out
+
+
+# --------------------------------------------------------------------------
+# Interval loading (DB + hot-window cache)
+# --------------------------------------------------------------------------
+
+def _load_intervals(stylist_ids: Sequence, start: datetime, end: datetime) -> Dict[object, Tuple[List[Interval], List[Interval]]]:
+    """(open, busy) per stylist for [start, end), two indexed queries in total."""
+    out: Dict[object, Tuple[List[Interval], List[Interval]]] = {pk: ([], []) for pk in stylist_ids}
+
+    windows = Availability.objects.filter(
+        stylist_id__in=stylist_ids,
+        start_at__lt=end,
+        start_at__gt=start - MAX_AVAILABILITY_DURATION,
+        end_at__gt=start,
+    ).values_list("stylist_id", "start_at", "end_at")
+    for pk, s, e in windows:
+        out[pk][0].append((s, e))
+
+    booked = Appointment.objects.filter(
+        stylist_id__in=stylist_ids,
+        status=Appointment.Status.BOOKED,
+        start_at__lt=end,
+        start_at__gt=start - MAX_APPOINTMENT_DURATION,
+        end_at__gt=start,
+    ).values_list("stylist_id", "start_at", "end_at")
+    for pk, s, e in booked:
+        out[pk][1].append((s, e))
+
+    return {pk: (merge_intervals(o), sorted(b)) for pk, (o, b) in out.items()}
+
+
+def _hot_window() -> Interval:
+    # Midnight today through the end of day HOT_WINDOW_DAYS, so a search of
+    # HOT_WINDOW_DAYS starting "now" always fits.
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today, time.min))
+    return start, start + timedelta(days=HOT_WINDOW_DAYS + 1)
+
+
+def _hot_key(stylist_id, window_start: datetime) -> str:
+    return f"appointments:intervals:{stylist_id}:{window_start.date().isoformat()}"
+
+
+def get_intervals(stylist_ids: Sequence, start: datetime, end: datetime) -> Dict[object, Tuple[List[Interval], List[Interval]]]:
+    """(open, busy) per stylist; served from the hot-window cache when the range fits in it."""
+    hot_start, hot_end = _hot_window()
+    if start < hot_start or end > hot_end:
+        return _load_intervals(stylist_ids, start, end)
+
+    keys = {_hot_key(pk, hot_start): pk for pk in stylist_ids}
+    cached = cache.get_many(list(keys))
+    out = {keys[k]: v for k, v in cached.items()}
+
+    missing = [pk for pk in stylist_ids if pk not in out]
+    if missing:
+        loaded = _load_intervals(missing, hot_start, hot_end)
+        cache.set_many({_hot_key(pk, hot_start): v for pk, v in loaded.items()}, HOT_WINDOW_CACHE_TIMEOUT)
+        out.update(loaded)
+    return out
+
+
+def invalidate_intervals(stylist_id) -> None:
+    hot_start, _ = _hot_window()
+    cache.delete(_hot_key(stylist_id, hot_start))
+
+
+# --------------------------------------------------------------------------
+# Public API
+# --------------------------------------------------------------------------
+
+def find_free_slots(
+    stylist_ids: Sequence,
+    start: datetime,
+    end: datetime,
+    duration: timedelta,
+    per_stylist: int = 5,
+) -> Dict[object, List[Interval]]:
+    """Earliest `per_stylist` free slots of `duration` for each stylist within [start, end)."""
+    if end <= start:
+        raise BookingError("End of the search window must be after its start.")
+    if end - start > MAX_SEARCH_WINDOW:
+        raise BookingError("Search window is too large.")
+    if duration <= timedelta(0) or duration > MAX_APPOINTMENT_DURATION:
+        raise BookingError("Invalid appointment duration.")
+
+    intervals = get_intervals(list(stylist_ids), start, end)
+    return {
+        pk: slots_in(subtract_intervals(open_, busy), duration, start, end, per_stylist)
+        for pk, (open_, busy) in intervals.items()
+    }
+
+
+def book_appointment(*, client, stylist: StylistProfile, start_at: datetime, end_at: datetime, note: Optional[str] = None) -> Appointment:
+    """
+    Book [start_at, end_at) with `stylist`.
+
+    The stylist row is locked for the check-and-insert so concurrent bookings
+    for the same stylist serialize; on PostgreSQL the exclusion constraint is
+    the final guard.
+    """
+    if end_at <= start_at:
+        raise BookingError("Appointment must end after it starts.")
+    if end_at - start_at > MAX_APPOINTMENT_DURATION:
+        raise BookingError("Appointment is too long.")
+    if start_at < timezone.now():
+        raise BookingError("Appointment must be in the future.")
+
+    try:
+        with transaction.atomic():
+            StylistProfile.objects.select_for_update().only("pk").get(pk=stylist.pk)
+            open_, busy = _load_intervals([stylist.pk], start_at, end_at)[stylist.pk]
+            if not covers(open_, start_at, end_at):
+                raise SlotUnavailable("The stylist is not available at that time.")
+            if busy:
+                raise SlotUnavailable("That time slot is already booked.")
+            appointment = Appointment.objects.create(
+                stylist=stylist, client=client, start_at=start_at, end_at=end_at, note=note,
+            )
+    except IntegrityError:
+        raise SlotUnavailable("That time slot is already booked.")
+    return appointment
+
+
+def cancel_appointment(appointment: Appointment) -> Appointment:
+    if appointment.status != Appointment.Status.BOOKED:
+        raise BookingError("Only booked appointments can be cancelled.")
+    appointment.status = Appointment.Status.CANCELLED
+    appointment.save(update_fields=["status", "updated_at"])
+    return appointment
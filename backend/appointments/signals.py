@@ -0,0 +1,23 @@
+"""
+appointments/signals.py
+
+Drop a stylist's cached hot-window intervals whenever their availability or
+bookings change. Invalidation runs after commit so a concurrent reader cannot
+re-cache the pre-write state.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from appointments.models import Appointment, Availability
+from appointments.services import invalidate_intervals
+
+
+@receiver(post_save, sender=Availability)
+@receiver(post_delete, sender=Availability)
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def invalidate_stylist_intervals(sender, instance, **kwargs):
+    stylist_id = instance.stylist_id
+    transaction.on_commit(lambda: invalidate_intervals(stylist_id))
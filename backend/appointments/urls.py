@@ -0,0 +1,21 @@
+# appointments/urls.py
+from django.urls import include, path
+from rest_framework.routers import SimpleRouter
+
+from appointments.views import (
+    ClientAppointmentViewSet,
+    StylistAppointmentViewSet,
+    StylistAvailabilityViewSet,
+)
+
+client_router = SimpleRouter()
+client_router.register(r"appointments", ClientAppointmentViewSet, basename="client-appointments")
+
+stylist_router = SimpleRouter()
+stylist_router.register(r"availability", StylistAvailabilityViewSet, basename="stylist-availability")
+stylist_router.register(r"appointments", StylistAppointmentViewSet, basename="stylist-appointments")
+
+urlpatterns = [
+    path("client/", include(client_router.urls)),
+    path("stylist/", include(stylist_router.urls)),
+]
@@ -1,3 +1,112 @@
-from django.shortcuts import render
+from datetime import timedelta
 
-# Create your views here.
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from appointments.models import Appointment, Availability
+from appointments.serializers import (
+    AppointmentSerializer,
+    AvailabilitySerializer,
+    SlotSearchQuerySerializer,
+)
+from appointments.services import (
+    HOT_WINDOW_DAYS,
+    BookingError,
+    book_appointment,
+    cancel_appointment,
+    find_free_slots,
+)
+from common.permissions import IsClient, IsStylist
+
+
+class ClientAppointmentViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Client bookings: list/retrieve own appointments, book, cancel, and search
+    free slots across stylists.
+    """
+    serializer_class = AppointmentSerializer
+    permission_classes = [IsAuthenticated, IsClient]
+
+    def get_queryset(self):
+        return Appointment.objects.filter(client_id=self.request.user.pk).order_by("-start_at")
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        try:
+            serializer.instance = book_appointment(
+                client=self.request.user,
+                stylist=data["stylist"],
+                start_at=data["start_at"],
+                end_at=data["end_at"],
+                note=data.get("note"),
+            )
+        except BookingError as e:
+            raise ValidationError({"detail": str(e)})
+
+    @action(detail=True, methods=["post"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        try:
+            appointment = cancel_appointment(self.get_object())
+        except BookingError as e:
+            raise ValidationError({"detail": str(e)})
+        return Response(AppointmentSerializer(appointment).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="slots")
+    def slots(self, request):
+        """
+        GET /client/appointments/slots/?stylists=<id>,<id>&start=<iso>&end=<iso>&duration=60&per_stylist=5
+        Earliest free slots per stylist (defaults: from now, over the hot window).
+        """
+        params = SlotSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        now = timezone.now()
+        start = max(data.get("start") or now, now)
+        end = data.get("end") or start + timedelta(days=HOT_WINDOW_DAYS)
+        try:
+            found = find_free_slots(
+                data["stylists"], start, end,
+                timedelta(minutes=data["duration"]),
+                per_stylist=data["per_stylist"],
+            )
+        except BookingError as e:
+            raise ValidationError({"detail": str(e)})
+
+        return Response({
+            str(pk): [{"start_at": s, "end_at": e} for s, e in slots]
+            for pk, slots in found.items()
+        })
+
+
+class StylistAvailabilityViewSet(viewsets.ModelViewSet):
+    """CRUD for the authenticated stylist's availability windows."""
+    serializer_class = AvailabilitySerializer
+    permission_classes = [IsAuthenticated, IsStylist]
+
+    def get_queryset(self):
+        qs = Availability.objects.filter(stylist_id=self.request.user.pk)
+        if self.action == "list":
+            qs = qs.filter(end_at__gt=timezone.now())
+        return qs
+
+    def perform_create(self, serializer):
+        serializer.save(stylist_id=self.request.user.pk)
+
+
+class StylistAppointmentViewSet(viewsets.ReadOnlyModelViewSet):
+    """The authenticated stylist's bookings."""
+    serializer_class = AppointmentSerializer
+    permission_classes = [IsAuthenticated, IsStylist]
+
+    def get_queryset(self):
+        return Appointment.objects.filter(stylist_id=self.request.user.pk).order_by("start_at")
@@ -1,6 +1,6 @@
 # apps/accounts/admin.py
 from django.contrib import admin
-from .models import ClientProfile, WardrobeItem
+from .models import ClientProfile, WardrobeItem, WardrobeItemTombstone
 
 @admin.register(ClientProfile)
 class ClientProfileAdmin(admin.ModelAdmin):
@@ -9,4 +9,9 @@ class ClientProfileAdmin(admin.ModelAdmin):
 
 @admin.register(WardrobeItem)
 class WardrobeItemAdmin(admin.ModelAdmin):
-    list_display = ("id", "title", "user", "category", "color", "created_at")
\ No newline at end of file
+    list_display = ("id", "title", "user", "category", "color", "created_at")
+
+
+@admin.register(WardrobeItemTombstone)
+class WardrobeItemTombstoneAdmin(admin.ModelAdmin):
+    list_display = ("id", "item_id", "user", "deleted_at")
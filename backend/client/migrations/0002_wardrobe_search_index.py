@@ -0,0 +1,100 @@
+"""
+Full-text index over WardrobeItem.title / description.
+
+The index lives outside the model definition because the two engines we run on
+need different storage:
+
+- PostgreSQL (dev/prod): a stored generated ``tsvector`` column with a
+  (user_id, search_vector) GIN index, plus a trigram GIN index on ``title``
+  for typo-tolerant fallback matches.
+- SQLite (core/settings/test.py): an external-content FTS5 table kept in sync
+  with triggers.
+"""
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    """
+    ALTER TABLE client_wardrobeitem
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX client_wardrobe_search_gin
+    ON client_wardrobeitem USING gin (user_id, search_vector)
+    """,
+    """
+    CREATE INDEX client_wardrobe_title_trgm
+    ON client_wardrobeitem USING gin (title gin_trgm_ops)
+    """,
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS client_wardrobe_title_trgm",
+    "DROP INDEX IF EXISTS client_wardrobe_search_gin",
+    "ALTER TABLE client_wardrobeitem DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE client_wardrobeitem_fts USING fts5(
+        title, description, user_id UNINDEXED,
+        content='client_wardrobeitem', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER client_wardrobeitem_fts_ai AFTER INSERT ON client_wardrobeitem BEGIN
+        INSERT INTO client_wardrobeitem_fts(rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER client_wardrobeitem_fts_ad AFTER DELETE ON client_wardrobeitem BEGIN
+        INSERT INTO client_wardrobeitem_fts(client_wardrobeitem_fts, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER client_wardrobeitem_fts_au AFTER UPDATE ON client_wardrobeitem BEGIN
+        INSERT INTO client_wardrobeitem_fts(client_wardrobeitem_fts, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+        INSERT INTO client_wardrobeitem_fts(rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END
+    """,
+    "INSERT INTO client_wardrobeitem_fts(client_wardrobeitem_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS client_wardrobeitem_fts_au",
+    "DROP TRIGGER IF EXISTS client_wardrobeitem_fts_ad",
+    "DROP TRIGGER IF EXISTS client_wardrobeitem_fts_ai",
+    "DROP TABLE IF EXISTS client_wardrobeitem_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_REVERSE, "sqlite": SQLITE_REVERSE}),
+        ),
+    ]
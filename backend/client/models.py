@@ -82,6 +82,29 @@ class WardrobeItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # keyset scan for the delta sync feed (client/services/sync.py)
+            models.Index(fields=["user", "updated_at", "id"], name="wardrobe_user_updated_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.title} ({self.category}) - {self.user.username}"
\ No newline at end of file
+        return f"{self.title} ({self.category}) - {self.user.username}"
+
+
+class WardrobeItemTombstone(models.Model):
+    """
+    Deletion log for the wardrobe sync feed: one row per deleted WardrobeItem,
+    so clients holding a local copy can drop it on their next sync.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="wardrobe_tombstones")
+    item_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at", "id"], name="wardrobe_tomb_user_del_idx"),
+        ]
+
+    def __str__(self):
+        return f"Tombstone<{self.item_id}> - {self.user_id}"
\ No newline at end of file
@@ -1,11 +1,11 @@
 # client/serializers.py
 
+import logging
 import os
 
 # Django imports
 from django.conf import settings
 from django.contrib.auth import (
-    authenticate,
     get_user_model,
     password_validation,
 )
@@ -21,10 +21,12 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 # Local imports
+from common.passwords import verify_credentials
 from common.utils import get_tokens_for_user, send_password_reset_email
 from client.models import ClientProfile
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class ClientRegisterSerializer(serializers.ModelSerializer):
@@ -55,7 +57,8 @@ class ClientLoginSerializer(serializers.Serializer):
         if not email or not password:
             raise serializers.ValidationError(_("Both email and password are required."))
 
-        user = authenticate(request=self.context.get("request"), email=email, password=password)
+        # Hashing runs in the bounded login pool; may raise PasswordHashingBusy (503)
+        user = verify_credentials(email, password, request=self.context.get("request"))
 
         if not user:
             raise serializers.ValidationError(_("Invalid email or password."))
@@ -206,7 +209,7 @@ class ClientSendPasswordResetEmailSerializer(serializers.Serializer):
 
         # DEV: print link and expose it via serializer for convenience
         if getattr(settings, "DEBUG", False):
-            print(f"[DEV] Client password reset link: {link}")
+            logger.info("Client password reset link: %s", link)
 
         self.reset_link = link
         send_password_reset_email(user, link)
@@ -1,7 +1,7 @@
 # apps/client/serializers/stylist_public.py
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from stylist.models import StylistProfile  # adjust import if needed
+from stylist.models import Review, StylistProfile  # adjust import if needed
 
 User = get_user_model()
 
@@ -26,3 +26,26 @@ class StylistPublicSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = fields
+
+
+class StylistReviewSerializer(serializers.ModelSerializer):
+    client = serializers.CharField(source="client.username", read_only=True)
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+
+    class Meta:
+        model = Review
+        fields = ["id", "client", "rating", "comment", "created_at"]
+        read_only_fields = ["id", "client", "created_at"]
+
+
+class StylistMatchQuerySerializer(serializers.Serializer):
+    styles = serializers.CharField(required=False, allow_blank=True, help_text="Comma-separated style tags")
+    limit = serializers.IntegerField(min_value=1, max_value=50, required=False, default=10)
+
+
+class StylistMatchSerializer(StylistPublicSerializer):
+    match_score = serializers.FloatField(read_only=True)
+
+    class Meta(StylistPublicSerializer.Meta):
+        fields = StylistPublicSerializer.Meta.fields + ["match_score"]
+        read_only_fields = fields
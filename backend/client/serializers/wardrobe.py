@@ -16,3 +16,28 @@ class WardrobeItemSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data["user"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class WardrobeSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, required=False, default=20)
+
+
+class WardrobeSearchResultSerializer(WardrobeItemSerializer):
+    rank = serializers.FloatField(source="search_rank", read_only=True)
+
+    class Meta(WardrobeItemSerializer.Meta):
+        fields = WardrobeItemSerializer.Meta.fields + ["rank"]
+        read_only_fields = fields
+
+
+class WardrobeSyncQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(required=False, allow_blank=True)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, required=False, default=200)
+
+
+class WardrobeSyncSerializer(serializers.Serializer):
+    items = WardrobeItemSerializer(many=True, read_only=True)
+    deleted = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    next_cursor = serializers.CharField(read_only=True)
+    has_more = serializers.BooleanField(read_only=True)
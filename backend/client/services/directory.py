@@ -0,0 +1,43 @@
+"""
+client/services/directory.py
+
+Read-through cache for the public stylist directory (client/views/stylist.py).
+
+List pages and detail entries are cached already serialized in the tiered
+cache (common/cache.py), versioned by the directory generation. Any
+StylistProfile write or stylist User write bumps the generation
+(stylist/signals.py), so every cached page and entry is dropped at once
+without enumerating keys.
+"""
+
+import hashlib
+from typing import Any, Callable
+
+from django.conf import settings
+
+from common.cache import bump_generation, get_or_build
+
+DIRECTORY_GENERATION = "stylist-directory"
+
+
+def _timeout() -> int:
+    return int(getattr(settings, "STYLIST_DIRECTORY_CACHE_TIMEOUT", 300))
+
+
+def _params_digest(query_params) -> str:
+    items = sorted((k, v) for k in query_params for v in query_params.getlist(k))
+    return hashlib.sha1(repr(items).encode()).hexdigest()[:16]
+
+
+def cached_directory_page(query_params, builder: Callable[[], Any]) -> Any:
+    key = f"stylist-directory:list:{_params_digest(query_params)}"
+    return get_or_build(key, builder, _timeout(), versions=[DIRECTORY_GENERATION])
+
+
+def cached_directory_entry(stylist_pk, builder: Callable[[], Any]) -> Any:
+    key = f"stylist-directory:detail:{stylist_pk}"
+    return get_or_build(key, builder, _timeout(), versions=[DIRECTORY_GENERATION])
+
+
+def invalidate_directory() -> None:
+    bump_generation(DIRECTORY_GENERATION)
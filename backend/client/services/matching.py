@@ -0,0 +1,186 @@
+"""
+client/services/matching.py
+
+Client → stylist matching.
+
+Every listed stylist is a row in an in-process feature matrix:
+- one 0/1 column per normalized expertise tag
+- years_experience (capped, scaled to 0..1)
+- rank_score (Bayesian rating, scaled to 0..1)
+
+A client becomes a query vector over the same tag vocabulary, built from their
+ClientProfile (body_shape, face_shape, skin_tone) plus any requested styles.
+Scoring the whole roster is one matrix-vector product followed by
+argpartition for the top-k, so it stays in the millisecond range for tens of
+thousands of stylists.
+
+The matrix is refreshed incrementally: at most every MATCH_REFRESH_INTERVAL
+seconds it loads only the profiles whose `updated_at` moved past its watermark
+(minus SYNC_CURSOR_OVERLAP_SECONDS, the same late-commit window the wardrobe
+sync feed uses) and rewrites those rows. Deleting a profile bumps a generation token that
+forces a full rebuild in every process.
+"""
+
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from common.cache import bump_generation, get_generation
+from stylist.models import StylistProfile
+from stylist.services import normalize_expertise, normalize_tags
+
+MATRIX_GENERATION = "stylist-match-matrix"
+
+TAG_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.2
+RATING_WEIGHT = 0.2
+EXPERIENCE_CAP = 20  # years; more than this scores the same
+MAX_RATING = 5.0
+
+_FIELDS = ("pk", "expertise", "years_experience", "rank_score", "is_listed", "updated_at")
+
+
+def _refresh_interval() -> float:
+    return float(getattr(settings, "MATCH_REFRESH_INTERVAL", 5))
+
+
+def _watermark_overlap() -> timedelta:
+    """Rows committed out of `updated_at` order are caught by re-reading this window."""
+    return timedelta(seconds=float(getattr(settings, "SYNC_CURSOR_OVERLAP_SECONDS", 60)))
+
+
+class StylistFeatureMatrix:
+    """Per-process feature matrix over the stylist roster (see module docstring)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.ids: List = []
+        self.row_of: Dict = {}
+        self.vocab: Dict[str, int] = {}
+        self.tags = np.zeros((0, 0), dtype=np.float32)
+        self.static = np.zeros(0, dtype=np.float32)  # experience + rating part of the score
+        self.listed = np.zeros(0, dtype=bool)
+        self.watermark = None
+        self.generation: Optional[str] = None
+        self.checked_at = 0.0
+
+    # --- maintenance ------------------------------------------------------
+
+    def _ensure_shape(self, n_rows: int, n_cols: int):
+        """Grow storage geometrically so appending rows/tags is amortized O(1)."""
+        rows, cols = self.tags.shape
+        if n_rows <= rows and n_cols <= cols:
+            return
+        new_rows = max(n_rows, rows * 2, 64) if n_rows > rows else rows
+        new_cols = max(n_cols, cols * 2, 32) if n_cols > cols else cols
+
+        tags = np.zeros((new_rows, new_cols), dtype=np.float32)
+        tags[:rows, :cols] = self.tags
+        self.tags = tags
+        if new_rows > rows:
+            static = np.zeros(new_rows, dtype=np.float32)
+            static[:rows] = self.static
+            listed = np.zeros(new_rows, dtype=bool)
+            listed[:rows] = self.listed
+            self.static, self.listed = static, listed
+
+    def _apply(self, rows: Iterable[dict]):
+        for r in rows:
+            tags = normalize_expertise(r["expertise"])
+            for t in tags:
+                self.vocab.setdefault(t, len(self.vocab))
+
+            i = self.row_of.get(r["pk"])
+            if i is None:
+                i = len(self.ids)
+                self.ids.append(r["pk"])
+                self.row_of[r["pk"]] = i
+            self._ensure_shape(len(self.ids), len(self.vocab))
+
+            self.tags[i, :] = 0.0
+            if tags:
+                self.tags[i, [self.vocab[t] for t in tags]] = 1.0
+            years = min(r["years_experience"] or 0, EXPERIENCE_CAP) / EXPERIENCE_CAP
+            rating = min(max(r["rank_score"] or 0.0, 0.0), MAX_RATING) / MAX_RATING
+            self.static[i] = EXPERIENCE_WEIGHT * years + RATING_WEIGHT * rating
+            self.listed[i] = bool(r["is_listed"])
+
+            if self.watermark is None or r["updated_at"] > self.watermark:
+                self.watermark = r["updated_at"]
+
+    def refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.checked_at < _refresh_interval():
+            return
+        with self._lock:
+            if not force and now - self.checked_at < _refresh_interval():
+                return
+            qs = StylistProfile.objects.all()
+            generation = get_generation(MATRIX_GENERATION)
+            if force or generation != self.generation:
+                self._reset()
+                self.generation = generation
+            elif self.watermark is not None:
+                qs = qs.filter(updated_at__gte=self.watermark - _watermark_overlap())
+            self._apply(qs.order_by("updated_at").values(*_FIELDS).iterator(chunk_size=2000))
+            self.checked_at = time.monotonic()
+
+    # --- scoring ----------------------------------------------------------
+
+    def query_vector(self, wanted: Iterable[str]) -> np.ndarray:
+        q = np.zeros(self.tags.shape[1], dtype=np.float32)
+        cols = [self.vocab[t] for t in normalize_tags(wanted) if t in self.vocab]
+        if cols:
+            q[cols] = 1.0
+        return q
+
+    def top_k(self, wanted: Iterable[str], k: int) -> List[Tuple[object, float]]:
+        self.refresh()
+        wanted = normalize_tags(wanted)
+        with self._lock:
+            n = len(self.ids)
+            if n == 0:
+                return []
+            q = self.query_vector(wanted)
+            coverage = (self.tags[:n] @ q) / max(len(wanted), 1)  # share of wanted tags covered
+            scores = TAG_WEIGHT * coverage + self.static[:n]
+            scores = np.where(self.listed[:n], scores, -np.inf)
+            ids = self.ids[:n]
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(ids[i], float(scores[i])) for i in top]
+
+
+feature_matrix = StylistFeatureMatrix()
+
+
+def client_match_terms(profile, styles: Iterable[str] = ()) -> List[str]:
+    """Tags a client wants a stylist to cover: profile attributes + requested styles."""
+    terms = [
+        getattr(profile, "body_shape", None),
+        getattr(profile, "face_shape", None),
+        getattr(profile, "skin_tone", None),
+    ]
+    terms.extend(styles or [])
+    return normalize_tags(t for t in terms if t)
+
+
+def match_stylists(profile, styles: Iterable[str] = (), k: int = 10) -> List[Tuple[object, float]]:
+    """[(stylist_pk, score)] best first; score is in 0..1."""
+    return feature_matrix.top_k(client_match_terms(profile, styles), k)
+
+
+def invalidate_match_matrix() -> None:
+    """Force every process to rebuild its matrix (used when profiles are deleted)."""
+    bump_generation(MATRIX_GENERATION)
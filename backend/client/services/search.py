@@ -0,0 +1,140 @@
+"""
+client/services/search.py
+
+Ranked full-text search over a user's wardrobe.
+
+Backed by the index created in client/migrations/0002_wardrobe_search_index.py:
+- PostgreSQL → tsvector + GIN, ts_rank_cd ranking, pg_trgm fallback for typos.
+- SQLite     → FTS5 with bm25 ranking (used by core/settings/test.py).
+- Anything else has no index: an unranked `icontains` scan of the user's own
+  items, newest first, so search degrades instead of failing.
+
+Every query is scoped to one user and bounded by `limit`; the indexed engines
+resolve matches through the index, so nothing scans the whole wardrobe table.
+"""
+
+import re
+from functools import reduce
+from operator import and_
+from typing import List, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from client.models import WardrobeItem
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# pg_trgm word_similarity cutoff for the typo fallback (0..1, higher = stricter)
+TRIGRAM_THRESHOLD = 0.4
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(query: str) -> List[str]:
+    """Split user input into bare word tokens (drops every operator character)."""
+    return _TOKEN_RE.findall((query or "").lower())[:10]
+
+
+def _user_db_value(user) -> str:
+    """User pk as stored in client_wardrobeitem.user_id for the active backend."""
+    return WardrobeItem._meta.get_field("user").target_field.get_db_prep_value(
+        user.pk, connection
+    )
+
+
+def _postgres_search(user, tokens: List[str], limit: int) -> List[Tuple[int, float]]:
+    # Every token is a prefix match: "blaz jack" → blaz:* & jack:*
+    tsquery = " & ".join(f"{t}:*" for t in tokens)
+    uid = _user_db_value(user)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT id, ts_rank_cd(search_vector, q) AS rank
+            FROM client_wardrobeitem, to_tsquery('english', %s) AS q
+            WHERE user_id = %s AND search_vector @@ q
+            ORDER BY rank DESC, id DESC
+            LIMIT %s
+            """,
+            [tsquery, uid, limit],
+        )
+        rows = cursor.fetchall()
+    if rows:
+        return rows
+
+    # Typo fallback: trigram word similarity on the title (GIN trgm index).
+    # The threshold is transaction-local, hence the atomic block.
+    phrase = " ".join(tokens)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+            [str(TRIGRAM_THRESHOLD)],
+        )
+        cursor.execute(
+            """
+            SELECT id, word_similarity(%s, title) AS rank
+            FROM client_wardrobeitem
+            WHERE user_id = %s AND %s <%% title
+            ORDER BY rank DESC, id DESC
+            LIMIT %s
+            """,
+            [phrase, uid, phrase, limit],
+        )
+        return cursor.fetchall()
+
+
+def _sqlite_search(user, tokens: List[str], limit: int) -> List[Tuple[int, float]]:
+    # FTS5 prefix syntax: "blaz"* "jack"*  (implicit AND)
+    match = " ".join(f'"{t}"*' for t in tokens)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT rowid, -bm25(client_wardrobeitem_fts, 10.0, 5.0) AS rank
+            FROM client_wardrobeitem_fts
+            WHERE client_wardrobeitem_fts MATCH %s AND user_id = %s
+            ORDER BY rank DESC, rowid DESC
+            LIMIT %s
+            """,
+            [match, _user_db_value(user), limit],
+        )
+        return cursor.fetchall()
+
+
+def _fallback_search(user, tokens: List[str], limit: int) -> List[Tuple[int, float]]:
+    # Same AND-of-substrings semantics as the prefix queries, without ranking.
+    match = reduce(and_, (Q(title__icontains=t) | Q(description__icontains=t) for t in tokens))
+    pks = (
+        WardrobeItem.objects.filter(match, user_id=user.pk)
+        .order_by("-id")
+        .values_list("pk", flat=True)[:limit]
+    )
+    return [(pk, 0.0) for pk in pks]
+
+
+def search_wardrobe(user, query: str, limit: int = DEFAULT_LIMIT) -> List[WardrobeItem]:
+    """
+    Return the user's wardrobe items matching `query`, best match first.
+
+    Each returned item carries a `search_rank` attribute (higher = better).
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+    limit = max(1, min(int(limit), MAX_LIMIT))
+
+    if connection.vendor == "postgresql":
+        ranked = _postgres_search(user, tokens, limit)
+    elif connection.vendor == "sqlite":
+        ranked = _sqlite_search(user, tokens, limit)
+    else:
+        ranked = _fallback_search(user, tokens, limit)
+
+    items = WardrobeItem.objects.select_related("user").in_bulk([pk for pk, _ in ranked])
+    out: List[WardrobeItem] = []
+    for pk, rank in ranked:
+        item = items.get(pk)
+        if item is not None:
+            item.search_rank = float(rank)
+            out.append(item)
+    return out
@@ -0,0 +1,65 @@
+"""
+client/services/stats.py
+
+Wardrobe facets (counts per category / color) for dashboard summary tiles.
+
+All facets come from a single GROUP BY (category, color) query; the result is
+cached per user in the tiered cache (common/cache.py), versioned by the user's
+wardrobe generation, which the WardrobeItem signals in client/signals.py bump.
+The same generation versions every other cached view of a wardrobe (e.g. the
+recommendation drawer in recommendations/services.py).
+"""
+
+from typing import Any, Dict
+
+from django.db import transaction
+from django.db.models import Count
+
+from client.models import WardrobeItem
+from common.cache import bump_generation, cached
+
+STATS_CACHE_TIMEOUT = 60 * 60  # seconds; writes invalidate explicitly
+
+
+def wardrobe_generation(user_id) -> str:
+    return f"wardrobe:{user_id}"
+
+
+def compute_wardrobe_stats(user_id) -> Dict[str, Any]:
+    """Build the facet payload from one grouped query over the user's items."""
+    rows = (
+        WardrobeItem.objects.filter(user_id=user_id)
+        .values("category", "color")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    by_category: Dict[str, int] = {}
+    by_color: Dict[str, int] = {}
+    total = 0
+    for row in rows:
+        n = row["count"]
+        total += n
+        by_category[row["category"]] = by_category.get(row["category"], 0) + n
+        by_color[row["color"]] = by_color.get(row["color"], 0) + n
+
+    return {
+        "total": total,
+        "by_category": by_category,
+        "by_color": by_color,
+    }
+
+
+@cached(
+    lambda user_id: f"wardrobe:stats:{user_id}",
+    STATS_CACHE_TIMEOUT,
+    versions=lambda user_id: [wardrobe_generation(user_id)],
+)
+def get_wardrobe_stats(user_id) -> Dict[str, Any]:
+    """Cached facets for one user; recomputed on the first read after a write."""
+    return compute_wardrobe_stats(user_id)
+
+
+def invalidate_wardrobe(user_id) -> None:
+    """Drop every cached view of the user's wardrobe once the write commits."""
+    transaction.on_commit(lambda: bump_generation(wardrobe_generation(user_id)))
@@ -0,0 +1,153 @@
+"""
+client/services/sync.py
+
+Delta sync feed for the wardrobe.
+
+Clients keep a local copy of their wardrobe and call the feed with the opaque
+cursor from their previous sync. The feed returns:
+- items created/updated after the cursor (keyset scan on (user, updated_at, id))
+- ids of items deleted after the cursor (WardrobeItemTombstone, same shape of index)
+
+The cursor holds one (timestamp, id) position per stream, so paging is exact
+even when many rows share a timestamp. Without a cursor the feed starts from a
+full snapshot, and tombstones older than the snapshot are skipped.
+
+`updated_at`/`deleted_at` are set by the app before the write commits, so
+they are not in commit order: a transaction that commits late can land
+behind a cursor that was already handed out. So the last page of a sync
+round (has_more false) does not return the exact position. It returns one
+no later than SYNC_CURSOR_OVERLAP_SECONDS before the round's first page, and
+the next round scans that window again. Pages in the middle of a round stay
+exact (the cursor carries the round's start). Clients must therefore expect
+items they already have (replace by id) and deleted ids they never saw.
+"""
+
+import base64
+import json
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from client.models import WardrobeItem, WardrobeItemTombstone
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+Position = Tuple[int, int]  # (timestamp in epoch microseconds, row id)
+_START: Position = (0, 0)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _to_us(dt: datetime) -> int:
+    delta = dt - datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_us(us: int) -> datetime:
+    return datetime.fromtimestamp(us // 1_000_000, tz=dt_timezone.utc).replace(microsecond=us % 1_000_000)
+
+
+def _overlap_us() -> int:
+    return int(float(getattr(settings, "SYNC_CURSOR_OVERLAP_SECONDS", 60)) * 1_000_000)
+
+
+def encode_cursor(items_pos: Position, deleted_pos: Position, horizon: Optional[int] = None) -> str:
+    data = {"i": list(items_pos), "d": list(deleted_pos)}
+    if horizon is not None:
+        data["h"] = horizon
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Position, Position, Optional[int]]:
+    """(items position, tombstones position, horizon of the round in progress or None)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        items_pos = (int(data["i"][0]), int(data["i"][1]))
+        deleted_pos = (int(data["d"][0]), int(data["d"][1]))
+        horizon = int(data["h"]) if "h" in data else None
+    except Exception:
+        raise InvalidCursor("Invalid sync cursor.")
+    return items_pos, deleted_pos, horizon
+
+
+def _after(qs: QuerySet, ts_field: str, pos: Position) -> QuerySet:
+    """Rows strictly after `pos` in (ts_field, id) order."""
+    if pos == _START:
+        return qs
+    ts = _from_us(pos[0])
+    return qs.filter(Q(**{f"{ts_field}__gt": ts}) | Q(**{ts_field: ts, "id__gt": pos[1]}))
+
+
+def _page(qs: QuerySet, ts_field: str, pos: Position, limit: int) -> Tuple[List[Any], bool]:
+    rows = list(_after(qs, ts_field, pos).order_by(ts_field, "id")[: limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def _latest_tombstone_position(user_id) -> Position:
+    last = (
+        WardrobeItemTombstone.objects.filter(user_id=user_id)
+        .order_by("-deleted_at", "-id")
+        .only("id", "deleted_at")
+        .first()
+    )
+    return (_to_us(last.deleted_at), last.id) if last else _START
+
+
+def wardrobe_changes(user_id, since: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    One page of the user's wardrobe changes after `since`.
+
+    Returns {"items": [WardrobeItem], "deleted": [item_id], "next_cursor": str, "has_more": bool}.
+    Clients should keep calling with `next_cursor` while `has_more` is true.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    horizon = None
+    if since:
+        items_pos, deleted_pos, horizon = decode_cursor(since)
+    else:
+        # Snapshot: every live item, and only tombstones written from now on.
+        items_pos, deleted_pos = _START, _latest_tombstone_position(user_id)
+    if horizon is None:
+        # first page of a round: rows committing from now on may carry
+        # timestamps down to this point
+        horizon = _to_us(timezone.now()) - _overlap_us()
+
+    items, more_items = _page(
+        WardrobeItem.objects.filter(user_id=user_id).select_related("user"),
+        "updated_at", items_pos, limit,
+    )
+    tombstones, more_deleted = _page(
+        WardrobeItemTombstone.objects.filter(user_id=user_id).only("id", "item_id", "deleted_at"),
+        "deleted_at", deleted_pos, limit,
+    )
+
+    if items:
+        items_pos = (_to_us(items[-1].updated_at), items[-1].id)
+    if tombstones:
+        deleted_pos = (_to_us(tombstones[-1].deleted_at), tombstones[-1].id)
+
+    has_more = more_items or more_deleted
+    if has_more:
+        next_cursor = encode_cursor(items_pos, deleted_pos, horizon)
+    else:
+        # end of the round: step back so the next one re-scans the overlap window
+        next_cursor = encode_cursor(min(items_pos, (horizon, 0)), min(deleted_pos, (horizon, 0)))
+
+    return {
+        "items": items,
+        "deleted": [t.item_id for t in tombstones],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+def record_tombstone(item: WardrobeItem) -> WardrobeItemTombstone:
+    return WardrobeItemTombstone.objects.create(user_id=item.user_id, item_id=item.pk)
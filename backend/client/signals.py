@@ -0,0 +1,18 @@
+"""
+client/signals.py
+
+Cache invalidation hooks for wardrobe writes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from client.models import WardrobeItem
+from client.services.stats import invalidate_wardrobe
+
+
+@receiver(post_save, sender=WardrobeItem)
+@receiver(post_delete, sender=WardrobeItem)
+def invalidate_wardrobe_caches(sender, instance: WardrobeItem, **kwargs):
+    """Any create/update/delete changes the owner's facet counts and recommendation drawer."""
+    invalidate_wardrobe(instance.user_id)
@@ -1,3 +1,183 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from client.models import WardrobeItem, WardrobeItemTombstone
+from client.services.search import search_wardrobe
+from client.services.sync import decode_cursor, encode_cursor
+
+User = get_user_model()
+
+SYNC_URL = "/client/wardrobe/sync/"
+SEARCH_URL = "/client/wardrobe/search/"
+
+
+def _item(user, title, **fields):
+    return WardrobeItem.objects.create(
+        user=user,
+        image_url="https://cdn.example.com/item.jpg",
+        title=title,
+        color=WardrobeItem.Color.values[0],
+        category=WardrobeItem.Category.values[0],
+        **fields,
+    )
+
+
+class WardrobeSyncTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@example.com", username="client", password="pw-12345!")
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get(SYNC_URL, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def sync_all(self, since=None, limit=200):
+        """Follow next_cursor until has_more is false; (items, deleted, cursor)."""
+        items, deleted = [], []
+        while True:
+            page = self.sync(since, limit=limit)
+            items += page["items"]
+            deleted += page["deleted"]
+            since = page["next_cursor"]
+            if not page["has_more"]:
+                return items, deleted, since
+
+    def test_empty_wardrobe(self):
+        page = self.sync()
+        self.assertEqual(page["items"], [])
+        self.assertEqual(page["deleted"], [])
+        self.assertFalse(page["has_more"])
+
+        again = self.sync(page["next_cursor"])
+        self.assertEqual((again["items"], again["deleted"], again["has_more"]), ([], [], False))
+
+    @override_settings(SYNC_CURSOR_OVERLAP_SECONDS=0)
+    def test_changes_since_cursor(self):
+        kept = _item(self.user, "Navy blazer")
+        edited = _item(self.user, "White shirt")
+        removed = _item(self.user, "Old jeans")
+        other_user = User.objects.create_user(email="other@example.com", username="other", password="pw-12345!")
+        _item(other_user, "Not mine")
+
+        items, deleted, cursor = self.sync_all()
+        self.assertEqual(sorted(i["id"] for i in items), sorted([kept.pk, edited.pk, removed.pk]))
+        self.assertEqual(deleted, [])
+
+        created = self.client.post("/client/wardrobe/", {
+            "image_url": "https://cdn.example.com/new.jpg", "title": "Linen trousers",
+            "color": WardrobeItem.Color.values[0], "category": WardrobeItem.Category.values[0],
+        }).data
+        self.assertEqual(self.client.patch(f"/client/wardrobe/{edited.pk}/", {"title": "Ivory shirt"}).status_code, 200)
+        self.assertEqual(self.client.delete(f"/client/wardrobe/{removed.pk}/").status_code, 204)
+        self.assertTrue(WardrobeItemTombstone.objects.filter(user=self.user, item_id=removed.pk).exists())
+
+        items, deleted, _ = self.sync_all(cursor)
+        self.assertEqual(sorted(i["id"] for i in items), sorted([created["id"], edited.pk]))
+        self.assertEqual({i["id"]: i["title"] for i in items}[edited.pk], "Ivory shirt")
+        self.assertEqual(deleted, [removed.pk])
+
+    def test_snapshot_skips_older_tombstones(self):
+        gone = _item(self.user, "Gone")
+        self.client.delete(f"/client/wardrobe/{gone.pk}/")
+        _item(self.user, "Here")
+
+        items, deleted, _ = self.sync_all()
+        self.assertEqual([i["title"] for i in items], ["Here"])
+        self.assertEqual(deleted, [])
+
+    def test_paging_keeps_the_round_horizon(self):
+        for i in range(5):
+            _item(self.user, f"Item {i}")
+
+        first = self.sync(limit=2)
+        self.assertTrue(first["has_more"])
+        _, _, horizon = decode_cursor(first["next_cursor"])
+        self.assertIsNotNone(horizon)
+
+        second = self.sync(first["next_cursor"], limit=2)
+        self.assertEqual(decode_cursor(second["next_cursor"])[2], horizon)
+        self.assertFalse({i["id"] for i in first["items"]} & {i["id"] for i in second["items"]})
+
+        items, _, cursor = self.sync_all(second["next_cursor"], limit=2)
+        self.assertIsNone(decode_cursor(cursor)[2])
+        self.assertEqual(len(first["items"]) + len(second["items"]) + len(items), 5)
+
+    @override_settings(SYNC_CURSOR_OVERLAP_SECONDS=60)
+    def test_late_commit_inside_overlap_is_delivered(self):
+        _item(self.user, "Synced")
+        _, _, cursor = self.sync_all()
+
+        # committed now, but stamped before the cursor was handed out
+        late = _item(self.user, "Late")
+        WardrobeItem.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(seconds=30))
+        too_late = _item(self.user, "Too late")
+        WardrobeItem.objects.filter(pk=too_late.pk).update(updated_at=timezone.now() - timedelta(seconds=300))
+
+        items, _, _ = self.sync_all(cursor)
+        titles = [i["title"] for i in items]
+        self.assertIn("Late", titles)
+        self.assertNotIn("Too late", titles)
+
+    def test_malformed_cursor_returns_400(self):
+        for cursor in ["not-a-cursor", "eyJpIjpbMV19", encode_cursor((1, 2), (3, 4))[:-3]]:
+            response = self.client.get(SYNC_URL, {"since": cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertIn("since", response.data)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor((10, 1), (20, 2))), ((10, 1), (20, 2), None))
+        self.assertEqual(decode_cursor(encode_cursor((10, 1), (20, 2), 99)), ((10, 1), (20, 2), 99))
+
+
+class WardrobeSearchTests(APITestCase):
+    """core.settings.test runs on SQLite, so this exercises the FTS5 index."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@example.com", username="client", password="pw-12345!")
+        self.client.force_authenticate(self.user)
+        self.blazer = _item(self.user, "Navy blazer", description="Wool, two buttons")
+        self.shirt = _item(self.user, "White shirt", description="Pairs with a navy blazer")
+        self.jacket = _item(self.user, "Denim jacket", description="Light wash")
+
+    def search(self, q, **params):
+        response = self.client.get(SEARCH_URL, {"q": q, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_title_match_ranks_above_description_match(self):
+        results = self.search("navy blazer")
+        self.assertEqual([r["id"] for r in results], [self.blazer.pk, self.shirt.pk])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+
+    def test_every_word_is_a_prefix(self):
+        self.assertEqual([r["id"] for r in self.search("blaz")], [self.blazer.pk, self.shirt.pk])
+        self.assertEqual([r["id"] for r in self.search("den jack")], [self.jacket.pk])
+        self.assertEqual(self.search("denim blazer"), [])  # words are ANDed
+
+    def test_other_users_items_are_invisible(self):
+        other = User.objects.create_user(email="other@example.com", username="other", password="pw-12345!")
+        _item(other, "Navy blazer")
+        _item(other, "Navy coat")
+        self.assertEqual([r["id"] for r in self.search("navy")], [self.blazer.pk, self.shirt.pk])
+        self.assertEqual(self.search("coat"), [])
+
+    def test_limit_and_operator_only_query(self):
+        self.assertEqual(len(self.search("navy", limit=1)), 1)
+        self.assertEqual(self.search('"*-()'), [])
+
+    def test_unindexed_backend_falls_back_to_icontains(self):
+        _item(User.objects.create_user(email="other@example.com", username="other", password="pw-12345!"), "Navy coat")
+        with mock.patch.object(connection, "vendor", "mysql"):
+            results = search_wardrobe(self.user, "NAVY blaz")
+        self.assertEqual([i.pk for i in results], [self.shirt.pk, self.blazer.pk])  # newest first
+        self.assertEqual({i.search_rank for i in results}, {0.0})
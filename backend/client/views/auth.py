@@ -18,13 +18,13 @@ from common.permissions import IsClient
 from client.serializers.auth import (
     ClientChangePasswordSerializer,
     ClientPasswordResetSerializer,
-    ClientProfileReadSerializer,
     ClientProfileUpdateSerializer,
     ClientRegisterSerializer,
     ClientLoginSerializer,
     ClientSendPasswordResetEmailSerializer,
 
 )
+from accounts.services import get_profile_snapshot
 from common.utils import revoke_user_tokens
 
 User = get_user_model()
@@ -67,11 +67,11 @@ class ClientProfileView(APIView):
     permission_classes = [IsAuthenticated, IsClient]
 
     def get(self, request):
-        profile, _ = ClientProfile.objects.get_or_create(user=request.user)
-        return Response(ClientProfileReadSerializer(profile).data)
+        # cached, invalidated on profile/user writes (accounts/services.py)
+        return Response(get_profile_snapshot(request.user.pk, User.Role.CLIENT))
 
     def patch(self, request):
-        profile, _ = ClientProfile.objects.get_or_create(user=request.user)
+        profile, _ = ClientProfile.objects.select_related("user").get_or_create(user_id=request.user.pk)
         serializer = ClientProfileUpdateSerializer(profile, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
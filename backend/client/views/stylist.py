@@ -1,23 +1,115 @@
 # apps/client/views/stylists.py
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django.db.models import Q
-from stylist.models import StylistProfile
-from client.serializers.stylist import StylistPublicSerializer
+from stylist.models import Review, StylistProfile
+from client.models import ClientProfile
+from client.serializers.stylist import (
+    StylistMatchQuerySerializer,
+    StylistMatchSerializer,
+    StylistPublicSerializer,
+    StylistReviewSerializer,
+)
+from client.services.directory import cached_directory_entry, cached_directory_page
+from client.services.matching import match_stylists
 from common.permissions import IsClient
+from stylist.services import MATCH_ALL, MATCH_ANY, DuplicateReview, filter_by_expertise, submit_review
 
 class StylistBrowseViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Allow authenticated clients to list & view stylists.
+
+    Filters:
+    - ?tags=streetwear,formal   expertise tags (comma-separated or repeated)
+    - ?match=any|all            OR (default) / AND semantics across tags
+
+    Responses are served from a pre-serialized cache (client/services/directory.py).
     """
     serializer_class = StylistPublicSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        # Only stylists whose User is active & has role='stylist'
-        return (
+        # Only stylists whose User is active & has role='stylist' (denormalized
+        # into is_listed so filter + order walk stylist_directory_rank_idx)
+        qs = (
             StylistProfile.objects
             .select_related("user")
-            .filter(user__is_active=True, user__role="stylist")
-            .order_by("-rating", "-rating_count", "-updated_at")
+            .filter(is_listed=True)
+            .order_by(*StylistProfile.DIRECTORY_ORDERING)
+        )
+
+        tags = [t for raw in self.request.query_params.getlist("tags") for t in raw.split(",")]
+        if tags:
+            match = self.request.query_params.get("match", MATCH_ANY).lower()
+            qs = filter_by_expertise(qs, tags, MATCH_ALL if match == MATCH_ALL else MATCH_ANY)
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        data = cached_directory_page(
+            request.query_params,
+            lambda: super(StylistBrowseViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        data = cached_directory_entry(
+            kwargs.get(self.lookup_url_kwarg or self.lookup_field),
+            lambda: super(StylistBrowseViewSet, self).retrieve(request, *args, **kwargs).data,
         )
+        return Response(data)
+
+    @action(
+        detail=True,
+        methods=["get", "post"],
+        url_path="reviews",
+        permission_classes=[IsAuthenticated, IsClient],
+    )
+    def reviews(self, request, pk=None):
+        """
+        GET  /client/stylists/{id}/reviews/   latest 50 reviews
+        POST /client/stylists/{id}/reviews/   {"rating": 1-5, "comment": "..."}
+        """
+        stylist = self.get_object()
+
+        if request.method == "GET":
+            qs = Review.objects.filter(stylist=stylist).select_related("client").order_by("-created_at")[:50]
+            return Response(StylistReviewSerializer(qs, many=True).data)
+
+        s = StylistReviewSerializer(data=request.data)
+        s.is_valid(raise_exception=True)
+        try:
+            review = submit_review(client=request.user, stylist=stylist, **s.validated_data)
+        except DuplicateReview as e:
+            raise ValidationError({"detail": str(e)})
+        return Response(StylistReviewSerializer(review).data, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="matches",
+        permission_classes=[IsAuthenticated, IsClient],
+    )
+    def matches(self, request):
+        """
+        GET /client/stylists/matches/?styles=streetwear,formal&limit=10
+        Stylists ranked for the caller's profile (body/face shape, skin tone,
+        requested styles) plus experience and rating.
+        """
+        params = StylistMatchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        styles = [t for t in params.validated_data.get("styles", "").split(",") if t.strip()]
+
+        profile = ClientProfile.objects.filter(user_id=request.user.pk).first()
+        ranked = match_stylists(profile, styles, k=params.validated_data["limit"])
+
+        profiles = StylistProfile.objects.select_related("user").in_bulk([pk for pk, _ in ranked])
+        out = []
+        for pk, score in ranked:
+            stylist = profiles.get(pk)
+            if stylist is not None:
+                stylist.match_score = round(score, 4)
+                out.append(stylist)
+        return Response(StylistMatchSerializer(out, many=True).data)
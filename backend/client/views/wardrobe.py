@@ -1,7 +1,20 @@
+from django.db import transaction
 from rest_framework import viewsets, filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from client.models import WardrobeItem
-from client.serializers.wardrobe import WardrobeItemSerializer
+from client.serializers.wardrobe import (
+    WardrobeItemSerializer,
+    WardrobeSearchQuerySerializer,
+    WardrobeSearchResultSerializer,
+    WardrobeSyncQuerySerializer,
+    WardrobeSyncSerializer,
+)
+from client.services.search import search_wardrobe
+from client.services.stats import get_wardrobe_stats
+from client.services.sync import InvalidCursor, record_tombstone, wardrobe_changes
 from common.permissions import IsClient
 
 class WardrobeItemViewSet(viewsets.ModelViewSet):
@@ -12,8 +25,51 @@ class WardrobeItemViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsClient]
 
     def get_queryset(self):
-        # Only the current user's items
-        return WardrobeItem.objects.filter(user=self.request.user)
+        # Only the current user's items; filter by id so the user row is never loaded
+        return WardrobeItem.objects.filter(user_id=self.request.user.pk).select_related("user")
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        # Leave a tombstone so synced clients learn about the deletion.
+        with transaction.atomic():
+            record_tombstone(instance)
+            instance.delete()
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        GET /client/wardrobe/search/?q=<text>&limit=<n>
+        Ranked full-text search over title + description; every word is a prefix match.
+        """
+        params = WardrobeSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        items = search_wardrobe(request.user, params.validated_data["q"], params.validated_data["limit"])
+        return Response(WardrobeSearchResultSerializer(items, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        """
+        GET /client/wardrobe/stats/
+        Item counts per category and color (cached; refreshed after wardrobe writes).
+        """
+        return Response(get_wardrobe_stats(request.user.pk))
+
+    @action(detail=False, methods=["get"], url_path="sync")
+    def sync(self, request):
+        """
+        GET /client/wardrobe/sync/?since=<cursor>&limit=<n>
+        Items changed and ids deleted since the cursor; omit `since` for a full snapshot.
+        """
+        params = WardrobeSyncQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        try:
+            changes = wardrobe_changes(
+                request.user.pk,
+                since=params.validated_data.get("since") or None,
+                limit=params.validated_data["limit"],
+            )
+        except InvalidCursor as e:
+            raise ValidationError({"since": [str(e)]})
+        return Response(WardrobeSyncSerializer(changes).data)
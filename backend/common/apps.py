@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'common'
+
+    def ready(self):
+        from . import checks  # noqa: F401  deploy checks
+        from . import db  # noqa: F401  connection counter for connection_stats()
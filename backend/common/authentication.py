@@ -0,0 +1,148 @@
+"""
+common/authentication.py
+
+JWT authentication that does not touch the database.
+
+Tokens minted by common.utils.get_tokens_for_user carry the claims the
+permission layer needs (`role`, `status`, `is_active`). ClaimsJWTAuthentication
+trusts those signed claims and hands DRF a ClaimsUser: `pk`/`id`/`role`/
+`status`/`is_active` are answered from the token, and the real User row is
+only loaded if a view touches anything else (email, names, isinstance checks).
+
+Claims are frozen for the lifetime of the access token, so bans,
+deactivations and role changes are pushed out through a revocation marker in
+the cache (`auth:revoked:<user id>` = revocation timestamp). Any token issued
+at or before the marker is rejected on the next request. The marker only has
+to outlive the access tokens it shadows; refresh tokens are blacklisted at the
+same time (accounts/signals.py), so no new access token can be minted.
+
+That only holds if every process sees the marker. With a per-process cache
+(LocMem, i.e. CACHE_REDIS_URL unset) or an unreachable cache, the user is
+loaded from the database instead, as are tokens without the claims (issued
+before this class was deployed). `check --deploy` warns about the former
+(common/checks.py).
+"""
+
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+CLAIMS = ("role", "status", "is_active")
+
+# cache backends other processes cannot read: a marker written there is lost
+# on every other worker
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def claims_auth_enabled() -> bool:
+    """Whether revocation markers are shared, i.e. token claims can be trusted."""
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+def _revocation_key(user_id) -> str:
+    return f"auth:revoked:{user_id}"
+
+
+def revoke_user_access(user_id) -> None:
+    """Reject every access token issued to `user_id` up to now."""
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(_revocation_key(user_id), int(time.time()), timeout)
+
+
+def is_token_revoked(user_id, issued_at) -> bool:
+    revoked_at = cache.get(_revocation_key(user_id))
+    return revoked_at is not None and (issued_at is None or int(issued_at) <= revoked_at)
+
+
+def add_user_claims(token, user) -> None:
+    """Embed the claims ClaimsJWTAuthentication relies on."""
+    token["role"] = user.role
+    token["status"] = user.status
+    token["is_active"] = user.is_active
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    User proxy built from token claims; the User row is fetched on first use
+    of any attribute not carried by the token.
+    """
+
+    def __init__(self, token, loader):
+        super().__init__(loader)
+        self.__dict__["_token"] = token
+
+    def __bool__(self):
+        # permission classes do `request.user and ...`; don't load for that
+        return True
+
+    @property
+    def pk(self):
+        return uuid.UUID(str(self._token[api_settings.USER_ID_CLAIM]))
+
+    id = pk
+
+    @property
+    def role(self):
+        return self._token["role"]
+
+    @property
+    def status(self):
+        return self._token["status"]
+
+    @property
+    def is_active(self):
+        return bool(self._token["is_active"])
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user from token claims (see module docstring)."""
+
+    def get_user(self, validated_token):
+        if not claims_auth_enabled() or any(claim not in validated_token for claim in CLAIMS):
+            return self._get_db_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+        if not validated_token["is_active"] or validated_token["status"] != User.Status.ACTIVE:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        try:
+            revoked = is_token_revoked(user_id, validated_token.get("iat"))
+        except Exception:
+            # can't tell whether the user was banned: ask the database
+            logger.warning("Token revocation lookup failed; loading the user", exc_info=True)
+            return self._get_db_user(validated_token)
+        if revoked:
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+
+        return ClaimsUser(validated_token, lambda: super(ClaimsJWTAuthentication, self).get_user(validated_token))
+
+    def _get_db_user(self, validated_token):
+        user = super().get_user(validated_token)  # rejects is_active=False
+        if user.status != User.Status.ACTIVE:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
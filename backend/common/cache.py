@@ -0,0 +1,310 @@
+"""
+common/cache.py
+
+Tiered read-through cache for the hot read paths (profile snapshots, wardrobe,
+stylist directory, recommendations).
+
+- L1: a bounded LRU in each process (CACHE_LOCAL_MAX_ENTRIES entries, kept
+  at most CACHE_LOCAL_TIMEOUT seconds); a hit costs no network round trip
+- L2: Django's "default" cache, i.e. Redis when CACHE_REDIS_URL is set,
+  shared by every web and worker process
+
+Keys are versioned. A caller names the generations its data depends on
+(e.g. "profile:<user id>", "stylist-directory"); their current tokens are read
+from L2 in one round trip and appended to the key. Invalidation is
+bump_generation(), which every process sees on its next read, so L1 never has
+to be purged across processes: superseded entries simply age out. For that
+reason only versioned keys are kept in L1.
+
+On top of that:
+- negative caching: a builder that returns None is cached for
+  CACHE_NEGATIVE_TIMEOUT seconds, so lookups of missing rows stay cheap
+- stampede guard: on a miss only the caller that wins an L2 lock builds; the
+  others poll L2 for its result for up to `wait_timeout` seconds
+- an unreachable L2 is counted and the value is built from the database,
+  never turned into an error response
+- cache_stats(): hit/miss counters for this process per namespace (the key
+  up to its first ':')
+
+Values served from L1 are shared between callers: treat them as read-only.
+"""
+
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.timing import count as count_timing, timed
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+NONE_MARKER = "__cache:none__"  # negative entry; a plain string so it pickles into L2
+
+
+class LocalLRU:
+    """Thread-safe, size-bounded LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            if item[0] <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, value: Any, timeout: float) -> None:
+        if timeout <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_local: Optional[LocalLRU] = None
+_local_lock = threading.Lock()
+
+
+def local_cache() -> LocalLRU:
+    global _local
+    if _local is None:
+        with _local_lock:
+            if _local is None:
+                _local = LocalLRU(settings.CACHE_LOCAL_MAX_ENTRIES)
+    return _local
+
+
+# --------------------------------------------------------------------------
+# Metrics
+# --------------------------------------------------------------------------
+
+_stats: Dict[str, Counter] = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+
+def _count(key: str, event: str) -> None:
+    namespace = key.split(":", 1)[0]
+    with _stats_lock:
+        _stats[namespace][event] += 1
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-namespace counters for this process: l1_hits, l2_hits, misses,
+    negative_hits, lock_waits, errors, plus the hit ratio.
+    """
+    with _stats_lock:
+        out = {ns: dict(counts) for ns, counts in _stats.items()}
+    for counts in out.values():
+        hits = counts.get("l1_hits", 0) + counts.get("l2_hits", 0)
+        total = hits + counts.get("misses", 0)
+        counts["hit_ratio"] = round(hits / total, 3) if total else None
+    return out
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+# --------------------------------------------------------------------------
+# Generations (versioned keys)
+# --------------------------------------------------------------------------
+
+def get_generations(names: Sequence[str]) -> List[str]:
+    """Current version tokens for families of keys, read from L2 in one round trip."""
+    keys = [f"gen:{name}" for name in names]
+    found = cache.get_many(keys)
+    out = []
+    for key in keys:
+        gen = found.get(key)
+        if gen is None:
+            gen = uuid.uuid4().hex[:12]
+            # another process may have just set it; keep whichever landed first
+            if not cache.add(key, gen, None):
+                gen = cache.get(key) or gen
+        out.append(gen)
+    return out
+
+
+def get_generation(name: str) -> str:
+    return get_generations([name])[0]
+
+
+def bump_generation(*names: str) -> None:
+    """Invalidate every key versioned by any of `names` in O(1) per name."""
+    try:
+        cache.set_many({f"gen:{name}": uuid.uuid4().hex[:12] for name in names}, None)
+    except Exception:
+        # entries then live until their timeout; better than failing the write
+        logger.exception("Cache invalidation failed", extra={"generations": list(names)})
+
+
+# --------------------------------------------------------------------------
+# Read-through
+# --------------------------------------------------------------------------
+
+def _l2_get(key: str) -> Any:
+    try:
+        with timed("cache"):
+            return cache.get(key, _MISSING)
+    except Exception:
+        _count(key, "errors")
+        return _MISSING
+
+
+def _local_timeout(timeout: Optional[int]) -> float:
+    return settings.CACHE_LOCAL_TIMEOUT if timeout is None else min(timeout, settings.CACHE_LOCAL_TIMEOUT)
+
+
+def _store(key: str, value: Any, timeout: Optional[int], negative_timeout: Optional[int], local: bool) -> None:
+    if value is None:
+        value = NONE_MARKER
+        timeout = settings.CACHE_NEGATIVE_TIMEOUT if negative_timeout is None else negative_timeout
+        if not timeout:
+            return
+    try:
+        with timed("cache"):
+            cache.set(key, value, timeout)
+    except Exception:
+        _count(key, "errors")
+    if local:
+        local_cache().set(key, value, _local_timeout(timeout))
+
+
+def _is_negative(value: Any) -> bool:
+    return isinstance(value, str) and value == NONE_MARKER
+
+
+def _hit(key: str, value: Any, tier: str) -> Any:
+    _count(key, tier)
+    count_timing("cache_hit")
+    if _is_negative(value):
+        _count(key, "negative_hits")
+        return None
+    return value
+
+
+def get_or_build(
+    key: str,
+    builder: Callable[[], Any],
+    timeout: Optional[int],
+    *,
+    versions: Iterable[str] = (),
+    negative_timeout: Optional[int] = None,
+    lock_timeout: int = 10,
+    wait_timeout: float = 2.0,
+    poll_interval: float = 0.05,
+) -> Any:
+    """
+    Return the cached value for `key`, building and caching it on a miss.
+
+    `versions` are the generations the value depends on (see module
+    docstring); versioned keys are also kept in the per-process L1. A builder
+    result of None is cached as a negative entry for `negative_timeout`
+    seconds (default CACHE_NEGATIVE_TIMEOUT; 0 disables it).
+    """
+    versions = tuple(versions)
+    if versions:
+        try:
+            with timed("cache"):
+                key = f"{key}@{'.'.join(get_generations(versions))}"
+        except Exception:
+            _count(key, "errors")
+            return builder()
+        value = local_cache().get(key)
+        if value is not _MISSING:
+            return _hit(key, value, "l1_hits")
+
+    local = bool(versions)
+    value = _l2_get(key)
+    if value is not _MISSING:
+        if local:
+            local_cache().set(key, value, _local_timeout(timeout))
+        return _hit(key, value, "l2_hits")
+
+    _count(key, "misses")
+    count_timing("cache_miss")
+    lock_key = f"{key}:lock"
+    try:
+        with timed("cache"):
+            won = cache.add(lock_key, 1, lock_timeout)
+    except Exception:
+        _count(key, "errors")
+        return builder()
+    if won:
+        try:
+            value = builder()
+            _store(key, value, timeout, negative_timeout, local)
+            return value
+        finally:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+    _count(key, "lock_waits")
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        value = _l2_get(key)
+        if value is not _MISSING:
+            return None if _is_negative(value) else value
+    # the builder is slow or died holding the lock: build ourselves, uncached
+    return builder()
+
+
+def cached(
+    key: Callable[..., str],
+    timeout,
+    *,
+    versions: Optional[Callable[..., Iterable[str]]] = None,
+    negative_timeout: Optional[int] = None,
+):
+    """
+    Decorator form of get_or_build. `key` and `versions` are called with the
+    function's arguments; `timeout` may be a callable so it can read settings
+    at call time. The undecorated function stays available as `.uncached`.
+
+        @cached(lambda user_id: f"wardrobe:stats:{user_id}", 3600,
+                versions=lambda user_id: [wardrobe_generation(user_id)])
+        def get_wardrobe_stats(user_id): ...
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return get_or_build(
+                key(*args, **kwargs),
+                lambda: fn(*args, **kwargs),
+                timeout() if callable(timeout) else timeout,
+                versions=versions(*args, **kwargs) if versions else (),
+                negative_timeout=negative_timeout,
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
@@ -0,0 +1,43 @@
+"""
+common/checks.py
+
+System checks for settings that are fine in development but unsafe or slow
+in production (`manage.py check --deploy`), and for settings that are simply
+wrong (every `manage.py` command).
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from common.authentication import claims_auth_enabled
+
+
+@register(Tags.security, deploy=True)
+def check_token_revocation_cache(app_configs, **kwargs):
+    auth_classes = settings.REST_FRAMEWORK.get("DEFAULT_AUTHENTICATION_CLASSES", ())
+    if "common.authentication.ClaimsJWTAuthentication" not in auth_classes or claims_auth_enabled():
+        return []
+    return [
+        Warning(
+            "The default cache is per-process, so token revocation markers are not shared; "
+            "ClaimsJWTAuthentication loads the user from the database on every request.",
+            hint="Set CACHE_REDIS_URL so bans and role changes reach every worker without a user query.",
+            id="common.W001",
+        )
+    ]
+
+
+@register()
+def check_health_required_checks(app_configs, **kwargs):
+    from core.health import CHECKS
+
+    unknown = [name for name in settings.HEALTH_REQUIRED_CHECKS if name not in CHECKS]
+    if not unknown:
+        return []
+    return [
+        Error(
+            f"HEALTH_REQUIRED_CHECKS names unknown checks: {', '.join(unknown)}.",
+            hint=f"Use a comma-separated subset of: {', '.join(CHECKS)}.",
+            id="common.E001",
+        )
+    ]
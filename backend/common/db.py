@@ -0,0 +1,64 @@
+"""
+common/db.py
+
+Connection reuse metrics (see the D A T A B A S E section in core/settings/base.py).
+
+connection_stats() reports, for the current process:
+- pooled (psycopg 3 + psycopg_pool): pool size and limits, connections in
+  use / idle, requests waiting for a connection, cumulative wait time,
+  checkout timeouts/errors, and connections opened so far
+- persistent or per-request (psycopg2, SQLite): connections opened so far.
+  With reuse working this stays close to the number of worker threads; with
+  CONN_MAX_AGE=0 it grows by one per request.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_opened = Counter()
+_opened_lock = threading.Lock()
+
+
+@receiver(connection_created, dispatch_uid="common.db.count_connections")
+def _count_connection(sender, connection, **kwargs):
+    with _opened_lock:
+        _opened[connection.alias] += 1
+
+
+def connection_stats(alias: str = "default") -> Dict[str, Any]:
+    conn = connections[alias]
+    pool = getattr(conn, "pool", None)  # only the postgresql backend has it, None unless OPTIONS["pool"]
+    if pool is None:
+        max_age = conn.settings_dict.get("CONN_MAX_AGE", 0)
+        return {
+            "mode": "per-request" if not max_age else "persistent",
+            "conn_max_age": max_age,
+            "health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS", False),
+            "opened": _opened[alias],
+        }
+
+    stats = pool.get_stats()
+    # the pool opens on first checkout; until then it reports min_size but holds nothing
+    size = 0 if pool.closed else stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    return {
+        "mode": "pool",
+        "open": not pool.closed,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": size,
+        "in_use": size - available,
+        "idle": available,
+        "waiting": stats.get("requests_waiting", 0),
+        "wait_ms": stats.get("requests_wait_ms", 0),
+        "timeouts": stats.get("requests_errors", 0),  # checkouts that timed out or failed
+        "checkouts": stats.get("requests_num", 0),
+        "opened": stats.get("connections_num", 0),
+        "connect_errors": stats.get("connections_errors", 0),
+        "lost": stats.get("connections_lost", 0),  # dropped by the health check
+    }
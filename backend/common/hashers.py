@@ -0,0 +1,30 @@
+"""
+common/hashers.py
+
+Argon2id with parameters from settings.
+
+Django's Argon2PasswordHasher hard-codes its cost parameters; this subclass
+reads them from PASSWORD_ARGON2_* so they can be tuned per deployment with
+`manage.py bench_password_hashing`. Hashes keep the standard "argon2" prefix,
+and Django flags any hash made with different parameters (or with PBKDF2) for
+upgrade, so changing the settings rehashes users on their next login
+(common/passwords.py).
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
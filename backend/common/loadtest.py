@@ -0,0 +1,299 @@
+"""
+common/loadtest.py
+
+Scenarios, measurements and baseline comparison for `manage.py loadtest`.
+
+Every scenario runs over HTTP against a live server (the in-process one the
+command starts, or --url), one requests.Session per virtual user:
+
+- auth       register a new client, log in, read /client/me/
+- wardrobe   create / list / update / stats / delete against a wardrobe that
+             already holds `wardrobe_size` items per user
+- browse     stylist directory: list, filter by expertise tag, detail
+- recommend  a recommendation for a new datetime (a cache miss, so the agent
+             is called), then the same request again (answered from cache)
+
+Seeding goes through the API as well, so a run against --url needs nothing
+but a reachable server started with STYLE_AGENT_FAKE=True.
+
+Results are per scenario (requests, errors, wall time, RPS) and per endpoint
+label (count, errors, mean, p50/p90/p99 in ms). compare() checks them against
+a stored baseline: scenario RPS may drop, and endpoint p50/p90 may grow, by at
+most `threshold` (relative); the error rate may grow by at most one point.
+Latency growth smaller than `min_delta_ms` is ignored so sub-millisecond
+endpoints do not flap.
+"""
+
+import random
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from client.models import ClientProfile, WardrobeItem
+
+PASSWORD = "loadtest-password-1"
+EXPERTISE_TAGS = ("streetwear", "formal", "vintage", "casual", "minimalist", "bohemian", "sporty", "business")
+SCENARIOS = ("auth", "wardrobe", "browse", "recommend")
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Recorder:
+    """Latencies (ms) and failures per endpoint label; shared by the user threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, label: str, elapsed_ms: float, ok: bool, status: str) -> None:
+        with self._lock:
+            self.latencies.setdefault(label, []).append(elapsed_ms)
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+                by_status = self.statuses.setdefault(label, {})
+                by_status[status] = by_status.get(status, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for label, samples in sorted(self.latencies.items()):
+            out[label] = {
+                "count": len(samples),
+                "errors": self.errors.get(label, 0),
+                "mean_ms": round(statistics.mean(samples), 2),
+                "p50_ms": round(_percentile(samples, 50), 2),
+                "p90_ms": round(_percentile(samples, 90), 2),
+                "p99_ms": round(_percentile(samples, 99), 2),
+            }
+            if label in self.statuses:
+                out[label]["failed_statuses"] = self.statuses[label]
+        return out
+
+
+class Client:
+    """One virtual user's HTTP session; records each call when a recorder is set."""
+
+    def __init__(self, base_url: str, recorder: Optional[Recorder] = None, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.recorder = recorder
+        self.timeout = timeout
+        self.token: Optional[str] = None
+
+    def call(self, label: str, method: str, path: str, expect=(200,), **kwargs) -> Optional[requests.Response]:
+        headers = kwargs.pop("headers", {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, self.base_url + path, headers=headers, timeout=self.timeout, **kwargs)
+            status = str(resp.status_code)
+        except requests.RequestException as e:
+            resp, status = None, type(e).__name__
+        elapsed = (time.perf_counter() - start) * 1000
+        ok = resp is not None and resp.status_code in expect
+        if self.recorder is not None:
+            self.recorder.record(label, elapsed, ok, status)
+        if not ok and self.recorder is None:
+            # setup calls must succeed, otherwise the measurements mean nothing
+            raise RuntimeError(f"{method} {path} failed during setup: {status} {resp.text[:200] if resp is not None else ''}")
+        return resp if ok else None
+
+
+# --------------------------------------------------------------------------
+# Seeding (through the API, unmeasured)
+# --------------------------------------------------------------------------
+
+def _email(run_id: str, kind: str, n) -> str:
+    return f"lt-{run_id}-{kind}-{n}@loadtest.example.com"
+
+
+def register_and_login(client: Client, prefix: str, email: str, username: str, label: str = "") -> None:
+    client.token = None
+    client.call(f"{label}register", "POST", f"/{prefix}/auth/register/", expect=(201,), json={
+        "email": email, "username": username, "first_name": "Load", "last_name": "Test", "password": PASSWORD,
+    })
+    resp = client.call(f"{label}login", "POST", f"/{prefix}/auth/login/", json={"email": email, "password": PASSWORD})
+    client.token = resp.json()["tokens"]["access"] if resp is not None else None
+
+
+def seed_stylists(base_url: str, run_id: str, count: int, rng: random.Random) -> None:
+    for n in range(count):
+        client = Client(base_url)
+        register_and_login(client, "stylist", _email(run_id, "stylist", n), f"lt-{run_id}-s{n}")
+        client.call("", "PATCH", "/stylist/me/", json={
+            "bio": "Load test stylist",
+            "expertise": rng.sample(EXPERTISE_TAGS, 3),
+            "years_experience": rng.randint(0, 20),
+        })
+
+
+def seed_client(base_url: str, run_id: str, n: int, wardrobe_size: int, rng: random.Random) -> Dict[str, Any]:
+    """A client with a complete style profile and `wardrobe_size` items; returns its state."""
+    client = Client(base_url)
+    register_and_login(client, "client", _email(run_id, "client", n), f"lt-{run_id}-c{n}")
+    client.call("", "PATCH", "/client/me/", json={
+        "gender": ClientProfile.Gender.values[0],
+        "skin_tone": ClientProfile.SkinTone.values[0],
+        "body_shape": ClientProfile.BodyShape.values[0],
+        "face_shape": ClientProfile.FaceShape.values[0],
+    })
+    for i in range(wardrobe_size):
+        client.call("", "POST", "/client/wardrobe/", expect=(201,), json=_wardrobe_item(rng, i))
+    return {"n": n, "token": client.token}
+
+
+def _wardrobe_item(rng: random.Random, i) -> Dict[str, Any]:
+    return {
+        "image_url": f"https://img.loadtest.example.com/{i}.jpg",
+        "title": f"Item {i}",
+        "color": rng.choice(WardrobeItem.Color.values),
+        "category": rng.choice(WardrobeItem.Category.values),
+        "description": "Seeded by the load test",
+    }
+
+
+# --------------------------------------------------------------------------
+# Scenarios: one iteration of one virtual user
+# --------------------------------------------------------------------------
+
+def auth_iteration(client: Client, ctx: Dict[str, Any], user: Dict[str, Any], i, rng: random.Random) -> None:
+    tag = f"{user['n']}-{i}-{uuid.uuid4().hex[:6]}"
+    register_and_login(client, "client", _email(ctx["run_id"], "auth", tag), f"lt-{ctx['run_id']}-a{tag}", label="auth:")
+    if client.token:
+        client.call("auth:me", "GET", "/client/me/")
+
+
+def wardrobe_iteration(client: Client, ctx: Dict[str, Any], user: Dict[str, Any], i, rng: random.Random) -> None:
+    client.token = user["token"]
+    resp = client.call("wardrobe:create", "POST", "/client/wardrobe/", expect=(201,), json=_wardrobe_item(rng, f"n{i}"))
+    client.call("wardrobe:list", "GET", "/client/wardrobe/")
+    if resp is None:
+        return
+    item_id = resp.json()["id"]
+    client.call("wardrobe:update", "PATCH", f"/client/wardrobe/{item_id}/", json={"title": f"Item n{i} (edited)"})
+    client.call("wardrobe:stats", "GET", "/client/wardrobe/stats/")
+    # keep the wardrobe at its seeded size
+    client.call("wardrobe:delete", "DELETE", f"/client/wardrobe/{item_id}/", expect=(204,))
+
+
+def browse_iteration(client: Client, ctx: Dict[str, Any], user: Dict[str, Any], i, rng: random.Random) -> None:
+    client.token = user["token"]
+    resp = client.call("browse:list", "GET", "/client/stylists/")
+    client.call("browse:filter", "GET", "/client/stylists/", params={"tags": rng.choice(EXPERTISE_TAGS)})
+    stylists = resp.json() if resp is not None else []
+    if isinstance(stylists, dict):  # paginated
+        stylists = stylists.get("results", [])
+    if stylists:
+        client.call("browse:detail", "GET", f"/client/stylists/{rng.choice(stylists)['user']['id']}/")
+
+
+def recommend_iteration(client: Client, ctx: Dict[str, Any], user: Dict[str, Any], i, rng: random.Random) -> None:
+    client.token = user["token"]
+    # a datetime no earlier iteration or round has asked for: the first call
+    # misses the recommendation cache
+    when = ctx["started_at"] + timedelta(days=1, minutes=ctx.get("round", 0) * 10_000_000 + user["n"] * 100_000 + i)
+    body = {"destination": rng.choice(("Dhaka", "NYC", "Paris")), "occasion": "dinner", "datetime": when.isoformat()}
+    client.call("recommend", "POST", "/client/recommendations/", json=body)
+    client.call("recommend:cached", "POST", "/client/recommendations/", json=body)
+
+
+ITERATIONS: Dict[str, Callable] = {
+    "auth": auth_iteration,
+    "wardrobe": wardrobe_iteration,
+    "browse": browse_iteration,
+    "recommend": recommend_iteration,
+}
+
+
+def new_context(run_id: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "run_id": run_id or uuid.uuid4().hex[:8],
+        "started_at": datetime.now(timezone.utc).replace(second=0, microsecond=0),
+    }
+
+
+def run_scenario(
+    name: str,
+    base_url: str,
+    ctx: Dict[str, Any],
+    users: List[Dict[str, Any]],
+    iterations: int,
+    warmup: int = 1,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Each user runs `warmup` unrecorded, then `iterations` recorded iterations, all users concurrently."""
+    iteration = ITERATIONS[name]
+    recorder = Recorder()
+
+    def one_user(user):
+        rng = random.Random(f"{seed}-{name}-{user['n']}")
+        client = Client(base_url)
+        for i in range(warmup):
+            iteration(client, ctx, user, -1 - i, rng)  # negative: never collides with a recorded one
+        client.recorder = recorder
+        # a warm-up failure raises in setup mode; from here failures are counted
+        for i in range(iterations):
+            iteration(client, ctx, user, i, rng)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        list(pool.map(one_user, users))
+    duration = time.perf_counter() - started
+
+    endpoints = recorder.summary()
+    total = sum(e["count"] for e in endpoints.values())
+    errors = sum(e["errors"] for e in endpoints.values())
+    return {
+        "requests": total,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "rps": round(total / duration, 1) if duration else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+# --------------------------------------------------------------------------
+# Baseline comparison
+# --------------------------------------------------------------------------
+
+def _error_rate(stats: Dict[str, Any], count_key: str) -> float:
+    return stats["errors"] / stats[count_key] if stats.get(count_key) else 0.0
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float = 2.0,
+) -> List[str]:
+    """Human-readable regressions of `results` against `baseline` (empty if none)."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if current["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{name}: {current['rps']} req/s, baseline {base['rps']} req/s")
+        for label, stats in current["endpoints"].items():
+            base_stats = base["endpoints"].get(label)
+            if base_stats is None:
+                continue
+            for key in ("p50_ms", "p90_ms"):
+                limit = max(base_stats[key] * (1 + threshold), base_stats[key] + min_delta_ms)
+                if stats[key] > limit:
+                    regressions.append(f"{label}: {key} {stats[key]}, baseline {base_stats[key]}")
+            rate, base_rate = _error_rate(stats, "count"), _error_rate(base_stats, "count")
+            if rate > base_rate + 0.01:
+                regressions.append(f"{label}: error rate {rate:.1%}, baseline {base_rate:.1%}")
+    return regressions
@@ -0,0 +1,119 @@
+"""
+common/log.py
+
+Structured, queue-based logging (wired up by LOGGING in core/settings/base.py).
+
+- QueuedStreamHandler: the calling thread stamps the record with the
+  current request id, renders the message and traceback (args and exc_info
+  may change or be freed once the call returns) and puts a copy on an
+  in-memory queue; a background QueueListener thread builds the line and
+  writes it to stdout. If the queue is full the record is dropped (and
+  counted) rather than blocking the request.
+- JsonFormatter: one JSON object per line — ts, level, logger, message,
+  request_id, any `extra={...}` fields, and the traceback if there is one.
+- RequestIdFilter + request_id_var: the request id set by
+  common.middleware.RequestIdMiddleware, so every line logged while serving a
+  request can be correlated with it (and with the X-Request-ID response header).
+"""
+
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueHandler, QueueListener
+
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else came from `extra=`.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record):
+        out = {
+            "ts": datetime.fromtimestamp(record.created, tz=dt_timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                out[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        if record.stack_info:
+            out["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class QueuedStreamHandler(QueueHandler):
+    """Hands records to a background thread that formats and writes them (see module docstring)."""
+
+    def __init__(self, fmt: str = "json", maxsize: int = 10_000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        target = logging.StreamHandler(stream or sys.stdout)
+        target.setFormatter(
+            JsonFormatter() if fmt == "json"
+            else logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+        )
+        self.target = target
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        # Started lazily and per process: a listener thread does not survive fork
+        # (gunicorn --preload, Celery prefork).
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+            self._listener.start()
+            self._pid = os.getpid()  # logging.shutdown() → close() stops it at exit
+
+    def prepare(self, record):
+        # Like QueueHandler.prepare: the message and traceback are rendered
+        # now, since the caller may mutate the args or drop the exception
+        # afterwards. The line itself is formatted on the listener thread.
+        msg = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self.target.formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.msg = msg
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._pid = None
+        super().close()
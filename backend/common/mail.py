@@ -0,0 +1,120 @@
+"""
+common/mail.py
+
+Outgoing email through a Celery queue.
+
+Request code calls `queue_email` / `queue_emails`, which only publish a task
+once the surrounding transaction commits, so a slow or unreachable mail server
+never holds up a request. The worker side (common/tasks.py) sends through
+`send_messages`:
+- one SMTP connection per worker process, opened on first use and reused
+  across tasks; it is recycled after MAIL_CONNECTION_MAX_IDLE seconds idle
+  (servers drop idle sessions) and reopened once if the server hung up
+- each message is its own task, so the connection is shared but a failure
+  only retries (with exponential backoff) the message that failed
+
+EMAIL_BACKEND decides where mail goes: SMTP in prod, the console backend by
+default, locmem in tests (where Celery runs tasks eagerly).
+
+If the broker cannot be reached, the message is sent inline instead of being
+dropped.
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying (network/server side); anything else is a bug.
+RETRYABLE_ERRORS = (smtplib.SMTPException, OSError)
+
+
+def build_message(subject: str, body: str, to: List[str], from_email: Optional[str] = None) -> Dict:
+    """JSON-serializable message payload for the mail tasks."""
+    return {
+        "subject": subject,
+        "body": body,
+        "to": list(to),
+        "from_email": from_email or settings.DEFAULT_FROM_EMAIL,
+    }
+
+
+class _SharedConnection:
+    """Per-process mail connection reused across sends (see module docstring)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connection = None
+        self._last_used = 0.0
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+
+    def _get(self):
+        max_idle = settings.MAIL_CONNECTION_MAX_IDLE
+        if self._connection is not None and time.monotonic() - self._last_used > max_idle:
+            self._close()
+        if self._connection is None:
+            self._connection = get_connection(fail_silently=False)
+            self._connection.open()
+        return self._connection
+
+    def send(self, messages: List[EmailMessage]) -> int:
+        with self._lock:
+            try:
+                sent = self._get().send_messages(messages)
+            except smtplib.SMTPServerDisconnected:
+                # stale session: reconnect once, then let the task retry
+                self._close()
+                sent = self._get().send_messages(messages)
+            except Exception:
+                self._close()
+                raise
+            self._last_used = time.monotonic()
+            return sent or 0
+
+
+_shared_connection = _SharedConnection()
+
+
+def send_messages(payloads: Iterable[Dict]) -> int:
+    """Send message payloads over the shared connection; returns the number sent."""
+    messages = [EmailMessage(**p) for p in payloads]
+    if not messages:
+        return 0
+    return _shared_connection.send(messages)
+
+
+def _enqueue(payloads: List[Dict]) -> None:
+    from common.tasks import send_email_task
+
+    for i, payload in enumerate(payloads):
+        try:
+            send_email_task.apply_async(args=[payload], retry=False)
+        except Exception:
+            rest = payloads[i:]
+            logger.exception("Mail queue unavailable; sending %d message(s) inline", len(rest))
+            send_messages(rest)
+            return
+
+
+def queue_emails(payloads: List[Dict]) -> None:
+    """Send a batch of build_message() payloads in the background after commit."""
+    if payloads:
+        transaction.on_commit(lambda: _enqueue(list(payloads)))
+
+
+def queue_email(subject: str, body: str, to: List[str], from_email: Optional[str] = None) -> None:
+    queue_emails([build_message(subject, body, to, from_email)])
@@ -0,0 +1,113 @@
+"""
+Database connection reuse benchmark.
+
+    python manage.py bench_db_connections
+    python manage.py bench_db_connections --requests 500 --concurrency 8 --query "SELECT 1"
+
+Simulates simple GET requests (one short query each) twice against the same
+database:
+1. "per-request": a fresh connection opened and closed around every request,
+   which is what CONN_MAX_AGE=0 without a pool does
+2. "configured": the connection settings in use (pool or persistent
+   connections), driven through the request_started/request_finished signals
+   exactly like real requests, so checkout, health checks and release are
+   included
+
+and reports per-request latency percentiles, the latency saved per request and
+the connection stats afterwards (common.db.connection_stats). Run it against
+the real database host; against a local SQLite file the difference is small.
+"""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.utils import load_backend
+
+from common.db import connection_stats
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request connections against the configured pool/persistent connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--requests", type=int, default=300, help="simulated requests per run")
+        parser.add_argument("--concurrency", type=int, default=4, help="concurrent request threads")
+        parser.add_argument("--query", default="SELECT 1", help="query each request runs")
+
+    def handle(self, *args, **opts):
+        alias, query = opts["database"], opts["query"]
+        settings_dict = connections[alias].settings_dict
+        unpooled = {
+            **settings_dict,
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {k: v for k, v in settings_dict["OPTIONS"].items() if k != "pool"},
+        }
+        backend = load_backend(settings_dict["ENGINE"])
+
+        def per_request():
+            conn = backend.DatabaseWrapper(unpooled, alias="bench-per-request")
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query)
+                    cursor.fetchall()
+            finally:
+                conn.close()
+
+        def configured():
+            request_started.send(sender=self.__class__)
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute(query)
+                    cursor.fetchall()
+            finally:
+                request_finished.send(sender=self.__class__)
+
+        self.stdout.write(
+            f"{settings_dict['ENGINE'].rsplit('.', 1)[-1]} @ {settings_dict.get('HOST') or settings_dict['NAME']}: "
+            f"{opts['requests']} requests, {opts['concurrency']} concurrent, query {query!r}"
+        )
+        self.stdout.write(f"{'run':<14}{'req/s':>9}{'mean ms':>10}{'p50 ms':>9}{'p99 ms':>9}")
+        baseline = self._run("per-request", per_request, opts["requests"], opts["concurrency"])
+        reused = self._run("configured", configured, opts["requests"], opts["concurrency"])
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"saved per request: {baseline - reused:.2f} ms mean "
+            f"({(baseline - reused) / baseline * 100 if baseline else 0:.0f}%)"
+        )
+        stats = connection_stats(alias)
+        self.stdout.write("connection stats: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+
+    def _run(self, name, request, count, concurrency):
+        request()  # warm-up: opens the pool / first persistent connection
+        latencies = []
+        lock = threading.Lock()
+
+        def one(_):
+            start = time.perf_counter()
+            request()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            list(clients.map(one, range(count)))
+        total = time.perf_counter() - started
+        mean = statistics.mean(latencies)
+        self.stdout.write(
+            f"{name:<14}{count / total:>9.0f}{mean:>10.2f}"
+            f"{_percentile(latencies, 50):>9.2f}{_percentile(latencies, 99):>9.2f}"
+        )
+        return mean
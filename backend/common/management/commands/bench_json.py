@@ -0,0 +1,157 @@
+"""
+JSON rendering/parsing benchmark.
+
+    python manage.py bench_json
+    python manage.py bench_json --items 2000 --number 50
+
+Renders realistic response payloads with DRF's JSONRenderer (stdlib json,
+through TimedJSONRenderer) and with common.renderers.FastJSONRenderer
+(orjson), checks that both produce the same values (and whether the bytes
+match too: orjson writes 5e-7 where json writes 5e-07), and reports the time
+per call (best of 5 rounds of --number calls). The rendered bodies are then
+parsed back with JSONParser and common.parsers.FastJSONParser.
+
+Payloads:
+- wardrobe   GET /client/wardrobe/ for a user with --items items
+- directory  a stylist directory page (50 stylists, nested user)
+- recommend  a recommendation response (5 outfits, long descriptions)
+- objects    raw UUID / datetime / Decimal / date values, i.e. everything that
+             goes through the encoder's default() hook, plus small floats
+"""
+
+import io
+import timeit
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+
+from client.models import WardrobeItem
+from client.serializers.stylist import StylistPublicSerializer
+from client.serializers.wardrobe import WardrobeItemSerializer
+from common.parsers import FastJSONParser
+from common.renderers import FastJSONRenderer, TimedJSONRenderer, orjson
+from recommendations.serializers import RecommendResponseSerializer
+from stylist.models import StylistProfile
+
+User = get_user_model()
+
+
+def _wardrobe(n):
+    now = timezone.now()
+    user = User(id=uuid.uuid4(), email="bench@example.com", username="bench")
+    items = [
+        WardrobeItem(
+            id=i + 1,
+            user=user,
+            image_url=f"https://cdn.example.com/wardrobe/{uuid.uuid4().hex}.jpg",
+            title=f"Item {i} – linen shirt",
+            color=WardrobeItem.Color.values[i % len(WardrobeItem.Color.values)],
+            category=WardrobeItem.Category.values[i % len(WardrobeItem.Category.values)],
+            description="Lightweight, breathable; pairs with chinos or dark denim. " * 2,
+            created_at=now - timedelta(days=i),
+            updated_at=now - timedelta(hours=i),
+        )
+        for i in range(n)
+    ]
+    return WardrobeItemSerializer(items, many=True).data
+
+
+def _directory():
+    now = timezone.now()
+    stylists = [
+        StylistProfile(
+            user=User(id=uuid.uuid4(), username=f"stylist{i}", email=f"stylist{i}@example.com"),
+            bio="Ten years dressing people for weddings, boardrooms and everything in between.",
+            expertise=["streetwear", "formal", "vintage"][: 1 + i % 3],
+            years_experience=i % 20,
+            rating=round(3 + (i % 20) / 10, 2),
+            rating_count=i * 7,
+            created_at=now - timedelta(days=i),
+            updated_at=now,
+        )
+        for i in range(50)
+    ]
+    return StylistPublicSerializer(stylists, many=True).data
+
+
+def _recommend():
+    return RecommendResponseSerializer({
+        "recommendations": [
+            {
+                "name": f"Look {i + 1}: smart casual for dinner",
+                "description": "The navy blazer sharpens the shoulder line for your body shape, while the "
+                               "cream shirt brightens a warm skin tone; Dhaka evenings in November are mild. " * 3,
+                "product_ids": [i + 1, i + 7, i + 13, i + 19],
+            }
+            for i in range(5)
+        ]
+    }).data
+
+
+def _objects():
+    now = timezone.now()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "at": now - timedelta(minutes=i, microseconds=i),
+            "day": (now - timedelta(days=i)).date(),
+            "amount": Decimal(f"{i}.{i % 100:02d}"),
+            "label": f"row {i}",
+            "ratio": (i + 1) * 1e-7,
+        }
+        for i in range(500)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Benchmark stdlib vs orjson rendering and parsing of API payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=500, help="wardrobe items in the wardrobe payload")
+        parser.add_argument("--number", type=int, default=20, help="calls per timing round")
+
+    def handle(self, *args, **opts):
+        if orjson is None:
+            self.stdout.write("orjson is not installed: FastJSONRenderer/FastJSONParser use the stdlib (no speedup)")
+        payloads = {
+            "wardrobe": _wardrobe(opts["items"]),
+            "directory": _directory(),
+            "recommend": _recommend(),
+            "objects": _objects(),
+        }
+        number = opts["number"]
+        stdlib_renderer, fast_renderer = TimedJSONRenderer(), FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        self.stdout.write(
+            f"{'payload':<11}{'KiB':>8}{'render stdlib':>15}{'orjson':>9}{'speedup':>9}"
+            f"{'parse stdlib':>14}{'orjson':>9}{'speedup':>9}  values  bytes"
+        )
+        for name, data in payloads.items():
+            stdlib_body = stdlib_renderer.render(data)
+            fast_body = fast_renderer.render(data)
+            same_bytes = stdlib_body == fast_body
+            same = stdlib_parser.parse(io.BytesIO(stdlib_body)) == stdlib_parser.parse(io.BytesIO(fast_body))
+
+            render_std = self._time(lambda: stdlib_renderer.render(data), number)
+            render_fast = self._time(lambda: fast_renderer.render(data), number)
+            parse_std = self._time(lambda: stdlib_parser.parse(io.BytesIO(stdlib_body)), number)
+            parse_fast = self._time(lambda: fast_parser.parse(io.BytesIO(stdlib_body)), number)
+            same = same and stdlib_parser.parse(io.BytesIO(stdlib_body)) == fast_parser.parse(io.BytesIO(stdlib_body))
+
+            self.stdout.write(
+                f"{name:<11}{len(stdlib_body) / 1024:>8.1f}{render_std:>12.0f} µs{render_fast:>6.0f} µs"
+                f"{render_std / render_fast:>8.1f}x{parse_std:>11.0f} µs{parse_fast:>6.0f} µs"
+                f"{parse_std / parse_fast:>8.1f}x  {'yes' if same else 'NO':<6}  {'yes' if same_bytes else 'no'}"
+            )
+            if not same:
+                self.stderr.write(f"  {name}: output differs\n  stdlib: {stdlib_body[:200]!r}\n  orjson: {fast_body[:200]!r}")
+
+    @staticmethod
+    def _time(fn, number):
+        return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
@@ -0,0 +1,125 @@
+"""
+Login hashing benchmark.
+
+    python manage.py bench_password_hashing
+    python manage.py bench_password_hashing --argon2 2:19456:1 3:12288:1 --logins 400 --concurrency 32
+
+1. Per-hasher verify latency for PBKDF2 and each Argon2 candidate
+   (time_cost:memory_cost_KiB:parallelism).
+2. A login burst through the same bounded pool the login endpoints use
+   (PASSWORD_HASH_WORKERS / _QUEUE_SIZE / _QUEUE_TIMEOUT), reporting
+   throughput, latency percentiles and how many requests were shed.
+
+No database access; run it on the same instance type as production.
+"""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+from common.passwords import HashingPool, PasswordHashingBusy
+
+PASSWORD = "correct horse battery staple"
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _argon2_hasher(time_cost, memory_cost, parallelism):
+    from django.contrib.auth.hashers import Argon2PasswordHasher
+
+    hasher = Argon2PasswordHasher()
+    hasher.time_cost, hasher.memory_cost, hasher.parallelism = time_cost, memory_cost, parallelism
+    return hasher
+
+
+class Command(BaseCommand):
+    help = "Benchmark password hashers and login throughput through the hashing pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--argon2", nargs="*", default=["1:19456:1", "2:19456:1", "3:12288:1", "2:65536:1"],
+            help="Argon2 candidates as time_cost:memory_cost_KiB:parallelism",
+        )
+        parser.add_argument("--rounds", type=int, default=20, help="verifications per hasher")
+        parser.add_argument("--logins", type=int, default=200, help="logins in the burst")
+        parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients in the burst")
+
+    def handle(self, *args, **opts):
+        hashers = [("pbkdf2", PBKDF2PasswordHasher())]
+        for spec in opts["argon2"]:
+            try:
+                t, m, p = (int(x) for x in spec.split(":"))
+            except ValueError:
+                raise CommandError(f"Bad --argon2 value {spec!r}; expected time:memory:parallelism")
+            try:
+                hashers.append((f"argon2 t={t} m={m} p={p}", _argon2_hasher(t, m, p)))
+            except ImportError:
+                self.stderr.write("argon2-cffi is not installed; skipping Argon2 candidates")
+                break
+
+        self.stdout.write(f"{'hasher':<28}{'mean ms':>10}{'p99 ms':>10}{'/s/core':>10}")
+        for name, hasher in hashers:
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except (ImportError, ValueError) as e:
+                self.stderr.write(f"{name}: unavailable ({e})")
+                continue
+            samples = []
+            for _ in range(opts["rounds"]):
+                start = time.perf_counter()
+                hasher.verify(PASSWORD, encoded)
+                samples.append((time.perf_counter() - start) * 1000)
+            mean = statistics.mean(samples)
+            self.stdout.write(f"{name:<28}{mean:>10.1f}{_percentile(samples, 99):>10.1f}{1000 / mean:>10.1f}")
+
+        self._burst(opts["logins"], opts["concurrency"])
+
+    def _burst(self, logins, concurrency):
+        hasher = get_hasher("default")
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        pool = HashingPool(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+            queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+        )
+        latencies, shed = [], 0
+        lock = threading.Lock()
+
+        def login(_):
+            nonlocal shed
+            start = time.perf_counter()
+            try:
+                pool.run(hasher.verify, PASSWORD, encoded)
+            except PasswordHashingBusy:
+                with lock:
+                    shed += 1
+                return
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            list(clients.map(login, range(logins)))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"burst: {logins} logins, {concurrency} concurrent, default hasher {hasher.algorithm}, "
+            f"pool workers={settings.PASSWORD_HASH_WORKERS} queue={settings.PASSWORD_HASH_QUEUE_SIZE}"
+        )
+        if latencies:
+            self.stdout.write(
+                f"  {len(latencies) / elapsed:.1f} logins/s  "
+                f"p50 {_percentile(latencies, 50):.1f} ms  p99 {_percentile(latencies, 99):.1f} ms  "
+                f"shed {shed}"
+            )
+        else:
+            self.stdout.write(f"  every login was shed ({shed})")
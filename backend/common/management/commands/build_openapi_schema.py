@@ -0,0 +1,55 @@
+"""
+Pre-render the OpenAPI schema served at /api/schema/ (core/schema.py).
+
+    python manage.py build_openapi_schema
+    python manage.py build_openapi_schema --output-dir /srv/openapi --check
+
+Run it on every deploy, after the code is in place and before the web
+processes start. It writes YAML and JSON, gzipped copies and a manifest with
+their ETags into OPENAPI_SCHEMA_DIR. Running processes keep serving what they
+loaded until they restart.
+
+--check only compares a fresh render with what is on disk. It exits non-zero
+when they differ, e.g. in CI to catch a stale committed or baked-in artifact.
+"""
+
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.schema import read_schema, render_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once and store it as static, compressed files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output-dir", help="defaults to OPENAPI_SCHEMA_DIR")
+        parser.add_argument("--check", action="store_true", help="fail if the stored schema is out of date")
+
+    def handle(self, *args, **opts):
+        directory = Path(opts["output_dir"] or settings.OPENAPI_SCHEMA_DIR)
+        started = time.perf_counter()
+        artifacts = render_schema()
+        elapsed = time.perf_counter() - started
+
+        if opts["check"]:
+            stored = read_schema(directory)
+            stale = [
+                fmt for fmt, artifact in artifacts.items()
+                if stored is None or fmt not in stored or stored[fmt].etag != artifact.etag
+            ]
+            if stale:
+                raise CommandError(f"OpenAPI schema in {directory} is missing or out of date ({', '.join(stale)})")
+            self.stdout.write(f"OpenAPI schema in {directory} is up to date")
+            return
+
+        manifest = write_schema(directory, artifacts)
+        self.stdout.write(f"generated in {elapsed:.2f}s -> {directory}")
+        for fmt, meta in manifest["formats"].items():
+            self.stdout.write(
+                f"  openapi.{fmt:<5} {meta['size'] / 1024:>7.1f} KiB  "
+                f"gzip {meta['gzip_size'] / 1024:>6.1f} KiB  etag {meta['etag']}"
+            )
@@ -0,0 +1,231 @@
+"""
+Offline load test: auth, wardrobe, stylist browsing and recommendations.
+
+    python manage.py loadtest
+    python manage.py loadtest --users 16 --iterations 50 --scenarios wardrobe,browse
+    python manage.py loadtest --save-baseline           # record loadtest/baseline.json
+    python manage.py loadtest --url http://127.0.0.1:8000 --output run.json
+
+Without --url the command creates a throwaway test database (SQLite file or
+test_<NAME> on Postgres, like `manage.py test`), serves the project from a
+threaded WSGI server on 127.0.0.1 in this process, and turns the
+recommendation agent into its offline stand-in (STYLE_AGENT_FAKE) with no
+rate limits or token budgets. Nothing touches the configured database, and no
+network access or API key is needed. With --url the target server must run
+with STYLE_AGENT_FAKE=True and relaxed recommendation quotas; seeding goes
+through its API.
+
+Clients and server share one process here (and the GIL), so absolute numbers
+are lower than behind gunicorn; compare runs made the same way on the same
+machine. The scenarios are described in common/loadtest.py.
+
+Each run is compared with the baseline (--baseline, default
+loadtest/baseline.json) when it exists; the command exits non-zero if any
+scenario or endpoint regressed by more than --threshold. Record the baseline
+on the machine that runs the comparisons, with the same options.
+"""
+
+import json
+import logging
+import os
+import platform
+import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connections
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from common import loadtest
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "loadtest" / "baseline.json"
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    # headers and body go out in separate writes; with Nagle on, every
+    # response waits ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Run the offline load-test scenarios and compare them with the stored baseline."
+    # the URL checks would import the agent before handle() switches it to the
+    # offline stand-in, which fails without GOOGLE_API_KEY
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", default=",".join(loadtest.SCENARIOS),
+                            help=f"comma-separated subset of {', '.join(loadtest.SCENARIOS)}")
+        parser.add_argument("--users", type=int, default=8, help="concurrent virtual users")
+        parser.add_argument("--iterations", type=int, default=25, help="recorded iterations per user and scenario")
+        parser.add_argument("--warmup", type=int, default=1, help="unrecorded iterations per user first")
+        parser.add_argument("--stylists", type=int, default=40, help="stylists seeded into the directory")
+        parser.add_argument("--wardrobe-size", type=int, default=100, help="items seeded per virtual user")
+        parser.add_argument("--llm-latency-ms", type=float, default=0, help="simulated model latency")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--repeat", type=int, default=1,
+                            help="run each scenario N times and keep the median; use 3+ on noisy machines")
+        parser.add_argument("--url", help="target a running server instead of an in-process one")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+        parser.add_argument("--threshold", type=float, default=0.25,
+                            help="allowed relative regression of RPS and p50/p90 latency")
+        parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                            help="latency growth below this is never a regression")
+        parser.add_argument("--output", help="also write the results as JSON here")
+
+    def handle(self, *args, **opts):
+        scenarios = [s.strip() for s in opts["scenarios"].split(",") if s.strip()]
+        unknown = set(scenarios) - set(loadtest.SCENARIOS)
+        if unknown:
+            raise CommandError(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+        os.environ["STYLE_AGENT_FAKE"] = "True"
+        os.environ["STYLE_AGENT_FAKE_LATENCY_MS"] = str(opts["llm_latency_ms"])
+
+        if opts["url"]:
+            results = self._run(opts["url"], scenarios, opts)
+        else:
+            results = self._run_in_process(scenarios, opts)
+
+        self._report(results)
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps(results, indent=2) + "\n")
+
+        baseline_path = Path(opts["baseline"])
+        if opts["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(f"\nbaseline written to {baseline_path}")
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"\nno baseline at {baseline_path}; record one with --save-baseline")
+            return
+        self._compare(results, json.loads(baseline_path.read_text()), opts)
+
+    # ------------------------------------------------------------------
+
+    def _run_in_process(self, scenarios, opts):
+        alias = "default"
+        db = connections.settings[alias]
+        tmpdir = None
+        if db["ENGINE"].endswith("sqlite3"):
+            # a file, not the shared in-memory test database: concurrent
+            # writers need WAL and a busy timeout instead of "table is locked"
+            tmpdir = tempfile.TemporaryDirectory(prefix="loadtest-")
+            db.setdefault("TEST", {})["NAME"] = os.path.join(tmpdir.name, "loadtest.sqlite3")
+            db.setdefault("OPTIONS", {}).update({
+                "timeout": 30,
+                "transaction_mode": "IMMEDIATE",
+                "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            })
+
+        quiet = ("django", "django.request", "django.server", "")
+        levels = {name: logging.getLogger(name).level for name in quiet}
+        for name in quiet:
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        self.stdout.write(f"creating test database ({db['ENGINE'].rsplit('.', 1)[-1]}) ...")
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={alias}, serialized_aliases=set())
+        httpd = None
+        try:
+            with override_settings(
+                DEBUG=False,
+                ALLOWED_HOSTS=["127.0.0.1"],
+                RECOMMEND_RATES={},
+                RECOMMEND_DAILY_TOKEN_BUDGETS={},
+                REQUEST_TIMING_REPORT_INTERVAL=0,
+            ):
+                httpd = ThreadedWSGIServer(("127.0.0.1", 0), QuietRequestHandler, allow_reuse_address=False)
+                httpd.set_app(WSGIHandler())
+                threading.Thread(target=httpd.serve_forever, daemon=True).start()
+                return self._run(f"http://127.0.0.1:{httpd.server_address[1]}", scenarios, opts)
+        finally:
+            if httpd is not None:
+                httpd.shutdown()
+                httpd.server_close()
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            for name, level in levels.items():
+                logging.getLogger(name).setLevel(level)
+            if tmpdir is not None:
+                tmpdir.cleanup()
+
+    def _run(self, base_url, scenarios, opts):
+        rng = random.Random(opts["seed"])
+        ctx = loadtest.new_context()
+        self.stdout.write(
+            f"seeding {opts['stylists']} stylists and {opts['users']} clients "
+            f"with {opts['wardrobe_size']} wardrobe items each ..."
+        )
+        loadtest.seed_stylists(base_url, ctx["run_id"], opts["stylists"], rng)
+        with ThreadPoolExecutor(max_workers=opts["users"]) as pool:
+            users = list(pool.map(
+                lambda n: loadtest.seed_client(base_url, ctx["run_id"], n, opts["wardrobe_size"], random.Random(f"{opts['seed']}-{n}")),
+                range(opts["users"]),
+            ))
+
+        results = {
+            "meta": {
+                "target": "in-process" if not opts["url"] else "url",
+                "database": connections["default"].vendor if not opts["url"] else None,
+                "machine": {"cpus": os.cpu_count(), "python": platform.python_version(), "platform": platform.platform()},
+                "options": {k: opts[k] for k in ("users", "iterations", "warmup", "stylists", "wardrobe_size", "llm_latency_ms", "seed", "repeat")},
+            },
+            "scenarios": {},
+        }
+        for name in scenarios:
+            self.stdout.write(f"running {name} ...")
+            runs = [
+                loadtest.run_scenario(
+                    name, base_url, {**ctx, "round": r}, users, opts["iterations"],
+                    warmup=opts["warmup"], seed=opts["seed"],
+                )
+                for r in range(opts["repeat"])
+            ]
+            # the run with the median throughput: one noisy run neither hides
+            # nor fakes a regression
+            results["scenarios"][name] = sorted(runs, key=lambda run: run["rps"])[len(runs) // 2]
+        return results
+
+    # ------------------------------------------------------------------
+
+    def _report(self, results):
+        self.stdout.write("")
+        self.stdout.write(f"{'endpoint':<20}{'count':>7}{'errors':>8}{'mean ms':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+        for name, scenario in results["scenarios"].items():
+            for label, s in scenario["endpoints"].items():
+                self.stdout.write(
+                    f"{label:<20}{s['count']:>7}{s['errors']:>8}{s['mean_ms']:>10.2f}"
+                    f"{s['p50_ms']:>9.2f}{s['p90_ms']:>9.2f}{s['p99_ms']:>9.2f}"
+                )
+                if s.get("failed_statuses"):
+                    self.stdout.write(f"{'':<20}failed: {s['failed_statuses']}")
+            self.stdout.write(
+                f"{name + ' total':<20}{scenario['requests']:>7}{scenario['errors']:>8}"
+                f"   {scenario['rps']:.1f} req/s over {scenario['duration_s']:.1f}s"
+            )
+            self.stdout.write("")
+
+    def _compare(self, results, baseline, opts):
+        for key in ("database", "machine", "options"):
+            if baseline.get("meta", {}).get(key) != results["meta"][key]:
+                self.stderr.write(
+                    f"warning: baseline {key} differs ({baseline.get('meta', {}).get(key)} vs {results['meta'][key]}); "
+                    "numbers may not be comparable"
+                )
+        regressions = loadtest.compare(results, baseline, opts["threshold"], opts["min_delta_ms"])
+        if regressions:
+            for line in regressions:
+                self.stderr.write(f"REGRESSION {line}")
+            raise CommandError(f"{len(regressions)} regression(s) beyond {opts['threshold']:.0%} of the baseline")
+        self.stdout.write(f"no regressions beyond {opts['threshold']:.0%} of {opts['baseline']}")
@@ -0,0 +1,102 @@
+"""
+common/middleware.py
+
+RequestIdMiddleware: gives every request an id for log correlation.
+ServerTimingMiddleware: per-request time breakdown (see common/timing.py).
+
+An incoming X-Request-ID (from the load balancer or the frontend) is reused
+when it looks sane; otherwise a new one is generated. The id is stored in
+common.log.request_id_var for the duration of the request, so every log line
+carries it, and is echoed back in the X-Request-ID response header.
+"""
+
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from common import timing
+from common.log import request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        request_id = incoming if _VALID_ID.match(incoming) else uuid.uuid4().hex
+        request.request_id = request_id
+        # Deliberately not reset on the way out: Django logs 4xx/5xx responses
+        # (django.request) after the middleware chain returns. The next request
+        # on this thread overwrites it.
+        request_id_var.set(request_id)
+        response = self.get_response(request)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Times every request into the per-view histograms; sampled requests also
+    get the DB/cache/LLM/serialize breakdown, sent as a Server-Timing header
+    only with REQUEST_TIMING_HEADER.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.send_header = settings.REQUEST_TIMING_HEADER
+        self.report_interval = settings.REQUEST_TIMING_REPORT_INTERVAL
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        rate = self.sample_rate
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            response = self.get_response(request)
+            self._observe(request, {"total": (time.perf_counter() - start) * 1000})
+            return response
+
+        timings = timing.start_request()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(timing.db_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            timing.end_request()
+        total = (time.perf_counter() - start) * 1000
+
+        counts = timings.counts
+        ms = {name: seconds * 1000 for name, seconds in timings.durations.items()}
+        values = {"total": total, "db_queries": counts["db"], **ms}
+        if self.send_header:
+            response["Server-Timing"] = self._header(ms, counts, total)
+        self._observe(request, values)
+        return response
+
+    @staticmethod
+    def _header(ms, counts, total):
+        header = [f'db;dur={ms.get("db", 0):.1f};desc="{counts["db"]} queries"']
+        if "cache" in ms or counts["cache_hit"] or counts["cache_miss"]:
+            # dur is L2 (Redis) time only; L1 hits cost no round trip
+            header.append(f'cache;dur={ms.get("cache", 0):.1f};desc="{counts["cache_hit"]} hit {counts["cache_miss"]} miss"')
+        for name in ("llm", "serialize"):
+            if name in ms:
+                header.append(f"{name};dur={ms[name]:.1f}")
+        header.append(f"total;dur={total:.1f}")
+        return ", ".join(header)
+
+    def _observe(self, request, values):
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name or match._func_path) if match else "unresolved"
+        timing.histograms.observe(view, values)
+        timing.maybe_report(self.report_interval)
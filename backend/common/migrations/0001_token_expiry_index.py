@@ -0,0 +1,23 @@
+"""
+Index on token_blacklist_outstandingtoken.expires_at.
+
+SimpleJWT's table has no index on the expiry column, so every batch of
+common.utils.prune_expired_tokens would scan the whole table.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS token_outstanding_expires_idx "
+            "ON token_blacklist_outstandingtoken (expires_at)",
+            "DROP INDEX IF EXISTS token_outstanding_expires_idx",
+        ),
+    ]
@@ -0,0 +1,105 @@
+"""
+common/passwords.py
+
+Login credential checks with password hashing off the request thread.
+
+Verifying a password is pure CPU (PBKDF2/Argon2), so a login burst can pin
+every request worker at once. verify_credentials() keeps the DB work on the
+calling thread and runs only the hash in a small per-process pool:
+- at most PASSWORD_HASH_WORKERS hashes run concurrently per process
+- a few more may wait up to PASSWORD_HASH_QUEUE_TIMEOUT seconds for a worker
+- anything beyond that is shed with 503 + Retry-After instead of queueing
+
+When the stored hash uses an outdated algorithm or parameters (see
+PASSWORD_HASHERS in settings), the new hash is computed in the pool during
+the same login and saved, so users migrate to the preferred hasher on their
+next successful login.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+User = get_user_model()
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins in progress, please retry shortly."
+    default_code = "login_busy"
+    wait = 1  # DRF turns this into a Retry-After header
+
+
+class HashingPool:
+    """Bounded thread pool for password hashing (see module docstring)."""
+
+    def __init__(self, workers: int, queue_size: int, queue_timeout: float):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def run(self, fn: Callable, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHashingBusy()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+
+_pool: Optional[HashingPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> HashingPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    workers=settings.PASSWORD_HASH_WORKERS,
+                    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+                    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+                )
+    return _pool
+
+
+def _verify(password: str, encoded: Optional[str]):
+    """(matches, new_hash or None). Runs in the hashing pool; no DB access."""
+    if encoded is None:
+        # Unknown user: hash anyway so response time doesn't reveal whether
+        # the email exists (same as ModelBackend).
+        make_password(password)
+        return False, None
+    upgraded = []
+    ok = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return ok, (upgraded[0] if upgraded else None)
+
+
+def verify_credentials(email: str, password: str, request=None):
+    """
+    Drop-in for `authenticate(request, email=..., password=...)` on the login
+    endpoints: returns the active user or None.
+    """
+    try:
+        user = User._default_manager.get_by_natural_key(email)
+    except User.DoesNotExist:
+        user = None
+
+    ok, new_hash = get_hashing_pool().run(_verify, password, user.password if user else None)
+
+    if not ok or not user.is_active:
+        user_login_failed.send(sender=__name__, credentials={"email": email}, request=request)
+        return None
+
+    if new_hash:
+        user.password = new_hash
+        user.save(update_fields=["password"])
+    return user
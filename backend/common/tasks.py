@@ -0,0 +1,35 @@
+"""
+common/tasks.py
+
+Periodic maintenance for shared tables (scheduled in CELERY_BEAT_SCHEDULE)
+and the outgoing mail queue (common/mail.py).
+"""
+
+from celery import shared_task
+
+from common.mail import RETRYABLE_ERRORS, send_messages
+from common.utils import prune_expired_tokens
+
+
+@shared_task(name="common.prune_expired_tokens")
+def prune_expired_tokens_task():
+    """Delete expired JWT outstanding/blacklisted rows in small batches."""
+    return prune_expired_tokens()
+
+
+@shared_task(
+    name="common.send_email",
+    autoretry_for=RETRYABLE_ERRORS,
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=6,
+    ignore_result=True,
+)
+def send_email_task(payload):
+    """
+    Send one queued message (a common.mail.build_message payload) over the
+    worker's SMTP connection. One message per task, so a retry never resends
+    mail that already went out.
+    """
+    return send_messages([payload])
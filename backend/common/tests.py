@@ -1,3 +1,304 @@
-from django.test import TestCase
+import io
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.authentication import ClaimsJWTAuthentication, ClaimsUser
+from common.cache import LocalLRU, bump_generation, cache_stats, get_or_build, local_cache, reset_cache_stats
+from common.checks import check_health_required_checks
+from common.mail import build_message, queue_emails
+from common.parsers import FastJSONParser
+from common.renderers import FastJSONRenderer, orjson
+from common.utils import get_tokens_for_user
+
+User = get_user_model()
+
+# A cache other processes could read: the only kind ClaimsJWTAuthentication
+# trusts the token claims with.
+SHARED_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(prefix="stylegenie-test-cache-"),
+    }
+}
+
+
+def _authenticate(token):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return ClaimsJWTAuthentication().authenticate(request)
+
+
+class ClaimsAuthenticationMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@example.com", username="client", password="pw-12345!")
+        self.access = get_tokens_for_user(self.user)["access"]
+
+    def get_wardrobe(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        return self.client.get("/client/wardrobe/")
+
+
+@override_settings(CACHES=SHARED_CACHE)
+class ClaimsJWTAuthenticationTests(ClaimsAuthenticationMixin, APITestCase):
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_claims_authorize_without_user_query(self):
+        with self.assertNumQueries(0):
+            user, _ = _authenticate(self.access)
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.role, User.Role.CLIENT)
+            self.assertTrue(user.is_active)
+        self.assertEqual(self.get_wardrobe().status_code, 200)
+
+    def test_banned_user_rejected_on_next_request(self):
+        self.assertEqual(self.get_wardrobe().status_code, 200)
+        self.user.status = User.Status.BANNED
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.get_wardrobe()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "token_revoked")
+
+    def test_deactivated_user_rejected_on_next_request(self):
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.get_wardrobe().status_code, 401)
+
+    def test_role_change_rejected_on_next_request(self):
+        self.user.role = User.Role.STYLIST
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.get_wardrobe()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "token_revoked")
+
+    def test_unrelated_save_keeps_session(self):
+        self.user.first_name = "Ada"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.get_wardrobe().status_code, 200)
+
+    def test_token_without_claims_loads_user(self):
+        legacy = str(RefreshToken.for_user(self.user).access_token)
+        with self.assertNumQueries(1):
+            user, _ = _authenticate(legacy)
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.pk, self.user.pk)
+
+
+class PerProcessCacheFallbackTests(ClaimsAuthenticationMixin, APITestCase):
+    """core.settings.test uses LocMem: revocation markers would not reach other workers."""
+
+    def test_user_loaded_from_database(self):
+        with self.assertNumQueries(1):
+            user, _ = _authenticate(self.access)
+        self.assertIsInstance(user, User)
+
+    def test_banned_user_rejected_by_database_lookup(self):
+        User.objects.filter(pk=self.user.pk).update(status=User.Status.BANNED)  # no signal, no marker
+        response = self.get_wardrobe()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "user_inactive")
+
+
+class MailQueueTests(APITestCase):
+    """core.settings.test: locmem backend, CELERY_TASK_ALWAYS_EAGER."""
+
+    def setUp(self):
+        User.objects.create_user(email="client@example.com", username="client", password="pw-12345!")
+
+    def test_reset_request_sends_one_message_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/client/auth/send-reset-password-email/", {"email": "client@example.com"}, format="json",
+            )
+            self.assertEqual(len(mail.outbox), 0)  # nothing leaves before the commit
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["client@example.com"])
+
+    def test_unknown_email_sends_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/client/auth/send-reset-password-email/", {"email": "nobody@example.com"}, format="json",
+            )
+        self.assertEqual(response.status_code, 200)  # same answer as for a known email
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class MailTaskTests(TestCase):
+
+    def test_one_task_per_message(self):
+        with mock.patch("common.tasks.send_messages", return_value=1) as send, \
+                self.captureOnCommitCallbacks(execute=True):
+            queue_emails([build_message("a", "body", ["a@example.com"]), build_message("b", "body", ["b@example.com"])])
+        self.assertEqual([len(call.args[0]) for call in send.call_args_list], [1, 1])
+
+    def test_broker_down_sends_inline(self):
+        with mock.patch("common.tasks.send_email_task.apply_async", side_effect=OSError("broker down")), \
+                self.captureOnCommitCallbacks(execute=True):
+            queue_emails([build_message("a", "body", ["a@example.com"]), build_message("b", "body", ["b@example.com"])])
+        self.assertEqual([m.subject for m in mail.outbox], ["a", "b"])
+
+
+class HealthSettingsCheckTests(TestCase):
+
+    def test_unknown_required_check_is_an_error(self):
+        with override_settings(HEALTH_REQUIRED_CHECKS=["database", "redis"]):
+            errors = check_health_required_checks(None)
+        self.assertEqual([e.id for e in errors], ["common.E001"])
+        self.assertIn("redis", errors[0].msg)
+
+    def test_known_checks_pass(self):
+        with override_settings(HEALTH_REQUIRED_CHECKS=["database", "cache", "broker", "agent"]):
+            self.assertEqual(check_health_required_checks(None), [])
+
+
+class LocalLRUTests(TestCase):
+
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRU(max_entries=2)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+        lru.get("a")
+        lru.set("c", 3, 60)
+        self.assertEqual((lru.get("a"), lru.get("c")), (1, 3))
+        self.assertIsNot(lru.get("b"), 2)
+        self.assertEqual(len(lru), 2)
+
+    def test_entries_expire(self):
+        lru = LocalLRU(max_entries=10)
+        lru.set("a", 1, 0.05)
+        time.sleep(0.06)
+        self.assertIsNot(lru.get("a"), 1)
+        self.assertEqual(len(lru), 0)
+
+
+class TieredCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache().clear()
+        reset_cache_stats()
+        self.builds = 0
+
+    def build(self, value="built"):
+        def builder():
+            self.builds += 1
+            return value
+        return builder
+
+    def test_l1_then_l2_hits(self):
+        for _ in range(2):
+            self.assertEqual(get_or_build("t:k", self.build(), 60, versions=["t-gen"]), "built")
+        local_cache().clear()  # another process: only L2 has it
+        self.assertEqual(get_or_build("t:k", self.build(), 60, versions=["t-gen"]), "built")
+
+        self.assertEqual(self.builds, 1)
+        stats = cache_stats()["t"]
+        self.assertEqual((stats["misses"], stats["l1_hits"], stats["l2_hits"]), (1, 1, 1))
+
+    def test_bump_generation_invalidates_versioned_key(self):
+        get_or_build("t:k", self.build("old"), 60, versions=["t-gen", "other-gen"])
+        bump_generation("t-gen")
+        self.assertEqual(get_or_build("t:k", self.build("new"), 60, versions=["t-gen", "other-gen"]), "new")
+        self.assertEqual(get_or_build("t:k", self.build("newer"), 60, versions=["t-gen", "other-gen"]), "new")
+        self.assertEqual(self.builds, 2)
+
+    @override_settings(CACHE_NEGATIVE_TIMEOUT=1)
+    def test_negative_entry_expires(self):
+        self.assertIsNone(get_or_build("t:missing", self.build(None), 60, versions=["t-gen"]))
+        self.assertIsNone(get_or_build("t:missing", self.build("found"), 60, versions=["t-gen"]))
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(cache_stats()["t"]["negative_hits"], 1)
+
+        time.sleep(1.1)
+        self.assertEqual(get_or_build("t:missing", self.build("found"), 60, versions=["t-gen"]), "found")
+        self.assertEqual(self.builds, 2)
+
+    def test_lock_waiter_gets_winners_value(self):
+        cache.add("t:slow:lock", 1, 10)  # another process is building
+        winner = threading.Timer(0.1, lambda: cache.set("t:slow", "winner's", 60))
+        winner.start()
+        try:
+            value = get_or_build("t:slow", self.build("mine"), 60, wait_timeout=2, poll_interval=0.01)
+        finally:
+            winner.join()
+        self.assertEqual(value, "winner's")
+        self.assertEqual(self.builds, 0)
+        self.assertEqual(cache_stats()["t"]["lock_waits"], 1)
+
+    def test_l2_failure_falls_back_to_builder(self):
+        broken = mock.Mock(**{f"{m}.side_effect": ConnectionError("redis down") for m in ("get", "get_many", "add", "set")})
+        with mock.patch("common.cache.cache", broken):
+            self.assertEqual(get_or_build("t:k", self.build(), 60, versions=["t-gen"]), "built")
+            self.assertEqual(get_or_build("t:plain", self.build(), 60), "built")
+        self.assertEqual(self.builds, 2)
+        self.assertGreaterEqual(cache_stats()["t"]["errors"], 2)
+
+
+class FastJSONTests(TestCase):
+    """FastJSONRenderer/FastJSONParser against DRF's JSONRenderer/JSONParser."""
+
+    VALUES = {
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "aware": datetime(2026, 11, 20, 12, 0, 0, 123456, tzinfo=timezone.utc),
+        "aware_offset": datetime(2026, 11, 20, 18, 0, tzinfo=timezone(timedelta(hours=6))),
+        "naive": datetime(2026, 11, 20, 12, 0, 0, 500),
+        "decimal": Decimal("1234.50"),
+        "line_separators": "one\u2028two\u2029three",
+        "big_int": 2**70,
+        "negative_big_int": -(2**64),
+    }
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), "application/json", {})
+
+    def test_renders_the_same_bytes(self):
+        for name, value in self.VALUES.items():
+            data = {"value": value, "list": [value]}
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data), name)
+
+    def test_line_separators_are_escaped(self):
+        body = FastJSONRenderer().render({"value": self.VALUES["line_separators"]})
+        self.assertIn(b"\\u2028", body)
+        self.assertNotIn("\u2028".encode(), body)
+
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_small_float_differs_only_in_bytes(self):
+        fast, stdlib = FastJSONRenderer().render({"v": 5e-7}), JSONRenderer().render({"v": 5e-7})
+        self.assertEqual((fast, stdlib), (b'{"v":5e-7}', b'{"v":5e-07}'))
+        self.assertEqual(self.parse(FastJSONParser(), fast), self.parse(JSONParser(), stdlib))
+
+    def test_parses_like_json_parser(self):
+        body = JSONRenderer().render(self.VALUES)
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_big_integers_stay_exact(self):
+        parsed = self.parse(FastJSONParser(), b'{"a": 1180591620717411303424, "b": -18446744073709551616, "c": 9}')
+        self.assertEqual(parsed, {"a": 2**70, "b": -(2**64), "c": 9})
+        self.assertIsInstance(parsed["a"], int)
+
+    def test_invalid_body_raises_parse_error(self):
+        for body in (b'{"a": NaN}', b'{"a": ', b'{"a": 1,}'):
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
@@ -0,0 +1,227 @@
+"""
+common/throttling.py
+
+Token-bucket throttling and daily usage budgets for DRF views.
+
+State lives in Redis when THROTTLE_REDIS_URL is set: one EVALSHA per bucket
+check (the refill/take runs atomically in Lua on Redis' own clock) and one
+GET per budget check. Without it, or if Redis is unreachable, a per-process
+in-memory store is used instead, which is what tests and local development run
+on; it fails open in the sense that limits become per-process rather than
+global, never that requests are rejected because Redis is down.
+
+Subclasses pick a rate or budget by "plan". Until accounts grow a billing
+plan, the plan is the user's role, which the claims-based authentication
+already has without a DB query.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class LocalThrottleStore:
+    """In-process buckets and counters (tests, dev, Redis outages)."""
+
+    MAX_KEYS = 50_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._counters: Dict[str, Tuple[int, float]] = {}
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            if len(self._buckets) >= self.MAX_KEYS:
+                self._buckets.clear()
+            self._buckets[key] = (tokens, now)
+        return wait
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            value, expires = self._counters.get(key, (0, 0.0))
+            return value if expires > time.monotonic() else 0
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            value, expires = self._counters.get(key, (0, 0.0))
+            if expires <= now:
+                value, expires = 0, now + ttl
+            if len(self._counters) >= self.MAX_KEYS:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            self._counters[key] = (value + amount, expires)
+            return value + amount
+
+
+class RedisThrottleStore:
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self._bucket = self._redis.register_script(_BUCKET_LUA)
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        return float(self._bucket(keys=[key], args=[capacity, rate, cost]))
+
+    def get(self, key: str) -> int:
+        return int(self._redis.get(key) or 0)
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        pipe = self._redis.pipeline()
+        pipe.incrby(key, amount)
+        pipe.expire(key, ttl)
+        return int(pipe.execute()[0])
+
+
+_local_store = LocalThrottleStore()
+_redis_store: Optional[RedisThrottleStore] = None
+_redis_lock = threading.Lock()
+
+
+def _redis() -> Optional[RedisThrottleStore]:
+    global _redis_store
+    url = getattr(settings, "THROTTLE_REDIS_URL", None)
+    if not url:
+        return None
+    if _redis_store is None:
+        with _redis_lock:
+            if _redis_store is None:
+                _redis_store = RedisThrottleStore(url)
+    return _redis_store
+
+
+def _call(method: str, *args):
+    """Run a store operation on Redis, or locally if Redis is off or failing."""
+    store = _redis()
+    if store is not None:
+        try:
+            return getattr(store, method)(*args)
+        except Exception:
+            pass
+    return getattr(_local_store, method)(*args)
+
+
+def take_token(key: str, capacity: float, rate: float, cost: float = 1) -> float:
+    """Take `cost` tokens from a bucket; returns 0 if allowed, else seconds to wait."""
+    return _call("take", key, capacity, rate, cost)
+
+
+def get_usage(key: str) -> int:
+    return _call("get", key)
+
+
+def add_usage(key: str, amount: int, ttl: int) -> int:
+    return _call("incr", key, amount, ttl)
+
+
+def parse_rate(rate: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'10/min' → (10, 60). Same format as DRF's DEFAULT_THROTTLE_RATES."""
+    if not rate:
+        return None
+    num, period = rate.split("/")
+    return int(num), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+
+
+def plan_for(user) -> str:
+    return getattr(user, "role", None) or "anon"
+
+
+def _ident(request) -> str:
+    user = request.user
+    if user and user.is_authenticated:
+        return str(user.pk)
+    return request.META.get("REMOTE_ADDR", "unknown")
+
+
+class PlanTokenBucketThrottle(BaseThrottle):
+    """
+    Per-user token bucket whose rate depends on the user's plan.
+
+    get_rates() maps plan → DRF-style rate ("10/min"); a missing or None rate means
+    unthrottled. The bucket holds a full period's worth of requests and refills
+    continuously, so short bursts are allowed but the average rate is capped.
+    """
+
+    scope: str = ""
+
+    def get_rates(self) -> Dict[str, Optional[str]]:
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        parsed = parse_rate(self.get_rates().get(plan_for(request.user)))
+        if parsed is None:
+            return True
+        num, duration = parsed
+        self._wait = take_token(f"throttle:{self.scope}:{_ident(request)}", num, num / duration)
+        return self._wait <= 0
+
+    def wait(self):
+        return self._wait
+
+
+class DailyBudgetThrottle(BaseThrottle):
+    """
+    Rejects requests once the user's usage for the current UTC day reaches
+    their plan's budget. Views report usage with `record(request, amount)`
+    after the work is done.
+    """
+
+    scope: str = ""
+
+    def get_budgets(self) -> Dict[str, Optional[int]]:
+        raise NotImplementedError
+
+    @classmethod
+    def _key(cls, request) -> str:
+        return f"budget:{cls.scope}:{_ident(request)}:{datetime.now(dt_timezone.utc).date().isoformat()}"
+
+    def allow_request(self, request, view):
+        budget = self.get_budgets().get(plan_for(request.user))
+        if budget is None:
+            return True
+        return get_usage(self._key(request)) < budget
+
+    def wait(self):
+        now = datetime.now(dt_timezone.utc)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=dt_timezone.utc)
+        return (midnight - now).total_seconds()
+
+    @classmethod
+    def record(cls, request, amount: int) -> int:
+        # expire a little after the day ends; the key is dated anyway
+        return add_usage(cls._key(request), int(amount), 2 * 86400)
@@ -0,0 +1,146 @@
+"""
+common/timing.py
+
+Where request time goes, per request and per view.
+
+common.middleware.ServerTimingMiddleware opens a RequestTimings for a sampled
+request (REQUEST_TIMING_SAMPLE_RATE) and fills it from:
+- the database: an execute_wrapper on every connection adds each query's time
+  and count
+- `timed(name)` blocks: "cache" (L2 round trips in common/cache.py), "llm"
+  (the agent call in recommendations/services.py), "serialize" (DRF response
+  rendering, common/renderers.py)
+- `count(name)`: cache hits/misses
+
+The breakdown goes into per-view histograms
+(ViewHistograms), which are logged as one JSON line per process every
+REQUEST_TIMING_REPORT_INTERVAL seconds and then reset. Unsampled requests
+only add their total time, so the per-view latency distribution stays
+complete at any sample rate.
+With REQUEST_TIMING_HEADER it is also sent to the client as a Server-Timing
+header.
+
+Outside a sampled request `timed` and `count` are a ContextVar lookup.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets: milliseconds for durations, plain
+# numbers for counts (db_queries); the last bucket is open-ended.
+BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RequestTimings:
+    __slots__ = ("durations", "counts")
+
+    def __init__(self):
+        self.durations: Dict[str, float] = defaultdict(float)  # seconds
+        self.counts: Counter = Counter()
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> RequestTimings:
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def end_request() -> None:
+    _current.set(None)
+
+
+@contextmanager
+def timed(name: str):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += time.perf_counter() - start
+        timings.counts[name] += 1
+
+
+def count(name: str, n: int = 1) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.counts[name] += n
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """connection.execute_wrapper hook: time and count every query."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.durations["db"] += time.perf_counter() - start
+        timings.counts["db"] += 1
+
+
+class ViewHistograms:
+    """Per view and metric: bucket counts, sum and count since the last report."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, list]] = {}
+        self._last_report = time.monotonic()
+
+    def observe(self, view: str, values: Dict[str, float]) -> None:
+        with self._lock:
+            metrics = self._data.setdefault(view, {})
+            for metric, value in values.items():
+                h = metrics.get(metric)
+                if h is None:
+                    # [bucket counts..., overflow, sum, count]
+                    h = metrics[metric] = [0] * (len(BUCKETS) + 1) + [0.0, 0]
+                h[bisect.bisect_left(BUCKETS, value)] += 1
+                h[-2] += value
+                h[-1] += 1
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Dict]]:
+        with self._lock:
+            data = self._data
+            if reset:
+                self._data = {}
+                self._last_report = time.monotonic()
+        out = {}
+        for view, metrics in data.items():
+            out[view] = {
+                metric: {
+                    "count": h[-1],
+                    "mean": round(h[-2] / h[-1], 2) if h[-1] else 0,
+                    "buckets": {str(le): n for le, n in zip(BUCKETS + ("inf",), h[:-2]) if n},
+                }
+                for metric, h in metrics.items()
+            }
+        return out
+
+    def report_due(self, interval: float) -> bool:
+        return time.monotonic() - self._last_report >= interval
+
+
+histograms = ViewHistograms()
+
+
+def maybe_report(interval: float) -> None:
+    """Log and reset the histograms if `interval` seconds have passed (called per request)."""
+    if interval > 0 and histograms.report_due(interval):
+        snapshot = histograms.snapshot(reset=True)
+        if snapshot:
+            logger.info("request timings", extra={"interval_s": interval, "views": snapshot})
@@ -1,16 +1,24 @@
 # Standard library imports
+import logging
 import os
 import random
 
 # Django imports
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import connection
+from django.utils import timezone
 from django.utils.text import slugify
 
 # Third-party imports
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 
+# Local imports
+from common.authentication import add_user_claims
+from common.mail import queue_email
+
+logger = logging.getLogger(__name__)
+
 # =========================
 # JWT Token Utility
 # =========================
@@ -25,6 +33,9 @@ def get_tokens_for_user(user):
         dict: Contains 'refresh' and 'access' tokens as strings.
     """
     refresh = RefreshToken.for_user(user)
+    # role/status/is_active let ClaimsJWTAuthentication skip the User query;
+    # access tokens derived from this refresh token inherit them.
+    add_user_claims(refresh, user)
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -42,12 +53,59 @@ def revoke_user_tokens(user):
 
     Notes:
         Uses the token blacklist mechanism from rest_framework_simplejwt.
+        One INSERT ... SELECT blacklists every unexpired token of the user;
+        tokens that are already blacklisted are skipped by the unique
+        constraint on token_id, so the cost does not grow with the number of
+        sessions.
     """
+    outstanding = OutstandingToken._meta.db_table
+    blacklisted = BlacklistedToken._meta.db_table
+    now = timezone.now()
     try:
-        for token in OutstandingToken.objects.filter(user=user):
-            BlacklistedToken.objects.get_or_create(token=token)
-    except Exception as e:
-        print(f"[WARN] Failed to revoke tokens: {e}")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {blacklisted} (token_id, blacklisted_at)
+                SELECT id, %s FROM {outstanding}
+                WHERE user_id = %s AND expires_at > %s
+                ON CONFLICT (token_id) DO NOTHING
+                """,
+                [now, OutstandingToken._meta.get_field("user").get_db_prep_value(user.pk, connection), now],
+            )
+    except Exception:
+        logger.exception("Failed to revoke tokens", extra={"user_id": str(user.pk)})
+
+
+# =========================
+# JWT Table Pruning
+# =========================
+TOKEN_PRUNE_BATCH_SIZE = 1000
+
+
+def prune_expired_tokens(batch_size: int = TOKEN_PRUNE_BATCH_SIZE) -> int:
+    """
+    Delete expired outstanding tokens (and their blacklist rows) in batches.
+
+    Each batch is its own short statement pair keyed by primary key, so no
+    lock is held across the whole table. Expired tokens fail signature checks
+    on their own; their blacklist rows are dead weight.
+
+    Returns:
+        int: Number of outstanding tokens deleted.
+    """
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        # cascades to the blacklist rows of the same batch
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
 
 
 # =========================
@@ -55,17 +113,18 @@ def revoke_user_tokens(user):
 # =========================
 def send_password_reset_email(user, reset_link: str):
     """
-    Build and send a password reset email for staff members.
+    Build a password reset email and queue it for sending.
 
     Args:
         user: Django User instance.
         reset_link (str): URL to reset the password.
 
     Notes:
-        - For production, uncomment the `send_mail` block.
+        - Sent by a Celery worker after the current transaction commits
+          (common/mail.py); the request never waits on the mail server.
         - Uses inline templates for subject and body.
     """
-    subject_template = "Reset your staff password"
+    subject_template = "Reset your StyleGenie password"
     body_template = """
         Hello {first_name} {last_name}
 
@@ -83,16 +142,4 @@ def send_password_reset_email(user, reset_link: str):
         reset_link=reset_link
     )
 
-    # Debug output for development
-    print("Mail sent successfully")
-    print("Subject:", subject)
-    print("Body:", body)
-
-    # Uncomment for production email sending
-    # send_mail(
-    #     subject=subject,
-    #     message=body,
-    #     from_email=settings.EMAIL_HOST_USER,
-    #     recipient_list=[user.email],
-    #     fail_silently=False,
-    # )
+    queue_email(subject=subject, body=body, to=[user.email])
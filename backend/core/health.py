@@ -1,23 +1,175 @@
-from django.http import JsonResponse
-from django.db import connection
+"""
+core/health.py
+
+Probe endpoints.
+
+- /health/live/   liveness: the process is up and serving; touches nothing
+- /health/ready/  readiness: database, cache (Redis), Celery broker and the
+                  recommendation agent's configuration
+- /health/        readiness plus environment/version metadata (the original
+                  endpoint, kept for existing monitors)
+
+Readiness checks run in parallel on a small thread pool, each bounded by
+HEALTH_CHECK_TIMEOUT seconds, and the combined result is reused for
+HEALTH_CACHE_SECONDS. Concurrent probes wait for the run in progress instead
+of starting their own, so a probe storm costs each backend at most one check
+per process per interval. A check that is still hanging from an earlier run is
+reported as timed out instead of being started again.
+
+Only HEALTH_REQUIRED_CHECKS make the instance unready (503). Other failures are
+reported as "degraded" with 200; e.g. mail falls back to inline sending without
+a broker, so taking every instance out of rotation over it would be worse.
+"""
+
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict
 
-def health_check(request):
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from common.db import connection_stats
+
+
+def check_database() -> Dict:
+    conn = connections["default"]
+    # same lifecycle as a request: health-check a reused connection, and
+    # afterwards keep it (CONN_MAX_AGE) or hand it back to the pool
+    conn.close_if_unusable_or_obsolete()
     try:
-        connection.ensure_connection()
-        db_status = "ok"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-
-    overall_status = "ok" if db_status == "ok" else "error"
-    http_status = 200 if overall_status == "ok" else 500
-
-    return JsonResponse(
-        {
-            "status": overall_status,
-            "database": db_status,
-            "environment": os.getenv("DJANGO_ENV", "development"),
-            "version": os.getenv("APP_VERSION", "1.0.0")
-        },
-        status=http_status
-    )
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        conn.close_if_unusable_or_obsolete()
+    return {"connections": connection_stats()}
+
+
+def check_cache() -> Dict:
+    key = "health:ping"
+    value = str(time.time())
+    cache.set(key, value, 30)
+    if cache.get(key) != value:
+        raise RuntimeError("cache did not return the value just written")
+    return {"backend": settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]}
+
+
+def check_broker() -> Dict:
+    if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+        return {"skipped": "tasks run eagerly"}
+    from core.celery import app
+
+    with app.connection_for_write(connect_timeout=settings.HEALTH_CHECK_TIMEOUT) as conn:
+        conn.ensure_connection(max_retries=0)  # one attempt; the probe is retried anyway
+        return {"transport": conn.transport_cls}
+
+
+def check_agent() -> Dict:
+    from agents.style_agent import fake_enabled
+
+    if fake_enabled():
+        return {"model": "fake"}
+    if not os.environ.get("GOOGLE_API_KEY"):
+        raise RuntimeError("GOOGLE_API_KEY is not set")
+    # configuration only: building the client is what a request would do; no
+    # model call, so probes never spend LLM quota
+    from agents.style_agent import llm
+
+    return {"model": getattr(llm, "model", None)}
+
+
+CHECKS: Dict[str, Callable[[], Dict]] = {
+    "database": check_database,
+    "cache": check_cache,
+    "broker": check_broker,
+    "agent": check_agent,
+}
+
+
+class ReadinessProbe:
+    """Runs CHECKS in parallel and reuses the result (see module docstring)."""
+
+    def __init__(self, checks: Dict[str, Callable[[], Dict]]):
+        self.checks = checks
+        self._executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="health")
+        self._lock = threading.Lock()
+        self._running: Dict[str, object] = {}
+        self._result = None
+        self._checked_at = 0.0
+
+    def _timed(self, fn):
+        start = time.perf_counter()
+        detail = fn()
+        return detail, (time.perf_counter() - start) * 1000
+
+    def _run(self) -> Dict:
+        timeout = settings.HEALTH_CHECK_TIMEOUT
+        started = time.perf_counter()
+        futures = {}
+        results = {}
+        for name, fn in self.checks.items():
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                results[name] = {"status": "error", "error": "timed out (previous check still running)"}
+                continue
+            futures[name] = self._running[name] = self._executor.submit(self._timed, fn)
+
+        deadline = started + timeout
+        for name, future in futures.items():
+            try:
+                detail, latency = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+                results[name] = {"status": "ok", "latency_ms": round(latency, 1), **detail}
+            except FutureTimeout:
+                results[name] = {"status": "error", "error": f"timed out after {timeout}s"}
+            except Exception as e:
+                results[name] = {"status": "error", "error": str(e)[:200]}
+
+        required = settings.HEALTH_REQUIRED_CHECKS
+        failed = [name for name, r in results.items() if r["status"] != "ok"]
+        status = "error" if any(name in required for name in failed) else ("degraded" if failed else "ok")
+        return {
+            "status": status,
+            "checks": {name: results[name] for name in self.checks},
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def result(self) -> Dict:
+        with self._lock:
+            age = time.monotonic() - self._checked_at
+            if self._result is None or age >= settings.HEALTH_CACHE_SECONDS:
+                self._result = self._run()
+                self._checked_at = time.monotonic()
+                age = 0.0
+            return {**self._result, "cached": age > 0, "age_s": round(age, 1)}
+
+
+_probe = ReadinessProbe(CHECKS)
+
+
+def _response(payload: Dict) -> JsonResponse:
+    return JsonResponse(payload, status=503 if payload["status"] == "error" else 200)
+
+
+@never_cache
+def liveness(request):
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+def readiness(request):
+    return _response(_probe.result())
+
+
+@never_cache
+def health_check(request):
+    payload = _probe.result()
+    return _response({
+        **payload,
+        "database": payload["checks"]["database"]["status"],
+        "environment": os.getenv("DJANGO_ENV", "development"),
+        "version": os.getenv("APP_VERSION", "1.0.0"),
+    })
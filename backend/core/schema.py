@@ -0,0 +1,180 @@
+"""
+core/schema.py
+
+Precomputed OpenAPI schema for /api/schema/.
+
+Generating the schema introspects every view and serializer, which takes
+seconds. `python manage.py build_openapi_schema` does it once per deploy and
+writes, into OPENAPI_SCHEMA_DIR:
+
+- openapi.yaml, openapi.json          rendered exactly as SpectacularAPIView
+                                      renders them
+- openapi.yaml.gz, openapi.json.gz    gzipped copies
+- manifest.json                       ETag (content hash) and sizes per format
+
+SchemaView keeps SpectacularAPIView's content negotiation, permissions and
+headers. It reads the artifacts once per process and then answers from memory:
+- If-None-Match with the current ETag gives 304
+- clients that accept gzip get the compressed bytes
+- ?lang= and ?version= requests still generate live, because the artifacts
+  only hold the default schema
+
+If the artifacts are missing, the first request builds them in memory and a
+warning is logged.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+MANIFEST = "manifest.json"
+
+
+class SchemaArtifact:
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, body: bytes, gzipped: bytes, etag: str):
+        self.body = body
+        self.gzipped = gzipped
+        self.etag = etag
+
+
+def render_schema() -> Dict[str, SchemaArtifact]:
+    """Generate the default (public, unversioned) schema in every format."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(urlconf=spectacular_settings.SERVE_URLCONF)
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    artifacts = {}
+    for fmt, renderer_class in FORMATS.items():
+        body = renderer_class().render(schema, renderer_context={})
+        # mtime=0: the same schema always compresses to the same bytes
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        artifacts[fmt] = SchemaArtifact(body, gzipped, hashlib.sha256(body).hexdigest()[:32])
+    return artifacts
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # replace, never truncate: running processes may be reading the old file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_schema(directory: Path, artifacts: Dict[str, SchemaArtifact]) -> Dict:
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {"generated_at": int(time.time()), "formats": {}}
+    for fmt, artifact in artifacts.items():
+        _write_atomic(directory / f"openapi.{fmt}", artifact.body)
+        _write_atomic(directory / f"openapi.{fmt}.gz", artifact.gzipped)
+        manifest["formats"][fmt] = {
+            "etag": artifact.etag,
+            "size": len(artifact.body),
+            "gzip_size": len(artifact.gzipped),
+        }
+    # last, so a reader never sees a manifest pointing at files not yet written
+    _write_atomic(directory / MANIFEST, json.dumps(manifest, indent=2).encode() + b"\n")
+    return manifest
+
+
+def read_schema(directory: Path) -> Optional[Dict[str, SchemaArtifact]]:
+    try:
+        manifest = json.loads((directory / MANIFEST).read_bytes())
+        return {
+            fmt: SchemaArtifact(
+                (directory / f"openapi.{fmt}").read_bytes(),
+                (directory / f"openapi.{fmt}.gz").read_bytes(),
+                meta["etag"],
+            )
+            for fmt, meta in manifest["formats"].items()
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+_artifacts: Optional[Dict[str, SchemaArtifact]] = None
+_artifacts_lock = threading.Lock()
+
+
+def get_schema_artifacts() -> Dict[str, SchemaArtifact]:
+    global _artifacts
+    if _artifacts is None:
+        with _artifacts_lock:
+            if _artifacts is None:
+                artifacts = read_schema(Path(settings.OPENAPI_SCHEMA_DIR))
+                if artifacts is None:
+                    logger.warning(
+                        "No precomputed OpenAPI schema; generating it in this process. "
+                        "Run `manage.py build_openapi_schema` on deploy.",
+                        extra={"directory": str(settings.OPENAPI_SCHEMA_DIR)},
+                    )
+                    artifacts = render_schema()
+                _artifacts = artifacts
+    return _artifacts
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # either representation's tag (plain or -gzip, strong or weak) names this version
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').removesuffix("-gzip") == etag:
+            return True
+    return False
+
+
+class SchemaView(SpectacularAPIView):
+    """SpectacularAPIView answered from the precomputed artifacts (see module docstring)."""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("lang") or request.GET.get("version"):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        artifact = get_schema_artifacts()[renderer.format]
+        use_gzip = bool(re_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+        etag = f'"{artifact.etag}-gzip"' if use_gzip else f'"{artifact.etag}"'
+
+        if _etag_matches(request.META.get("HTTP_IF_NONE_MATCH", ""), artifact.etag):
+            response = HttpResponseNotModified()
+        else:
+            content_type = request.accepted_media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(artifact.gzipped if use_gzip else artifact.body, content_type=content_type)
+            if use_gzip:
+                response["Content-Encoding"] = "gzip"
+            filename = f"{spectacular_settings.TITLE or 'schema'}.{renderer.format}"
+            response["Content-Disposition"] = f'inline; filename="{filename}"'
+        response["ETag"] = etag
+        # cache, but revalidate: a deploy changes the schema under the same URL
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
@@ -34,9 +34,13 @@ INSTALLED_APPS = [
     'client',
     'stylist',
     'recommendations',
+    'appointments',
+    'payments',
 ]
 
 MIDDLEWARE = [
+    'common.middleware.RequestIdMiddleware',  # first, so every log line of the request carries the id
+    'common.middleware.ServerTimingMiddleware',  # DB/cache/LLM/serialize breakdown (common/timing.py)
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -67,7 +71,39 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
-# Database is defined in child files (dev/prod)
+# D A T A B A S E
+# Engine and credentials are defined in child files (dev/prod), which merge
+# POSTGRES_CONNECTION into their entry so a request reuses a connection instead
+# of paying for TCP + auth every time:
+# - psycopg 3 with psycopg_pool installed: Django's native pool, one per process
+#   (size it per worker: gunicorn threads, Celery concurrency)
+# - psycopg2 only: persistent connections, kept DB_CONN_MAX_AGE seconds per thread
+# Either way a connection is health-checked before it is handed out.
+# Metrics: common.db.connection_stats(); benchmark: `python manage.py bench_db_connections`
+try:
+    import psycopg_pool  # noqa: F401
+    DB_POOL = os.environ.get("DB_POOL", "True") == "True"
+except ImportError:
+    DB_POOL = False
+if DB_POOL:
+    POSTGRES_CONNECTION = {
+        "CONN_MAX_AGE": 0,  # the pool owns connection lifetime
+        "CONN_HEALTH_CHECKS": True,  # ConnectionPool.check_connection on checkout
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+                "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "5")),  # seconds to wait for a free connection
+                "max_idle": 300,
+                "max_lifetime": 1800,
+            },
+        },
+    }
+else:
+    POSTGRES_CONNECTION = {
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+    }
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -76,6 +112,28 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# P A S S W O R D   H A S H I N G
+# Argon2id (memory-hard, cheaper CPU per login than PBKDF2) when argon2-cffi is
+# installed; PBKDF2 hashes stay valid and are upgraded on the next login.
+try:
+    import argon2  # noqa: F401
+    PASSWORD_HASHERS = ['common.hashers.TunedArgon2PasswordHasher']
+except ImportError:
+    PASSWORD_HASHERS = []
+PASSWORD_HASHERS += [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Pick values with `python manage.py bench_password_hashing`
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get("PASSWORD_ARGON2_TIME_COST", "2"))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get("PASSWORD_ARGON2_MEMORY_COST", "19456"))  # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get("PASSWORD_ARGON2_PARALLELISM", "1"))
+# Login hashing pool per process (common/passwords.py)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get("PASSWORD_HASH_QUEUE_SIZE", "8"))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get("PASSWORD_HASH_QUEUE_TIMEOUT", "2"))
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -99,11 +157,141 @@ SIMPLE_JWT = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'common.authentication.ClaimsJWTAuthentication',  # no User query per request
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson when installed, stdlib json otherwise (common/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'common.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
+# C A C H E S
+# Shared cache: Redis when CACHE_REDIS_URL is set (use a different db than
+# Celery), else per-process memory. common/cache.py puts a bounded in-process
+# LRU in front of it for the versioned read paths.
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": "sg",
+            # fail fast; common/cache.py falls back to the database on errors
+            "OPTIONS": {"socket_connect_timeout": 0.5, "socket_timeout": 0.5},
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "stylegenie",
+        },
+    }
+CACHE_LOCAL_MAX_ENTRIES = int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", "2000"))  # per process
+CACHE_LOCAL_TIMEOUT = int(os.environ.get("CACHE_LOCAL_TIMEOUT", "60"))  # max seconds in the LRU
+CACHE_NEGATIVE_TIMEOUT = int(os.environ.get("CACHE_NEGATIVE_TIMEOUT", "30"))  # "not found" results
+
+# P R O F I L E   S N A P S H O T S
+# Seconds a serialized /me profile may live in the cache (writes invalidate sooner)
+PROFILE_SNAPSHOT_CACHE_TIMEOUT = int(os.environ.get("PROFILE_SNAPSHOT_CACHE_TIMEOUT", "600"))
+
+# R E C O M M E N D A T I O N   Q U O T A S
+# Throttle state (common/throttling.py); unset → per-process in-memory buckets
+THROTTLE_REDIS_URL = os.environ.get("THROTTLE_REDIS_URL")
+# Requests per user, by plan (= user role for now); None → unthrottled
+RECOMMEND_RATES = {
+    "client": os.environ.get("RECOMMEND_RATE_CLIENT", "5/min"),
+    "stylist": os.environ.get("RECOMMEND_RATE_STYLIST", "10/min"),
+    "admin": None,
+}
+# LLM tokens per user per UTC day, by plan; None → unlimited
+RECOMMEND_DAILY_TOKEN_BUDGETS = {
+    "client": int(os.environ.get("RECOMMEND_DAILY_TOKENS_CLIENT", "200000")),
+    "stylist": int(os.environ.get("RECOMMEND_DAILY_TOKENS_STYLIST", "400000")),
+    "admin": None,
+}
+# Seconds an identical recommendation request is answered from cache (no LLM call, no tokens charged)
+RECOMMEND_CACHE_TIMEOUT = int(os.environ.get("RECOMMEND_CACHE_TIMEOUT", "3600"))
+# Charged when the model reports no usage metadata
+RECOMMEND_ESTIMATED_TOKENS = int(os.environ.get("RECOMMEND_ESTIMATED_TOKENS", "4000"))
+
+# S T Y L I S T   D I R E C T O R Y
+# Bayesian-average ranking prior (see stylist/ranking.py)
+STYLIST_RANKING_PRIOR_MEAN = float(os.environ.get("STYLIST_RANKING_PRIOR_MEAN", "3.5"))
+STYLIST_RANKING_PRIOR_WEIGHT = int(os.environ.get("STYLIST_RANKING_PRIOR_WEIGHT", "10"))
+# Seconds a pre-serialized directory page/entry may live (writes invalidate sooner)
+STYLIST_DIRECTORY_CACHE_TIMEOUT = int(os.environ.get("STYLIST_DIRECTORY_CACHE_TIMEOUT", "300"))
+# Max seconds the in-process matching matrix may lag behind profile edits
+MATCH_REFRESH_INTERVAL = float(os.environ.get("MATCH_REFRESH_INTERVAL", "5"))
+
+# W A R D R O B E   S Y N C
+# Seconds the sync feed re-scans behind a finished round's cursor; must cover
+# the longest write transaction (client/services/sync.py). The stylist match
+# matrix re-reads the same window behind its watermark (client/services/matching.py)
+SYNC_CURSOR_OVERLAP_SECONDS = float(os.environ.get("SYNC_CURSOR_OVERLAP_SECONDS", "60"))
+
+# H E A L T H   P R O B E S
+# Readiness checks (core/health.py): per-check timeout, seconds a result is
+# reused across probes, and which failures make the instance unready (503)
+HEALTH_CHECK_TIMEOUT = float(os.environ.get("HEALTH_CHECK_TIMEOUT", "1.0"))
+HEALTH_CACHE_SECONDS = float(os.environ.get("HEALTH_CACHE_SECONDS", "5"))
+HEALTH_REQUIRED_CHECKS = [
+    c.strip() for c in os.environ.get("HEALTH_REQUIRED_CHECKS", "database,cache").split(",") if c.strip()
+]  # names from core.health.CHECKS; unknown ones fail `manage.py check`
+
+# R E Q U E S T   T I M I N G
+# Share of requests (0-1) that get the DB/cache/LLM/serialize breakdown; every
+# request still counts toward the per-view totals
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get("REQUEST_TIMING_SAMPLE_RATE", "1.0"))
+# Send the breakdown to clients as a Server-Timing header. Off by default: it
+# tells anyone (anonymous users included) how many queries and how much DB/LLM
+# time a request took. Turn it on locally or on internal deployments.
+REQUEST_TIMING_HEADER = os.environ.get("REQUEST_TIMING_HEADER", "False") == "True"
+# Seconds between per-view histogram log lines (per process); 0 disables them
+REQUEST_TIMING_REPORT_INTERVAL = float(os.environ.get("REQUEST_TIMING_REPORT_INTERVAL", "60"))
+
+# O P E N A P I   S C H E M A
+# Where `manage.py build_openapi_schema` writes the pre-rendered, gzipped schema
+# that /api/schema/ serves (core/schema.py); built on deploy
+OPENAPI_SCHEMA_DIR = Path(os.environ.get("OPENAPI_SCHEMA_DIR", BASE_DIR / "openapi"))
+
+# L O G G I N G
+# JSON lines on stdout, written by a background thread (common/log.py)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "common.log.RequestIdFilter"},
+    },
+    "handlers": {
+        "queue": {
+            "()": "common.log.QueuedStreamHandler",
+            "fmt": os.environ.get("LOG_FORMAT", "json"),  # or "text" for local reading
+            "filters": ["request_id"],
+        },
+    },
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
+    "loggers": {
+        "django": {"handlers": ["queue"], "level": LOG_LEVEL, "propagate": False},
+    },
+}
+
+# E M A I L
+# Console by default; prod.py switches to SMTP, test.py to locmem
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "StyleGenie <no-reply@stylegenie.app>")
+EMAIL_TIMEOUT = int(os.environ.get("EMAIL_TIMEOUT", "10"))
+# Seconds a worker's SMTP connection may sit idle before it is reopened (common/mail.py)
+MAIL_CONNECTION_MAX_IDLE = int(os.environ.get("MAIL_CONNECTION_MAX_IDLE", "60"))
+
 # C E L E R Y    S E T T I N G S
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
@@ -113,6 +301,21 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+CELERY_BEAT_SCHEDULE = {
+    "stylist-reconcile-ratings": {
+        "task": "stylist.reconcile_ratings",
+        "schedule": timedelta(hours=6),
+    },
+    "payments-rollup-earnings": {
+        "task": "payments.rollup_earnings",
+        "schedule": timedelta(minutes=5),
+    },
+    "common-prune-expired-tokens": {
+        "task": "common.prune_expired_tokens",
+        "schedule": timedelta(hours=1),
+    },
+}
+
 
 # C O R S   &   C S R F   S E T T I N G S
 
@@ -127,6 +330,8 @@ CORS_ALLOWED_ORIGINS = os.environ.get("CORS_ALLOWED_ORIGINS", "").split(",")
 # CORS SETTINGS
 CORS_ALLOW_ALL_ORIGINS = os.environ.get("CORS_ALLOW_ALL_ORIGINS", "False").lower() == "true"
 CORS_ALLOW_CREDENTIALS = os.environ.get("CORS_ALLOW_CREDENTIALS", "False").lower() == "true"
+# Let the frontend read the correlation id, and the timings when they are sent (common/middleware.py)
+CORS_EXPOSE_HEADERS = ["X-Request-ID"] + (["Server-Timing"] if REQUEST_TIMING_HEADER else [])
 
 
 
@@ -15,5 +15,6 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASS'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        **POSTGRES_CONNECTION,
     }
 }
\ No newline at end of file
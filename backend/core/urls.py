@@ -1,8 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
-from .health import health_check
+from .health import health_check, liveness, readiness
+from .schema import SchemaView
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularSwaggerView,
     SpectacularRedocView,
 )
@@ -10,14 +10,19 @@ from drf_spectacular.views import (
 urlpatterns = [
     path('admin/', admin.site.urls), 
     path('health/', health_check, name='health-check'),
+    path('health/live/', liveness, name='health-live'),
+    path('health/ready/', readiness, name='health-ready'),
     
     path('client/', include('client.urls')),     
     path('stylist/', include('stylist.urls')),   
     
     path('client/', include('recommendations.urls')),   
     
+    path('', include('appointments.urls')),
+    path('stylist/', include('payments.urls')),
+    
     # OpenAPI schema
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", SchemaView.as_view(), name="schema"),
     
     # Swagger UI
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
@@ -1,3 +1,26 @@
 from django.contrib import admin
 
-# Register your models here.
+from payments.models import EarningsDaily, EarningsMonthly, LedgerEntry
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "stylist", "kind", "amount", "currency", "reference", "created_at")
+    list_filter = ("kind",)
+    search_fields = ("reference",)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(EarningsDaily)
+class EarningsDailyAdmin(admin.ModelAdmin):
+    list_display = ("stylist", "day", "total", "entry_count")
+
+
+@admin.register(EarningsMonthly)
+class EarningsMonthlyAdmin(admin.ModelAdmin):
+    list_display = ("stylist", "month", "total", "entry_count")
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:05
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('appointments', '0002_booking_constraints'),
+        ('stylist', '0005_profile_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EarningsRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EarningsDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('stylist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earnings_daily', to='stylist.stylistprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('stylist', 'day'), name='uniq_earnings_daily')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EarningsMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('stylist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earnings_monthly', to='stylist.stylistprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('stylist', 'month'), name='uniq_earnings_monthly')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('charge', 'Charge'), ('refund', 'Refund'), ('adjustment', 'Adjustment')], default='charge', max_length=16)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('currency', models.CharField(default='USD', max_length=3)),
+                ('reference', models.CharField(help_text='Idempotency key from the payment provider', max_length=128, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('appointment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='appointments.appointment')),
+                ('stylist', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='stylist.stylistprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stylist', 'created_at'], name='ledger_stylist_created_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,89 @@
+from decimal import Decimal
+
 from django.db import models
 
-# Create your models here.
+from stylist.models import StylistProfile
+
+# The rollups and StylistProfile.earnings_total hold plain sums, so the ledger
+# is single-currency; anything else is rejected when written.
+LEDGER_CURRENCY = "USD"
+
+
+class LedgerEntry(models.Model):
+    """
+    Append-only record of money owed to a stylist.
+
+    Amounts are signed (refunds/chargebacks are negative). Rows are never
+    updated or deleted; StylistProfile.earnings_total and the Earnings* tables
+    are derived from them by the rollup job (payments/services.py).
+    """
+    class Kind(models.TextChoices):
+        CHARGE = "charge", "Charge"
+        REFUND = "refund", "Refund"
+        ADJUSTMENT = "adjustment", "Adjustment"
+
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.PROTECT, related_name="ledger_entries")
+    kind = models.CharField(max_length=16, choices=Kind.choices, default=Kind.CHARGE)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    currency = models.CharField(max_length=3, default=LEDGER_CURRENCY)
+    reference = models.CharField(max_length=128, unique=True, help_text="Idempotency key from the payment provider")
+    appointment = models.ForeignKey(
+        "appointments.Appointment", on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_entries",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["stylist", "created_at"], name="ledger_stylist_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"LedgerEntry<{self.stylist_id} {self.amount} {self.kind}>"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ledger entries are append-only.")
+        if self.currency != LEDGER_CURRENCY:
+            raise ValueError(f"Ledger entries must be in {LEDGER_CURRENCY}, got {self.currency!r}.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Ledger entries are append-only.")
+
+
+class EarningsDaily(models.Model):
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.CASCADE, related_name="earnings_daily")
+    day = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+    entry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["stylist", "day"], name="uniq_earnings_daily"),
+        ]
+
+    def __str__(self):
+        return f"EarningsDaily<{self.stylist_id} {self.day}: {self.total}>"
+
+
+class EarningsMonthly(models.Model):
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.CASCADE, related_name="earnings_monthly")
+    month = models.DateField(help_text="First day of the month")
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+    entry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["stylist", "month"], name="uniq_earnings_monthly"),
+        ]
+
+    def __str__(self):
+        return f"EarningsMonthly<{self.stylist_id} {self.month:%Y-%m}: {self.total}>"
+
+
+class EarningsRollupState(models.Model):
+    """Single row remembering how far the rollup job has processed the ledger."""
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"EarningsRollupState<{self.last_run_at}>"
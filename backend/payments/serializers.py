@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+from payments.models import EarningsDaily, EarningsMonthly
+
+
+class EarningsDailySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EarningsDaily
+        fields = ["day", "total", "entry_count"]
+        read_only_fields = fields
+
+
+class EarningsMonthlySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EarningsMonthly
+        fields = ["month", "total", "entry_count"]
+        read_only_fields = fields
+
+
+class EarningsQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=["daily", "monthly"], default="daily")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+
+class EarningsReportSerializer(serializers.Serializer):
+    period = serializers.CharField()
+    earnings_total = serializers.DecimalField(max_digits=12, decimal_places=2)
+    results = serializers.ListField(child=serializers.DictField())
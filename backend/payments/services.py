@@ -0,0 +1,139 @@
+"""
+payments/services.py
+
+Earnings ledger writes and rollups.
+
+Writes only INSERT into LedgerEntry: no StylistProfile row is locked or
+updated per payment, so concurrent payments for one stylist never contend.
+The periodic rollup (payments/tasks.py) re-aggregates the recently touched
+days into EarningsDaily, folds those into EarningsMonthly, and refreshes
+StylistProfile.earnings_total for the affected stylists only.
+
+Each run recomputes whole days from the ledger (an idempotent upsert), starting
+ROLLUP_OVERLAP before the previous run, so entries committed late are picked
+up by the next run instead of being lost.
+
+Totals are plain sums, so only LEDGER_CURRENCY entries are written (the model
+rejects others) and only those are rolled up.
+"""
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.utils import timezone
+
+from accounts.services import invalidate_profile_snapshots
+from payments.models import LEDGER_CURRENCY, EarningsDaily, EarningsMonthly, EarningsRollupState, LedgerEntry
+from stylist.models import StylistProfile
+
+ROLLUP_OVERLAP = timedelta(minutes=10)
+_ZERO = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def record_entry(
+    *,
+    stylist: StylistProfile,
+    amount: Decimal,
+    reference: str,
+    kind: str = LedgerEntry.Kind.CHARGE,
+    currency: str = LEDGER_CURRENCY,
+    appointment=None,
+) -> LedgerEntry:
+    """
+    Append one ledger row; replaying the same `reference` returns the original row.
+    Raises ValueError for a currency other than LEDGER_CURRENCY.
+    """
+    entry, _ = LedgerEntry.objects.get_or_create(
+        reference=reference,
+        defaults={
+            "stylist": stylist,
+            "amount": amount,
+            "kind": kind,
+            "currency": currency,
+            "appointment": appointment,
+        },
+    )
+    return entry
+
+
+def _upsert(model, rows, unique_fields):
+    model.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=["total", "entry_count"],
+    )
+
+
+def rollup_earnings() -> Dict[str, int]:
+    """Refresh daily/monthly aggregates and earnings_total from the ledger."""
+    with transaction.atomic():
+        state, _ = EarningsRollupState.objects.select_for_update().get_or_create(pk=1)
+        started = timezone.now()
+
+        if state.last_run_at is None:
+            since = LedgerEntry.objects.order_by("created_at").values_list("created_at", flat=True).first()
+        else:
+            since = state.last_run_at - ROLLUP_OVERLAP
+        if since is None:
+            state.last_run_at = started
+            state.save(update_fields=["last_run_at"])
+            return {"days": 0, "months": 0, "stylists": 0}
+
+        since_day = timezone.localdate(since)
+        day_start = timezone.make_aware(datetime.combine(since_day, time.min))
+
+        # 1) whole days touched since the last run, straight from the ledger
+        daily = (
+            LedgerEntry.objects.filter(created_at__gte=day_start, currency=LEDGER_CURRENCY)
+            .annotate(day=TruncDate("created_at"))
+            .values("stylist", "day")
+            .annotate(total=Sum("amount"), n=Count("id"))
+            .order_by()
+        )
+        daily_rows = [
+            EarningsDaily(stylist_id=r["stylist"], day=r["day"], total=r["total"], entry_count=r["n"])
+            for r in daily
+        ]
+        _upsert(EarningsDaily, daily_rows, ["stylist", "day"])
+        touched = {r.stylist_id for r in daily_rows}
+        if not touched:
+            state.last_run_at = started
+            state.save(update_fields=["last_run_at"])
+            return {"days": 0, "months": 0, "stylists": 0}
+
+        # 2) months containing those days, from the (small) daily table
+        monthly = (
+            EarningsDaily.objects.filter(stylist__in=touched, day__gte=since_day.replace(day=1))
+            .annotate(month=TruncMonth("day"))
+            .values("stylist", "month")
+            .annotate(total=Sum("total"), n=Sum("entry_count"))
+            .order_by()
+        )
+        monthly_rows = [
+            EarningsMonthly(stylist_id=r["stylist"], month=r["month"], total=r["total"], entry_count=r["n"])
+            for r in monthly
+        ]
+        _upsert(EarningsMonthly, monthly_rows, ["stylist", "month"])
+
+        # 3) lifetime totals for the affected stylists only
+        lifetime = (
+            EarningsMonthly.objects.filter(stylist=OuterRef("pk"))
+            .values("stylist")
+            .annotate(s=Sum("total"))
+            .values("s")
+        )
+        StylistProfile.objects.filter(pk__in=touched).update(
+            earnings_total=Coalesce(Subquery(lifetime), _ZERO),
+        )
+        # earnings_total is part of /stylist/me/
+        transaction.on_commit(lambda: invalidate_profile_snapshots(touched))
+
+        state.last_run_at = started
+        state.save(update_fields=["last_run_at"])
+        return {"days": len(daily_rows), "months": len(monthly_rows), "stylists": len(touched)}
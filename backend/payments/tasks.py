@@ -0,0 +1,15 @@
+"""
+payments/tasks.py
+
+Periodic earnings rollup (scheduled in CELERY_BEAT_SCHEDULE).
+"""
+
+from celery import shared_task
+
+from payments.services import rollup_earnings
+
+
+@shared_task(name="payments.rollup_earnings")
+def rollup_earnings_task():
+    """Refresh EarningsDaily/EarningsMonthly and StylistProfile.earnings_total from the ledger."""
+    return rollup_earnings()
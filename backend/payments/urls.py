@@ -0,0 +1,8 @@
+# payments/urls.py
+from django.urls import path
+
+from payments.views import StylistEarningsView
+
+urlpatterns = [
+    path("earnings/", StylistEarningsView.as_view(), name="stylist-earnings"),
+]
@@ -1,3 +1,56 @@
-from django.shortcuts import render
+from datetime import timedelta
 
-# Create your views here.
+from django.utils import timezone
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.permissions import IsStylist
+from payments.models import EarningsDaily, EarningsMonthly
+from payments.serializers import (
+    EarningsDailySerializer,
+    EarningsMonthlySerializer,
+    EarningsQuerySerializer,
+    EarningsReportSerializer,
+)
+from stylist.models import StylistProfile
+
+
+class StylistEarningsView(APIView):
+    """
+    GET /stylist/earnings/?period=daily|monthly&start=YYYY-MM-DD&end=YYYY-MM-DD
+
+    Reads the rollup tables only (refreshed by the payments.rollup_earnings job).
+    Defaults: last 30 days (daily) or last 12 months (monthly).
+    """
+    permission_classes = [IsAuthenticated, IsStylist]
+
+    def get(self, request):
+        params = EarningsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        period = params.validated_data["period"]
+        end = params.validated_data.get("end") or timezone.localdate()
+
+        if period == "monthly":
+            start = params.validated_data.get("start") or (end - timedelta(days=365)).replace(day=1)
+            rows = EarningsMonthly.objects.filter(
+                stylist_id=request.user.pk, month__gte=start, month__lte=end,
+            ).order_by("month")
+            data = EarningsMonthlySerializer(rows, many=True).data
+        else:
+            start = params.validated_data.get("start") or end - timedelta(days=30)
+            rows = EarningsDaily.objects.filter(
+                stylist_id=request.user.pk, day__gte=start, day__lte=end,
+            ).order_by("day")
+            data = EarningsDailySerializer(rows, many=True).data
+
+        earnings_total = (
+            StylistProfile.objects.filter(pk=request.user.pk)
+            .values_list("earnings_total", flat=True)
+            .first()
+        )
+        return Response(EarningsReportSerializer({
+            "period": period,
+            "earnings_total": earnings_total or 0,
+            "results": data,
+        }).data)
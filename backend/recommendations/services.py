@@ -1,10 +1,14 @@
+import hashlib
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 
-from django.shortcuts import get_object_or_404
+from django.conf import settings
 
 from accounts.models import User
-from client.models import ClientProfile
+from accounts.services import get_profile_snapshot
+from client.services.stats import wardrobe_generation
+from common.cache import cached, get_or_build
+from common.timing import timed
 
 from agents.style_agent import get_outfit_recommendations, StylistRequestPayload, AIRecommendations
 
@@ -29,14 +33,20 @@ def _map_skin_tone(v: Optional[str]) -> Optional[str]:
     return mapping.get(v.lower(), v)
 
 
-def _validate_profile(profile: ClientProfile) -> List[str]:
-    """Return a list of missing required fields on the profile."""
-    return [f for f in REQUIRED_PROFILE_FIELDS if not getattr(profile, f, None)]
+def _validate_profile(profile: Dict[str, Any]) -> List[str]:
+    """Return a list of missing required fields on the profile snapshot."""
+    return [f for f in REQUIRED_PROFILE_FIELDS if not profile.get(f)]
 
 
-def _fetch_drawer_products_from_db(user: User) -> List[Dict[str, Any]]:
+@cached(
+    lambda user_id: f"wardrobe:drawer:{user_id}",
+    lambda: settings.RECOMMEND_CACHE_TIMEOUT,
+    versions=lambda user_id: [wardrobe_generation(user_id)],
+)
+def _fetch_drawer_products_from_db(user_id) -> List[Dict[str, Any]]:
     """
     Query the user's wardrobe and map to what the AI expects.
+    Cached until the wardrobe changes (client/signals.py).
     """
     try:
         from client.models import WardrobeItem
@@ -44,7 +54,7 @@ def _fetch_drawer_products_from_db(user: User) -> List[Dict[str, Any]]:
         return []
 
     qs = (
-        WardrobeItem.objects.filter(user=user)
+        WardrobeItem.objects.filter(user_id=user_id)
         .only("id", "title", "color", "category", "description")
         .order_by("-id")[:20]
     )
@@ -61,6 +71,11 @@ def _fetch_drawer_products_from_db(user: User) -> List[Dict[str, Any]]:
     return out
 
 
+def _payload_digest(payload: StylistRequestPayload) -> str:
+    # the payload embeds the profile fields and drawer, so edits change the key
+    return hashlib.sha1(payload.model_dump_json().encode()).hexdigest()
+
+
 def recommend(
     *,
     user_id: int,
@@ -68,13 +83,16 @@ def recommend(
     occasion: str,
     dt_iso: str,
     drawer_products_override: Optional[List[Dict[str, Any]]] = None,
+    usage: Optional[Dict[str, int]] = None,
 ) -> Dict[str, Any]:
     """
     Build payload from stored profile (+ optional drawer override), call local stylist agent,
-    and return structured AIRecommendations.
+    and return structured AIRecommendations. If `usage` is given, it gets
+    "llm_called" as soon as the model is invoked (set even when the call then
+    fails) and the LLM token counts the model reports.
     """
-    user = get_object_or_404(User, pk=user_id)
-    profile = get_object_or_404(ClientProfile, user=user)
+    # cached serialized ClientProfile (404 if the user has none)
+    profile = get_profile_snapshot(user_id, User.Role.CLIENT)
 
     # 1) Validate required profile data
     missing = _validate_profile(profile)
@@ -82,7 +100,7 @@ def recommend(
         raise ValueError(f"Missing required profile fields: {', '.join(missing)}")
 
     # 2) Get drawer products: prefer client override; else load from DB
-    drawer_products = (drawer_products_override or []) or _fetch_drawer_products_from_db(user)
+    drawer_products = (drawer_products_override or []) or _fetch_drawer_products_from_db(user_id)
     if not drawer_products:
         raise ValueError("You have no wardrobe items yet. Please add at least one item.")
 
@@ -99,11 +117,11 @@ def recommend(
     # 3) Build payload for your agent
     payload: StylistRequestPayload = StylistRequestPayload(
         user_info={
-            "gender": profile.gender,
-            "skin_tone": _map_skin_tone(profile.skin_tone),
-            "color_preferences": (getattr(profile, "style_preferences", {}) or {}).get("colors", []),
-            "face_shape": profile.face_shape,
-            "body_shape": profile.body_shape,
+            "gender": profile["gender"],
+            "skin_tone": _map_skin_tone(profile["skin_tone"]),
+            "color_preferences": (profile.get("style_preferences") or {}).get("colors", []),
+            "face_shape": profile["face_shape"],
+            "body_shape": profile["body_shape"],
         },
         drawer_products=drawer_products,
         location=destination,
@@ -111,8 +129,17 @@ def recommend(
         datetime=dt_value,
     )
 
-    # 4) Call your local LangChain agent
-    structured_result: AIRecommendations = get_outfit_recommendations(payload)
-
-    # 5) Return the structured dict (instead of hitting API)
-    return structured_result.model_dump()
+    # 4) Call your local LangChain agent, unless this exact payload was answered recently
+    def ask_agent() -> Dict[str, Any]:
+        if usage is not None:
+            usage["llm_called"] = True
+        with timed("llm"):
+            structured_result: AIRecommendations = get_outfit_recommendations(payload, usage=usage)
+        # 5) Return the structured dict (instead of hitting API)
+        return structured_result.model_dump()
+
+    return get_or_build(
+        f"recommend:{user_id}:{_payload_digest(payload)}",
+        ask_agent,
+        settings.RECOMMEND_CACHE_TIMEOUT,
+    )
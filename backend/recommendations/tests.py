@@ -1,3 +1,114 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from agents.stylist_types import AIRecommendations
+from client.models import ClientProfile, WardrobeItem
+from common.throttling import get_usage
+from recommendations.throttling import RecommendTokenBudgetThrottle
+
+User = get_user_model()
+
+URL = "/client/recommendations/"
+PAYLOAD = {"destination": "Dhaka", "occasion": "wedding", "datetime": "2026-11-20T18:00:00+06:00"}
+UNTHROTTLED = {"client": None, "stylist": None, "admin": None}
+UNLIMITED = {"client": None, "stylist": None, "admin": None}
+
+
+def fake_agent(tokens=1200):
+    """Stand-in for get_outfit_recommendations that reports `tokens` of usage."""
+    def answer(payload, usage=None, **kwargs):
+        if usage is not None:
+            usage["total_tokens"] = usage.get("total_tokens", 0) + tokens
+        ids = [p.id for p in payload.drawer_products]
+        return AIRecommendations.model_validate({
+            "recommendations": [{"name": "Look", "description": "Works.", "product_ids": ids}],
+        })
+    return mock.patch("recommendations.services.get_outfit_recommendations", side_effect=answer)
+
+
+@override_settings(RECOMMEND_RATES=UNTHROTTLED, RECOMMEND_DAILY_TOKEN_BUDGETS=UNLIMITED)
+class RecommendationTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@example.com", username="client", password="pw-12345!")
+        ClientProfile.objects.filter(user=self.user).update(
+            gender=ClientProfile.Gender.FEMALE,
+            skin_tone=ClientProfile.SkinTone.MEDIUM,
+            face_shape=ClientProfile.FaceShape.OVAL,
+            body_shape=ClientProfile.BodyShape.HOURGLASS,
+        )
+        WardrobeItem.objects.create(
+            user=self.user, image_url="https://cdn.example.com/a.jpg", title="Silk saree",
+            color=WardrobeItem.Color.values[0], category=WardrobeItem.Category.values[0],
+        )
+        self.client.force_authenticate(self.user)
+
+    def recommend(self, **overrides):
+        return self.client.post(URL, {**PAYLOAD, **overrides}, format="json")
+
+    def tokens_used(self):
+        request = mock.Mock(user=self.user)
+        return get_usage(RecommendTokenBudgetThrottle._key(request))
+
+
+class RecommendThrottleTests(RecommendationTestCase):
+
+    @override_settings(RECOMMEND_RATES={**UNTHROTTLED, "client": "2/min"})
+    def test_empty_bucket_returns_429_with_retry_after(self):
+        with fake_agent():
+            self.assertEqual(self.recommend(occasion="a").status_code, 200)
+            self.assertEqual(self.recommend(occasion="b").status_code, 200)
+            response = self.recommend(occasion="c")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    @override_settings(RECOMMEND_DAILY_TOKEN_BUDGETS={**UNLIMITED, "client": 2000})
+    def test_exhausted_budget_returns_429(self):
+        with fake_agent(tokens=1500) as agent:
+            self.assertEqual(self.recommend(occasion="a").status_code, 200)
+            self.assertEqual(self.recommend(occasion="b").status_code, 200)  # 1500 < 2000: allowed
+            response = self.recommend(occasion="c")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(agent.call_count, 2)
+        self.assertEqual(self.tokens_used(), 3000)
+
+    def test_cached_answer_is_not_charged(self):
+        with fake_agent(tokens=700) as agent:
+            first = self.recommend()
+            second = self.recommend()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(agent.call_count, 1)
+        self.assertEqual(self.tokens_used(), 700)
+
+    def test_wardrobe_change_asks_the_model_again(self):
+        with fake_agent(tokens=700) as agent:
+            self.recommend()
+            with self.captureOnCommitCallbacks(execute=True):  # bumps the wardrobe generation
+                WardrobeItem.objects.create(
+                    user=self.user, image_url="https://cdn.example.com/b.jpg", title="Gold clutch",
+                    color=WardrobeItem.Color.values[0], category=WardrobeItem.Category.values[0],
+                )
+            second = self.recommend()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(agent.call_count, 2)
+        self.assertEqual(self.tokens_used(), 1400)
+
+    @override_settings(RECOMMEND_ESTIMATED_TOKENS=4000)
+    def test_failed_model_call_is_charged(self):
+        with mock.patch("recommendations.services.get_outfit_recommendations", side_effect=ValueError("bad output")):
+            response = self.recommend()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.tokens_used(), 4000)
+
+    def test_rejected_before_model_call_is_free(self):
+        WardrobeItem.objects.filter(user=self.user).delete()
+        with fake_agent() as agent:
+            response = self.recommend()
+        self.assertEqual(response.status_code, 400)
+        agent.assert_not_called()
+        self.assertEqual(self.tokens_used(), 0)
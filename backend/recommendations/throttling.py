@@ -0,0 +1,37 @@
+"""
+recommendations/throttling.py
+
+Quotas for the recommendation endpoint: a per-user request rate and a daily
+LLM token budget, both chosen by plan (see common/throttling.py).
+"""
+
+from django.conf import settings
+
+from common.throttling import DailyBudgetThrottle, PlanTokenBucketThrottle
+
+
+class RecommendRateThrottle(PlanTokenBucketThrottle):
+    scope = "recommend"
+
+    def get_rates(self):
+        return settings.RECOMMEND_RATES
+
+
+class RecommendTokenBudgetThrottle(DailyBudgetThrottle):
+    scope = "recommend-tokens"
+
+    def get_budgets(self):
+        return settings.RECOMMEND_DAILY_TOKEN_BUDGETS
+
+
+def record_token_usage(request, usage: dict) -> int:
+    """
+    Charge a recommendation against the caller's daily budget if the model was
+    called, whether or not the call succeeded. Cached answers and requests
+    rejected before the call are free.
+    """
+    if not usage.get("llm_called"):
+        return 0
+    # failed calls report no usage: charge the estimate
+    tokens = usage.get("total_tokens") or settings.RECOMMEND_ESTIMATED_TOKENS
+    return RecommendTokenBudgetThrottle.record(request, tokens)
@@ -7,6 +7,7 @@ from .serializers import (
     RecommendResponseSerializer,
 )
 from .services import recommend
+from .throttling import RecommendRateThrottle, RecommendTokenBudgetThrottle, record_token_usage
 
 
 class RecommendView(APIView):
@@ -17,12 +18,15 @@ class RecommendView(APIView):
     - Uses request.user.id automatically
     """
     permission_classes = [permissions.IsAuthenticated]
+    # cheapest check first: the bucket rejects floods before the budget lookup
+    throttle_classes = [RecommendRateThrottle, RecommendTokenBudgetThrottle]
 
     def post(self, request):
         s = RecommendRequestSerializer(data=request.data)
         s.is_valid(raise_exception=True)
         data = s.validated_data
 
+        usage = {}
         try:
             result = recommend(
                 user_id=request.user.id,
@@ -30,10 +34,14 @@ class RecommendView(APIView):
                 occasion=data["occasion"],
                 dt_iso=data["datetime"].isoformat(),
                 drawer_products_override=data.get("drawer_products") or None,
+                usage=usage,
             )
         except ValueError as e:
             # Validation or AI error bubbled up as clean message
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            # a model call that failed still cost quota
+            record_token_usage(request, usage)
 
         # Validate outgoing contract (defensive)
         out = RecommendResponseSerializer(data=result)
@@ -1,8 +1,20 @@
 from django.contrib import admin
 
-from stylist.models import StylistProfile
+from stylist.models import Review, StylistExpertiseTag, StylistProfile
 
 @admin.register(StylistProfile)
 class StylistProfileAdmin(admin.ModelAdmin):
-    list_display = ("user", "years_experience", "rating", "rating_count", "earnings_total", "created_at")
+    list_display = ("user", "years_experience", "rating", "rating_count", "rank_score", "is_listed", "earnings_total", "created_at")
     search_fields = ("user__username", "user__email")
+
+
+@admin.register(StylistExpertiseTag)
+class StylistExpertiseTagAdmin(admin.ModelAdmin):
+    list_display = ("tag", "stylist")
+    search_fields = ("tag",)
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ("id", "stylist", "client", "rating", "created_at")
+    list_filter = ("rating",)
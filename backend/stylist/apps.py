@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StylistConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stylist'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_expertise_tags(apps, schema_editor):
+    StylistProfile = apps.get_model("stylist", "StylistProfile")
+    StylistExpertiseTag = apps.get_model("stylist", "StylistExpertiseTag")
+
+    rows = []
+    for profile in StylistProfile.objects.exclude(expertise=None).only("pk", "expertise").iterator():
+        expertise = profile.expertise
+        if isinstance(expertise, str):
+            expertise = [expertise]
+        if not isinstance(expertise, (list, tuple)):
+            continue
+        tags = {slugify(str(v or ""))[:64] for v in expertise} - {""}
+        rows.extend(StylistExpertiseTag(stylist_id=profile.pk, tag=t) for t in tags)
+    StylistExpertiseTag.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stylist', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StylistExpertiseTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=64)),
+                ('stylist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expertise_tags', to='stylist.stylistprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('tag', 'stylist'), name='uniq_stylist_expertise_tag')],
+            },
+        ),
+        migrations.RunPython(backfill_expertise_tags, migrations.RunPython.noop),
+    ]
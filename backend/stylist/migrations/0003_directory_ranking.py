@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+# Frozen copy of stylist/ranking.py's defaults: migrations must not depend on
+# app code or settings that can change after they are written.
+PRIOR_MEAN = 3.5
+PRIOR_WEIGHT = 10.0
+
+
+def backfill_directory_ranking(apps, schema_editor):
+    StylistProfile = apps.get_model("stylist", "StylistProfile")
+    n = Cast(F("rating_count"), FloatField())
+    StylistProfile.objects.update(rank_score=(PRIOR_WEIGHT * PRIOR_MEAN + F("rating") * n) / (PRIOR_WEIGHT + n))
+    StylistProfile.objects.filter(user__is_active=True, user__role="stylist").update(is_listed=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stylist', '0002_expertise_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stylistprofile',
+            name='is_listed',
+            field=models.BooleanField(default=False, help_text='Mirror of user.is_active and role == stylist'),
+        ),
+        migrations.AddField(
+            model_name='stylistprofile',
+            name='rank_score',
+            field=models.FloatField(default=0.0, help_text='Bayesian-average rating used to order the directory'),
+        ),
+        migrations.RunPython(backfill_directory_ranking, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='stylistprofile',
+            index=models.Index(condition=models.Q(('is_listed', True)), fields=['-rank_score', '-rating_count', 'user'], name='stylist_directory_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stylist', '0003_directory_ranking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.PositiveSmallIntegerField()),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stylist_reviews', to=settings.AUTH_USER_MODEL)),
+                ('stylist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='stylist.stylistprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stylist', '-created_at'], name='review_stylist_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('stylist', 'client'), name='uniq_review_per_client'), models.CheckConstraint(condition=models.Q(('rating__gte', 1), ('rating__lte', 5)), name='review_rating_1_5')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stylist', '0004_review'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stylistprofile',
+            index=models.Index(fields=['updated_at'], name='stylist_updated_idx'),
+        ),
+    ]
@@ -3,6 +3,8 @@ from decimal import Decimal
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from stylist.ranking import bayesian_rank
+
 User = get_user_model()
 
 class StylistProfile(models.Model):
@@ -12,9 +14,85 @@ class StylistProfile(models.Model):
     years_experience = models.PositiveIntegerField(null=True, blank=True)
     rating = models.FloatField(default=0.0)
     rating_count = models.PositiveIntegerField(default=0)
+    rank_score = models.FloatField(default=0.0, help_text="Bayesian-average rating used to order the directory")
+    is_listed = models.BooleanField(default=False, help_text="Mirror of user.is_active and role == stylist")
     earnings_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Directory order; matches the partial index below so browsing is an index range scan.
+    DIRECTORY_ORDERING = ("-rank_score", "-rating_count", "user")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-rank_score", "-rating_count", "user"],
+                condition=models.Q(is_listed=True),
+                name="stylist_directory_rank_idx",
+            ),
+            # incremental refresh of the matching matrix (client/services/matching.py)
+            models.Index(fields=["updated_at"], name="stylist_updated_idx"),
+        ]
+
     def __str__(self): 
         return f"StylistProfile<{self.user.username}>"
+
+    def compute_derived_fields(self):
+        """Fill rank_score (and is_listed for new rows); also used before bulk_create."""
+        self.rank_score = bayesian_rank(self.rating, self.rating_count)
+        if self._state.adding:
+            self.is_listed = self.user.is_active and self.user.role == User.Role.STYLIST
+
+    def save(self, *args, **kwargs):
+        self.compute_derived_fields()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"rating", "rating_count"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"rank_score"}
+        super().save(*args, **kwargs)
+
+
+class StylistExpertiseTag(models.Model):
+    """
+    Normalized copy of StylistProfile.expertise: one row per (stylist, tag).
+
+    Kept in sync by stylist/signals.py; queried by tag when clients filter the
+    stylist directory, so lookups hit the (tag, stylist) index instead of
+    scanning the JSON column.
+    """
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.CASCADE, related_name="expertise_tags")
+    tag = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["tag", "stylist"], name="uniq_stylist_expertise_tag"),
+        ]
+
+    def __str__(self):
+        return f"{self.tag} - {self.stylist_id}"
+
+
+class Review(models.Model):
+    """
+    A client's 1–5 star review of a stylist.
+
+    Written through stylist.services.submit_review, which folds the new score
+    into StylistProfile.rating / rating_count with a single UPDATE.
+    """
+    stylist = models.ForeignKey(StylistProfile, on_delete=models.CASCADE, related_name="reviews")
+    client = models.ForeignKey(User, on_delete=models.CASCADE, related_name="stylist_reviews")
+    rating = models.PositiveSmallIntegerField()
+    comment = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["stylist", "client"], name="uniq_review_per_client"),
+            models.CheckConstraint(condition=models.Q(rating__gte=1, rating__lte=5), name="review_rating_1_5"),
+        ]
+        indexes = [
+            models.Index(fields=["stylist", "-created_at"], name="review_stylist_recent_idx"),
+        ]
+
+    def __str__(self):
+        return f"Review<{self.stylist_id}: {self.rating}>"
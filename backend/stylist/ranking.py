@@ -0,0 +1,39 @@
+"""
+stylist/ranking.py
+
+Bayesian-average ranking score for the stylist directory.
+
+    rank_score = (C * m + rating * rating_count) / (C + rating_count)
+
+m (prior mean) and C (prior weight, in "virtual reviews") come from settings.
+A stylist with one 5-star review stays close to the prior, while one with
+hundreds of reviews converges to their real average. Because the prior is a
+constant, the score depends only on the stylist's own row and can be updated
+incrementally in the same write that changes the rating.
+"""
+
+from django.conf import settings
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+DEFAULT_PRIOR_MEAN = 3.5
+DEFAULT_PRIOR_WEIGHT = 10
+
+
+def prior():
+    m = float(getattr(settings, "STYLIST_RANKING_PRIOR_MEAN", DEFAULT_PRIOR_MEAN))
+    c = float(getattr(settings, "STYLIST_RANKING_PRIOR_WEIGHT", DEFAULT_PRIOR_WEIGHT))
+    return m, c
+
+
+def bayesian_rank(rating: float, rating_count: int) -> float:
+    m, c = prior()
+    n = float(rating_count or 0)
+    return (c * m + float(rating or 0.0) * n) / (c + n)
+
+
+def bayesian_rank_expression(rating=F("rating"), rating_count=F("rating_count")):
+    """Same formula as a DB expression, for set-based UPDATEs."""
+    m, c = prior()
+    n = Cast(rating_count, FloatField())
+    return (c * m + rating * n) / (c + n)
@@ -1,7 +1,8 @@
 # apps/stylist/serializers.py
+import logging
 import os
 from django.conf import settings
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
@@ -9,10 +10,12 @@ from django.utils.encoding import force_bytes, smart_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import serializers
 
+from common.passwords import verify_credentials
 from common.utils import get_tokens_for_user, send_password_reset_email
 from stylist.models import StylistProfile  # adjust path to your app
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class StylistRegisterSerializer(serializers.ModelSerializer):
@@ -39,7 +42,8 @@ class StylistLoginSerializer(serializers.Serializer):
         if not email or not password:
             raise serializers.ValidationError("Both email and password are required.")
 
-        user = authenticate(request=self.context.get("request"), email=email, password=password)
+        # Hashing runs in the bounded login pool; may raise PasswordHashingBusy (503)
+        user = verify_credentials(email, password, request=self.context.get("request"))
         if not user:
             raise serializers.ValidationError("Invalid email or password.")
         if not user.is_active:
@@ -136,7 +140,7 @@ class StylistSendPasswordResetEmailSerializer(serializers.Serializer):
             link = f"/stylist/auth/reset-password/{uidb64}/{token}/"
 
         if getattr(settings, "DEBUG", False):
-            print(f"[DEV] Stylist password reset link: {link}")
+            logger.info("Stylist password reset link: %s", link)
 
         self.reset_link = link
         send_password_reset_email(user, link)
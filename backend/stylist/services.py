@@ -0,0 +1,175 @@
+"""
+stylist/services.py
+
+Expertise tag normalization and lookups for the stylist directory, and the
+review write path that maintains StylistProfile rating aggregates.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, FloatField, QuerySet, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.services import invalidate_profile_snapshots
+from client.services.directory import invalidate_directory
+from stylist.models import Review, StylistExpertiseTag, StylistProfile
+from stylist.ranking import bayesian_rank, bayesian_rank_expression
+
+logger = logging.getLogger(__name__)
+
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+
+
+def normalize_tag(value) -> str:
+    """'Street Wear ' → 'street-wear' (max 64 chars, matches the tag column)."""
+    return slugify(str(value or ""))[:64]
+
+
+def normalize_tags(values: Iterable) -> List[str]:
+    """Normalize, drop empties and de-duplicate while keeping order."""
+    out: List[str] = []
+    for v in values or []:
+        tag = normalize_tag(v)
+        if tag and tag not in out:
+            out.append(tag)
+    return out
+
+
+def normalize_expertise(expertise) -> List[str]:
+    """Tags from a raw `expertise` JSON value (list of strings, a single string, or junk)."""
+    if isinstance(expertise, str):
+        expertise = [expertise]
+    if not isinstance(expertise, (list, tuple)):
+        return []
+    return normalize_tags(expertise)
+
+
+def expertise_tags_from_profile(profile: StylistProfile) -> List[str]:
+    return normalize_expertise(profile.expertise)
+
+
+def sync_expertise_tags(profile: StylistProfile) -> None:
+    """Make the StylistExpertiseTag rows match profile.expertise (diff, not rewrite)."""
+    wanted = set(expertise_tags_from_profile(profile))
+    existing = set(
+        StylistExpertiseTag.objects.filter(stylist=profile).values_list("tag", flat=True)
+    )
+
+    stale = existing - wanted
+    if stale:
+        StylistExpertiseTag.objects.filter(stylist=profile, tag__in=stale).delete()
+
+    missing = wanted - existing
+    if missing:
+        StylistExpertiseTag.objects.bulk_create(
+            [StylistExpertiseTag(stylist=profile, tag=t) for t in missing],
+            ignore_conflicts=True,
+        )
+
+
+def filter_by_expertise(qs: QuerySet, tags: Iterable, match: str = MATCH_ANY) -> QuerySet:
+    """
+    Restrict a StylistProfile queryset to stylists tagged with `tags`.
+
+    match="any" → at least one tag (OR); match="all" → every tag (AND).
+    Both resolve through the (tag, stylist) unique index.
+    """
+    tags = normalize_tags(tags)
+    if not tags:
+        return qs
+
+    tagged = StylistExpertiseTag.objects.filter(tag__in=tags)
+    if match == MATCH_ALL and len(tags) > 1:
+        tagged = (
+            tagged.values("stylist")
+            .annotate(n=Count("tag"))
+            .filter(n=len(tags))
+            .values("stylist")
+        )
+    else:
+        tagged = tagged.values("stylist")
+
+    return qs.filter(pk__in=tagged)
+
+
+class DuplicateReview(ValueError):
+    pass
+
+
+def submit_review(*, stylist: StylistProfile, client, rating: int, comment: Optional[str] = None) -> Review:
+    """
+    Store a review and fold it into the stylist's running mean in O(1).
+
+    The aggregate update is one UPDATE built from F() expressions, so the
+    database row lock serializes concurrent reviews and no average is ever
+    recomputed from the full review set:
+
+        rating       ← (rating * rating_count + new) / (rating_count + 1)
+        rating_count ← rating_count + 1
+        rank_score   ← Bayesian average of the two new values
+    """
+    n = Cast(F("rating_count"), FloatField())
+    new_rating = (F("rating") * n + Value(float(rating))) / (n + Value(1.0))
+    new_count = F("rating_count") + 1
+
+    try:
+        with transaction.atomic():
+            review = Review.objects.create(stylist=stylist, client=client, rating=rating, comment=comment)
+            StylistProfile.objects.filter(pk=stylist.pk).update(
+                rating=new_rating,
+                rating_count=new_count,
+                rank_score=bayesian_rank_expression(new_rating, new_count),
+                updated_at=timezone.now(),
+            )
+    except IntegrityError:
+        raise DuplicateReview("You have already reviewed this stylist.")
+
+    # .update() skips post_save, so drop the cached directory and profile explicitly.
+    transaction.on_commit(invalidate_directory)
+    transaction.on_commit(lambda: invalidate_profile_snapshots([stylist.pk]))
+    return review
+
+
+def reconcile_stylist_ratings(tolerance: float = 1e-6, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Compare every stylist's stored rating/rating_count with the full review
+    aggregate and repair drift. Meant for a periodic job (stylist/tasks.py).
+
+    Drifted rows are fixed under SELECT ... FOR UPDATE with the aggregate
+    recomputed inside the lock, so a review landing mid-run is not lost.
+    """
+    checked = 0
+    fixed = []
+    aggregates = (
+        Review.objects.values("stylist")
+        .annotate(avg=Avg("rating"), n=Count("id"))
+        .order_by("stylist")
+    )
+    expected = {row["stylist"]: (float(row["avg"]), row["n"]) for row in aggregates.iterator()}
+
+    profiles = StylistProfile.objects.only("pk", "rating", "rating_count").order_by("pk")
+    for profile in profiles.iterator(chunk_size=batch_size):
+        checked += 1
+        avg, n = expected.get(profile.pk, (0.0, 0))
+        if profile.rating_count == n and abs(profile.rating - avg) <= tolerance:
+            continue
+
+        with transaction.atomic():
+            locked = StylistProfile.objects.select_for_update().only("pk").get(pk=profile.pk)
+            agg = Review.objects.filter(stylist=locked).aggregate(avg=Avg("rating"), n=Count("id"))
+            avg, n = float(agg["avg"] or 0.0), agg["n"]
+            StylistProfile.objects.filter(pk=locked.pk).update(
+                rating=avg, rating_count=n, rank_score=bayesian_rank(avg, n), updated_at=timezone.now(),
+            )
+        fixed.append(profile.pk)
+        logger.warning("Reconciled rating for stylist %s: %.4f over %d reviews", profile.pk, avg, n)
+
+    if fixed:
+        invalidate_directory()
+        invalidate_profile_snapshots(fixed)
+    return {"checked": checked, "fixed": len(fixed)}
@@ -0,0 +1,77 @@
+"""
+stylist/signals.py
+
+Keep derived stylist data in sync with StylistProfile writes.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from client.services.directory import invalidate_directory
+from client.services.matching import invalidate_match_matrix
+from stylist.models import StylistProfile
+from stylist.services import sync_expertise_tags
+
+User = get_user_model()
+
+# User fields embedded in directory entries (StylistUserPublicSerializer; the id never changes)
+DIRECTORY_USER_FIELDS = ("username", "email", "profile_picture")
+
+
+@receiver(post_save, sender=StylistProfile)
+def sync_expertise_on_save(sender, instance: StylistProfile, created: bool, update_fields=None, **kwargs):
+    """Drop cached directory data and mirror `expertise` into StylistExpertiseTag rows."""
+    invalidate_directory()
+    if update_fields is not None and "expertise" not in update_fields:
+        return
+    if created and not instance.expertise:
+        return
+    sync_expertise_tags(instance)
+
+
+@receiver(post_delete, sender=StylistProfile)
+def invalidate_directory_on_delete(sender, instance: StylistProfile, **kwargs):
+    invalidate_directory()
+    invalidate_match_matrix()
+
+
+@receiver(pre_save, sender=User)
+def remember_directory_fields(sender, instance: User, update_fields=None, **kwargs):
+    """
+    Note whether a stylist's directory-visible fields change, so logins,
+    password changes and rehashes don't drop the cached directory.
+    """
+    instance._directory_fields_changed = False
+    if instance._state.adding or instance.role != User.Role.STYLIST:
+        return
+    fields = [f for f in DIRECTORY_USER_FIELDS if update_fields is None or f in update_fields]
+    if not fields:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*fields).first()
+    instance._directory_fields_changed = previous is not None and any(
+        previous[f] != getattr(instance, f) for f in fields
+    )
+
+
+@receiver(post_save, sender=User)
+def sync_directory_listing(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    """
+    Mirror user.is_active / role into StylistProfile.is_listed (indexed directory
+    filter) and drop cached directory entries when the listing or a field they
+    embed changed.
+    """
+    if created:
+        return  # new profiles compute is_listed and invalidate themselves
+    changed = 0
+    if update_fields is None or {"is_active", "role"} & set(update_fields):
+        listed = instance.is_active and instance.role == User.Role.STYLIST
+        # bump updated_at too: the matching matrix refreshes rows by that watermark
+        changed = (
+            StylistProfile.objects.filter(user=instance)
+            .exclude(is_listed=listed)
+            .update(is_listed=listed, updated_at=timezone.now())
+        )
+    if changed or getattr(instance, "_directory_fields_changed", False):
+        invalidate_directory()
@@ -0,0 +1,15 @@
+"""
+stylist/tasks.py
+
+Periodic maintenance for stylist aggregates (scheduled in CELERY_BEAT_SCHEDULE).
+"""
+
+from celery import shared_task
+
+from stylist.services import reconcile_stylist_ratings
+
+
+@shared_task(name="stylist.reconcile_ratings")
+def reconcile_ratings_task():
+    """Check running-mean ratings against the full review aggregate and repair drift."""
+    return reconcile_stylist_ratings()
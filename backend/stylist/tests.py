@@ -1,3 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.db import connection
+from django.db.models import Avg
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from client.services.directory import DIRECTORY_GENERATION
+from common.cache import get_generation
+from stylist.models import Review, StylistProfile
+from stylist.services import DuplicateReview, submit_review
+from stylist.tasks import reconcile_ratings_task
+
+User = get_user_model()
+
+
+class ReviewRunningMeanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        stylist_user = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="pw-12345!", role=User.Role.STYLIST,
+        )
+        cls.stylist = stylist_user.stylist_profile
+        cls.clients = [
+            User.objects.create_user(email=f"client{i}@example.com", username=f"client{i}", password="pw-12345!")
+            for i in range(6)
+        ]
+
+    def test_submit_review_is_one_insert_and_one_update(self):
+        # SAVEPOINT, INSERT review, UPDATE profile, RELEASE SAVEPOINT
+        with self.assertNumQueries(4), CaptureQueriesContext(connection) as ctx:
+            submit_review(stylist=self.stylist, client=self.clients[0], rating=4)
+        statements = [q["sql"].split()[0].upper() for q in ctx.captured_queries]
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertNotIn("SELECT", statements)
+
+        self.stylist.refresh_from_db()
+        self.assertEqual(self.stylist.rating_count, 1)
+        self.assertAlmostEqual(self.stylist.rating, 4.0)
+
+    def test_running_mean_matches_avg(self):
+        for client, rating in zip(self.clients, [5, 3, 4, 1, 2, 5]):
+            submit_review(stylist=self.stylist, client=client, rating=rating)
+
+        self.stylist.refresh_from_db()
+        expected = Review.objects.filter(stylist=self.stylist).aggregate(avg=Avg("rating"))["avg"]
+        self.assertEqual(self.stylist.rating_count, 6)
+        self.assertAlmostEqual(self.stylist.rating, expected, places=9)
+
+    def test_duplicate_review_leaves_aggregate_unchanged(self):
+        submit_review(stylist=self.stylist, client=self.clients[0], rating=5)
+        with self.assertRaises(DuplicateReview):
+            submit_review(stylist=self.stylist, client=self.clients[0], rating=1)
+
+        self.stylist.refresh_from_db()
+        self.assertEqual(self.stylist.rating_count, 1)
+        self.assertAlmostEqual(self.stylist.rating, 5.0)
+
+    def test_reconcile_repairs_corrupted_row(self):
+        for client, rating in zip(self.clients[:3], [5, 4, 3]):
+            submit_review(stylist=self.stylist, client=client, rating=rating)
+        StylistProfile.objects.filter(pk=self.stylist.pk).update(rating=1.5, rating_count=42)
+
+        result = reconcile_ratings_task.delay().get()
+
+        self.assertEqual(result["fixed"], 1)
+        self.stylist.refresh_from_db()
+        self.assertEqual(self.stylist.rating_count, 3)
+        self.assertAlmostEqual(self.stylist.rating, 4.0)
+        self.assertEqual(reconcile_ratings_task.delay().get()["fixed"], 0)
+
+
+class DirectoryInvalidationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="pw-12345!", role=User.Role.STYLIST,
+        )
+        self.generation = get_generation(DIRECTORY_GENERATION)
+
+    def assertDirectoryKept(self):
+        self.assertEqual(get_generation(DIRECTORY_GENERATION), self.generation)
+
+    def assertDirectoryDropped(self):
+        self.assertNotEqual(get_generation(DIRECTORY_GENERATION), self.generation)
+
+    def test_login_and_password_change_keep_directory(self):
+        update_last_login(None, self.user)
+        self.user.set_password("new-pw-12345!")
+        self.user.save(update_fields=["password"])
+        self.user.first_name = "Coco"
+        self.user.save()  # full save, nothing the directory shows changed
+        self.assertDirectoryKept()
+
+    def test_visible_field_change_drops_directory(self):
+        self.user.profile_picture = "https://cdn.example.com/me.jpg"
+        self.user.save()
+        self.assertDirectoryDropped()
+
+    def test_unlisting_drops_directory(self):
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertDirectoryDropped()
+        self.assertFalse(StylistProfile.objects.get(user=self.user).is_listed)
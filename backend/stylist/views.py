@@ -8,6 +8,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts.services import get_profile_snapshot
 from common.utils import revoke_user_tokens
 from stylist.models import StylistProfile  # adjust path
 from common.permissions import IsStylist
@@ -54,11 +55,11 @@ class StylistProfileView(APIView):
     permission_classes = [IsAuthenticated, IsStylist]
 
     def get(self, request):
-        profile, _ = StylistProfile.objects.get_or_create(user=request.user)
-        return Response(StylistProfileSerializer(profile).data)
+        # cached, invalidated on profile/user writes (accounts/services.py)
+        return Response(get_profile_snapshot(request.user.pk, User.Role.STYLIST))
 
     def patch(self, request):
-        profile, _ = StylistProfile.objects.get_or_create(user=request.user)
+        profile, _ = StylistProfile.objects.select_related("user").get_or_create(user_id=request.user.pk)
         s = StylistProfileSerializer(profile, data=request.data, partial=True)
         s.is_valid(raise_exception=True)
         s.save()